@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벡터화 백테스트 엔진
+날짜 × 종목 가격 행렬 위에서 리밸런싱과 거래비용(수수료, 증권거래세, 슬리피지)을
+반영한 포트폴리오 가치를 계산합니다. 리밸런싱 사이 구간은 행렬 곱으로 한 번에
+계산하고, 반복문은 리밸런싱 시점에서만 돕니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# 매도 금액 기준 증권거래세 (2026년 코스피 기준: 증권거래세 0.05% + 농어촌특별세 0.15%)
+# ETF는 면제 (backtesting.default_sell_tax_rates가 종목별로 0을 넣음)
+DEFAULT_SELL_TAX_RATE = 0.0020
+
+# 리밸런싱 주기 별칭 -> pandas Period 주기
+REBALANCE_FREQUENCIES = {
+    'weekly': 'W',
+    'monthly': 'M',
+    'quarterly': 'Q',
+    'yearly': 'Y',
+    'W': 'W',
+    'M': 'M',
+    'Q': 'Q',
+    'Y': 'Y',
+}
+
+# 임계값 리밸런싱 시 한 번에 검사하는 날짜 수
+_DRIFT_BLOCK = 256
+
+
+def calendar_rebalance_mask(dates, frequency):
+    """
+    달력 기준 리밸런싱 시점 (각 주/월/분기/연도의 첫 거래일)
+
+    Args:
+        dates: DatetimeIndex
+        frequency: 'weekly', 'monthly', 'quarterly', 'yearly' (또는 'W', 'M', 'Q', 'Y')
+
+    Returns:
+        (T,) bool 배열 (첫날은 항상 False)
+    """
+    if frequency not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"Unknown rebalance frequency: {frequency}")
+
+    periods = pd.DatetimeIndex(dates).to_period(REBALANCE_FREQUENCIES[frequency]).asi8
+    mask = np.zeros(len(periods), dtype=bool)
+    mask[1:] = periods[1:] != periods[:-1]
+    return mask
+
+
+def _rebalance(holdings, target_weights, total_value, buy_cost_rate, sell_cost_rate):
+    """
+    목표 비중으로 리밸런싱한 뒤의 보유 금액과 거래비용
+
+    비용은 리밸런싱 후 자산 규모에 따라 달라지므로 고정점 반복으로 구합니다.
+    (비용률이 작아 몇 번이면 수렴)
+    """
+    net_value = total_value
+    for _ in range(4):
+        trades = target_weights * net_value - holdings
+        cost = (
+            np.sum(np.maximum(trades, 0) * buy_cost_rate) +
+            np.sum(np.maximum(-trades, 0) * sell_cost_rate)
+        )
+        net_value = total_value - cost
+
+    trades = target_weights * net_value - holdings
+    return target_weights * net_value, total_value - net_value, np.abs(trades).sum()
+
+
+def _first_drift_breach(prices, shares, target_weights, start, end, threshold):
+    """start 이후 비중 이탈이 임계값을 넘는 첫 날짜 (없으면 end)"""
+    for block_start in range(start, end, _DRIFT_BLOCK):
+        block_end = min(block_start + _DRIFT_BLOCK, end)
+        holdings = prices[block_start:block_end] * shares
+        weights = holdings / holdings.sum(axis=1, keepdims=True)
+        breached = np.abs(weights - target_weights).max(axis=1) > threshold
+        if breached.any():
+            return block_start + int(np.argmax(breached))
+    return end
+
+
+def simulate_rebalancing(prices, target_weights, initial_investment, rebalance_mask=None,
+                         threshold=None, commission_rate=0.0, tax_rate=0.0, slippage=0.0):
+    """
+    리밸런싱 포트폴리오 가치 시뮬레이션
+
+    Args:
+        prices: (T, n) 종가 행렬 (결측치 없음)
+        target_weights: (n,) 목표 비중 (합계 1.0)
+        initial_investment: 초기 투자금액
+        rebalance_mask: (T,) bool, 달력 기준 리밸런싱 시점 (None이면 없음)
+        threshold: 비중 이탈 임계값 (예: 0.05 = 5%p, None이면 사용 안 함)
+        commission_rate: 매수/매도 수수료율
+        tax_rate: 매도 시 증권거래세율 (스칼라 또는 (n,) 종목별 배열)
+        slippage: 매수/매도 슬리피지율
+
+    Returns:
+        {
+            'values': (T,) 포트폴리오 가치,
+            'rebalance_days': 리밸런싱한 날짜 인덱스 리스트,
+            'total_cost': 누적 거래비용,
+            'turnover': 누적 거래대금 (최초 매수 포함)
+        }
+    """
+    prices = np.asarray(prices, dtype=float)
+    target_weights = np.asarray(target_weights, dtype=float)
+    T = prices.shape[0]
+
+    buy_cost_rate = commission_rate + slippage
+    sell_cost_rate = commission_rate + slippage + np.asarray(tax_rate, dtype=float)
+
+    calendar_points = np.flatnonzero(rebalance_mask) if rebalance_mask is not None else np.array([], dtype=int)
+    calendar_points = calendar_points[calendar_points > 0]
+
+    values = np.empty(T)
+    rebalance_days = []
+    total_cost = 0.0
+    turnover = 0.0
+
+    # 최초 매수
+    holdings, cost, traded = _rebalance(
+        np.zeros_like(target_weights), target_weights, float(initial_investment),
+        buy_cost_rate, sell_cost_rate
+    )
+    shares = holdings / prices[0]
+    total_cost += cost
+    turnover += traded
+
+    t0 = 0
+    while True:
+        # 다음 달력 리밸런싱 시점
+        pos = np.searchsorted(calendar_points, t0, side='right')
+        t_next = int(calendar_points[pos]) if pos < len(calendar_points) else T
+
+        # 그 전에 임계값을 넘는 날이 있으면 앞당김
+        if threshold is not None:
+            t_next = _first_drift_breach(prices, shares, target_weights, t0 + 1, t_next, threshold)
+
+        values[t0:t_next] = prices[t0:t_next] @ shares
+        if t_next >= T:
+            break
+
+        holdings = prices[t_next] * shares
+        holdings, cost, traded = _rebalance(
+            holdings, target_weights, holdings.sum(), buy_cost_rate, sell_cost_rate
+        )
+        shares = holdings / prices[t_next]
+        total_cost += cost
+        turnover += traded
+        rebalance_days.append(t_next)
+        t0 = t_next
+
+    return {
+        'values': values,
+        'rebalance_days': rebalance_days,
+        'total_cost': float(total_cost),
+        'turnover': float(turnover)
+    }
+
+
+# 일괄 백테스트 시 청크당 최대 원소 수 (날짜 × 포트폴리오), 약 32MB (float64)
+BATCH_MAX_ELEMENTS = 4_000_000
+
+
+def batch_backtest_metrics(prices, weight_matrix, rebalance=None, risk_free_rate=0.03,
+                           max_elements=BATCH_MAX_ELEMENTS):
+    """
+    여러 비중 벡터의 성과 지표를 한 번에 계산
+
+    하나의 가격 행렬을 공유하고, k개 포트폴리오를 청크 단위 행렬 곱으로 평가하여
+    메모리 사용량을 제한합니다. 지표 정의는 PortfolioBacktester.calculate_metrics와 같습니다.
+
+    Args:
+        prices: (T, n) 종가 행렬 (결측치 없음)
+        weight_matrix: (k, n) 비중 행렬 (각 행의 합계 1.0)
+        rebalance: None이면 매수 후 보유, 'daily'면 매일 목표 비중 유지
+        risk_free_rate: 무위험 수익률 (샤프 비율 계산용)
+        max_elements: 청크당 최대 (날짜 × 포트폴리오) 원소 수
+
+    Returns:
+        dict of (k,) 배열: total_return, cagr, volatility, sharpe_ratio, max_drawdown, win_rate (모두 %)
+    """
+    prices = np.asarray(prices, dtype=float)
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+    if rebalance not in (None, 'daily'):
+        raise ValueError(f"Unsupported batch rebalance mode: {rebalance}")
+
+    T = prices.shape[0]
+    k = weight_matrix.shape[0]
+    years = T / 252  # 거래일 기준
+
+    normalized = prices / prices[0]
+    asset_returns = prices[1:] / prices[:-1] - 1
+
+    keys = ['total_return', 'cagr', 'volatility', 'sharpe_ratio', 'max_drawdown', 'win_rate']
+    metrics = {key: np.empty(k) for key in keys}
+
+    chunk_size = max(1, max_elements // T)
+    for start in range(0, k, chunk_size):
+        end = min(start + chunk_size, k)
+        W = weight_matrix[start:end].T  # (n, c)
+
+        if rebalance == 'daily':
+            returns = asset_returns @ W
+            growth = np.vstack([np.ones((1, end - start)), np.cumprod(1 + returns, axis=0)])
+        else:
+            growth = normalized @ W
+            returns = growth[1:] / growth[:-1] - 1
+
+        final_growth = growth[-1]
+        total_return = (final_growth - 1) * 100
+        cagr = (np.power(final_growth, 1 / years) - 1) * 100 if years > 0 else np.zeros(end - start)
+        volatility = returns.std(axis=0, ddof=1) * np.sqrt(252) * 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(volatility > 0, (cagr - risk_free_rate * 100) / volatility, 0.0)
+
+        # calculate_metrics와 동일하게 첫 수익률 이후의 누적 가치로 낙폭 계산
+        cumulative = growth[1:]
+        running_max = np.maximum.accumulate(cumulative, axis=0)
+        max_drawdown = ((cumulative - running_max) / running_max).min(axis=0) * 100
+        win_rate = (returns > 0).mean(axis=0) * 100
+
+        metrics['total_return'][start:end] = total_return
+        metrics['cagr'][start:end] = cagr
+        metrics['volatility'][start:end] = volatility
+        metrics['sharpe_ratio'][start:end] = sharpe
+        metrics['max_drawdown'][start:end] = max_drawdown
+        metrics['win_rate'][start:end] = win_rate
+
+    return metrics
+
+
+def contribution_schedule_mask(dates, frequency='monthly'):
+    """
+    적립식 납입 시점 (첫 거래일 + 각 주기의 첫 거래일)
+
+    Returns:
+        (T,) bool 배열
+    """
+    mask = calendar_rebalance_mask(dates, frequency)
+    mask[0] = True
+    return mask
+
+
+def _npv(flow_times, flows, rate):
+    """연율 rate로 할인한 순현재가치 (투자자별)"""
+    return (flows * np.power(1 + rate[:, None], -flow_times)).sum(axis=1)
+
+
+def _xirr(flow_times, flows, iterations=50, tol=1e-10):
+    """
+    여러 투자자의 내부수익률(연율)을 동시에 계산
+
+    뉴턴법(스텝 제한)으로 먼저 풀고, 수렴하지 않은 투자자만 [-99%, 10000%]
+    구간 이분법으로 다시 풉니다.
+
+    Args:
+        flow_times: (F,) 첫 현금흐름 이후 경과 연수
+        flows: (k, F) 투자자 관점 현금흐름 (납입은 음수, 인출/평가액은 양수)
+
+    Returns:
+        (k,) 연간 IRR (해가 없으면 NaN)
+    """
+    low_bound, high_bound = -0.99, 100.0
+    rate = np.full(flows.shape[0], 0.1)
+
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        for _ in range(iterations):
+            growth = np.power(1 + rate[:, None], -flow_times)
+            npv = (flows * growth).sum(axis=1)
+            d_npv = (-flow_times * flows * growth / (1 + rate[:, None])).sum(axis=1)
+            step = np.clip(np.where(d_npv != 0, npv / d_npv, 0.0), -0.5, 0.5)
+            rate = np.clip(rate - step, low_bound, high_bound)
+            if np.all(np.abs(step) < tol):
+                break
+
+        scale = np.abs(flows).sum(axis=1)
+        converged = np.abs(_npv(flow_times, flows, rate)) <= 1e-9 * np.maximum(scale, 1.0)
+
+        # 이분법 보정
+        todo = np.flatnonzero(~converged)
+        if len(todo) > 0:
+            sub = flows[todo]
+            low = np.full(len(todo), low_bound)
+            high = np.full(len(todo), high_bound)
+            npv_low = _npv(flow_times, sub, low)
+            bracketed = np.sign(npv_low) != np.sign(_npv(flow_times, sub, high))
+            for _ in range(200):
+                mid = (low + high) / 2
+                npv_mid = _npv(flow_times, sub, mid)
+                same = np.sign(npv_mid) == np.sign(npv_low)
+                low = np.where(same, mid, low)
+                npv_low = np.where(same, npv_mid, npv_low)
+                high = np.where(same, high, mid)
+            rate[todo] = np.where(bracketed, (low + high) / 2, np.nan)
+
+    return rate
+
+
+def batch_contribution_backtest(prices, dates, weight_matrix, flow_mask, flow_amounts):
+    """
+    적립식(납입/인출) 백테스트를 여러 투자자에 대해 한 번에 계산
+
+    납입 시점에는 목표 비중대로 매수하고, 인출 시점에는 현재 보유 비율대로
+    매도합니다. 반복문은 현금흐름 시점에서만 돌고, 그 사이 구간은 행렬 곱으로 평가합니다.
+
+    Args:
+        prices: (T, n) 종가 행렬 (결측치 없음)
+        dates: (T,) DatetimeIndex
+        weight_matrix: (k, n) 투자자별 목표 비중
+        flow_mask: (T,) bool, 현금흐름 발생일
+        flow_amounts: (k, F) 현금흐름 발생일별 금액 (양수: 납입, 음수: 인출)
+
+    Returns:
+        {
+            'values': (T, k) 평가액,
+            'net_invested': (T, k) 누적 순납입액,
+            'final_value', 'total_contributed', 'total_withdrawn': (k,),
+            'twr': (k,) 시간가중수익률 (연율, %),
+            'irr': (k,) 금액가중수익률/IRR (연율, %)
+        }
+    """
+    prices = np.asarray(prices, dtype=float)
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+    flow_amounts = np.atleast_2d(np.asarray(flow_amounts, dtype=float))
+    flow_days = np.flatnonzero(flow_mask)
+
+    T = prices.shape[0]
+    k = weight_matrix.shape[0]
+    if len(flow_days) == 0:
+        raise ValueError("No cash flow dates in schedule")
+    if flow_amounts.shape != (k, len(flow_days)):
+        raise ValueError("flow_amounts must have shape (portfolios, flow dates)")
+
+    shares = np.zeros((prices.shape[1], k))
+    values = np.zeros((T, k))
+    actual_flows = np.zeros((k, len(flow_days)))
+
+    for j, t in enumerate(flow_days):
+        t_next = flow_days[j + 1] if j + 1 < len(flow_days) else T
+        amount = flow_amounts[:, j]
+
+        # 인출: 보유 비율대로 매도 (평가액을 넘지 않음)
+        current = prices[t] @ shares
+        withdrawal = np.minimum(np.maximum(-amount, 0), current)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            keep = np.where(current > 0, 1 - withdrawal / current, 1.0)
+        shares *= keep
+
+        # 납입: 목표 비중대로 매수
+        contribution = np.maximum(amount, 0)
+        shares += weight_matrix.T * contribution / prices[t][:, None]
+
+        actual_flows[:, j] = contribution - withdrawal
+        values[t:t_next] = prices[t:t_next] @ shares
+
+    # 일별 현금흐름 행렬 (발생일 종가 기준 반영)
+    daily_flows = np.zeros((T, k))
+    daily_flows[flow_days] = actual_flows.T
+    net_invested = np.cumsum(daily_flows, axis=0)
+
+    # 시간가중수익률: 현금흐름 효과를 제거한 일간 수익률의 누적
+    prev_values = values[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_returns = np.where(prev_values > 0, (values[1:] - daily_flows[1:]) / prev_values - 1, 0.0)
+    twr_growth = np.prod(1 + daily_returns, axis=0)
+    years = (T - flow_days[0]) / 252
+    twr = (np.power(twr_growth, 1 / years) - 1) * 100 if years > 0 else np.zeros(k)
+
+    # 금액가중수익률 (IRR): 납입은 유출, 인출과 최종 평가액은 유입
+    day_offsets = (pd.DatetimeIndex(dates) - pd.DatetimeIndex(dates)[flow_days[0]]).days.values
+    flow_times = np.append(day_offsets[flow_days], day_offsets[-1]) / 365.0
+    investor_flows = np.hstack([-actual_flows, values[-1][:, None]])
+    irr = _xirr(flow_times, investor_flows) * 100
+
+    contributed = np.maximum(actual_flows, 0).sum(axis=1)
+    withdrawn = np.maximum(-actual_flows, 0).sum(axis=1)
+
+    return {
+        'values': values,
+        'net_invested': net_invested,
+        'final_value': values[-1],
+        'total_contributed': contributed,
+        'total_withdrawn': withdrawn,
+        'twr': twr,
+        'irr': irr
+    }
@@ -1,12 +1,89 @@
 import numpy as np
 import pandas as pd
-from pykrx import stock
 from datetime import datetime, timedelta
+from price_store import default_store
+import indicator_kernels as kernels
+from downsampling import downsample_indices, to_epoch_millis
+from benchmarks import DEFAULT_BENCHMARK, default_registry
+from drawdown_analysis import top_drawdown_episodes
+from tail_risk import DEFAULT_CONFIDENCE_LEVELS, DEFAULT_HORIZONS, VAR_METHODS, tail_risk_table, format_tail_risk
+from rolling_metrics import DEFAULT_WINDOW, compute_rolling_metrics, series_to_list
+from stock_metadata import default_metadata
+from backtest_engine import (
+    DEFAULT_SELL_TAX_RATE, calendar_rebalance_mask, simulate_rebalancing, batch_backtest_metrics,
+    contribution_schedule_mask, batch_contribution_backtest
+)
 import warnings
 warnings.filterwarnings('ignore')
 
+def calculate_value_metrics(portfolio_values, initial_investment):
+    """
+    포트폴리오 가치 시계열의 성과 지표 계산
+
+    Args:
+        portfolio_values: 날짜 인덱스의 포트폴리오 가치 Series
+        initial_investment: 초기 투자금액
+    """
+    # 수익률 계산
+    returns = portfolio_values.pct_change().dropna()
+
+    # 누적 수익률
+    total_return = (portfolio_values.iloc[-1] / initial_investment - 1) * 100
+
+    # 연간 수익률 (CAGR)
+    days = len(portfolio_values)
+    years = days / 252  # 거래일 기준
+    cagr = (np.power(portfolio_values.iloc[-1] / initial_investment, 1/years) - 1) * 100 if years > 0 else 0
+
+    # 변동성 (연간화)
+    volatility = returns.std() * np.sqrt(252) * 100
+
+    # 샤프 비율 (무위험 수익률 3% 가정)
+    sharpe = (cagr - 3) / volatility if volatility > 0 else 0
+
+    # 최대 손실 (Maximum Drawdown) - 첫날 이후 누적 수익률 기준
+    max_drawdown = kernels.max_drawdown(portfolio_values.values[1:]) * 100
+
+    # 승률 (상승한 날의 비율)
+    win_rate = (returns > 0).sum() / len(returns) * 100
+
+    # 최종 자산
+    final_value = portfolio_values.iloc[-1]
+    profit = final_value - initial_investment
+
+    return {
+        'initial_investment': initial_investment,
+        'final_value': float(final_value),
+        'profit': float(profit),
+        'total_return': float(total_return),
+        'cagr': float(cagr),
+        'volatility': float(volatility),
+        'sharpe_ratio': float(sharpe),
+        'max_drawdown': float(max_drawdown),
+        'win_rate': float(win_rate),
+        'total_days': len(portfolio_values),
+        'trading_days': len(returns)
+    }
+
+
+def default_sell_tax_rates(tickers):
+    """
+    종목별 기본 매도세율 (ETF는 증권거래세 면제)
+
+    Returns:
+        종목 순서의 세율 리스트 - 메타데이터상 ETF는 0, 그 외는 DEFAULT_SELL_TAX_RATE
+    """
+    rates = []
+    for ticker in tickers:
+        meta = default_metadata.get(ticker, {})
+        is_etf = meta.get('type') == 'etf' or meta.get('market') == 'ETF'
+        rates.append(0.0 if is_etf else DEFAULT_SELL_TAX_RATE)
+    return rates
+
+
 class PortfolioBacktester:
-    def __init__(self, tickers, weights, initial_investment=10000000, start_date=None, end_date=None):
+    def __init__(self, tickers, weights, initial_investment=10000000, start_date=None, end_date=None,
+                 rebalance=None, rebalance_threshold=None, commission_rate=0.0, tax_rate=0.0, slippage=0.0):
         """
         포트폴리오 백테스팅 클래스
 
@@ -16,6 +93,11 @@ class PortfolioBacktester:
             initial_investment: 초기 투자금액 (원)
             start_date: 시작일 (기본: 1년 전)
             end_date: 종료일 (기본: 오늘)
+            rebalance: 달력 리밸런싱 주기 ('monthly', 'quarterly', 'yearly' 등, 기본: 매수 후 보유)
+            rebalance_threshold: 비중 이탈 리밸런싱 임계값 (예: 0.05)
+            commission_rate: 매수/매도 수수료율
+            tax_rate: 매도 시 증권거래세율 (스칼라 또는 종목별 리스트)
+            slippage: 매수/매도 슬리피지율
         """
         self.tickers = tickers
         self.weights = np.array(weights)
@@ -23,49 +105,89 @@ class PortfolioBacktester:
         self.end_date = end_date or datetime.now().strftime('%Y%m%d')
         self.start_date = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y%m%d')
 
+        self.rebalance = rebalance
+        self.rebalance_threshold = rebalance_threshold
+        self.commission_rate = commission_rate
+        self.tax_rate = tax_rate
+        self.slippage = slippage
+
         self.prices_df = None
         self.portfolio_values = None
+        self.trading_summary = None
 
     def fetch_historical_prices(self):
-        """과거 주가 데이터 가져오기"""
-        price_data = {}
-
-        for ticker in self.tickers:
-            try:
-                df = stock.get_market_ohlcv_by_date(
-                    fromdate=self.start_date,
-                    todate=self.end_date,
-                    ticker=ticker
-                )
-                if df is not None and not df.empty:
-                    price_data[ticker] = df['종가']
-            except Exception as e:
-                print(f"Error fetching {ticker}: {e}")
-                continue
+        """과거 주가 데이터 가져오기 (공유 가격 저장소 사용)"""
+        self.prices_df = default_store.get_close_prices(self.tickers, self.start_date, self.end_date)
 
-        if not price_data:
+        if self.prices_df.empty:
             raise ValueError("No price data available")
 
-        self.prices_df = pd.DataFrame(price_data)
         return self.prices_df
 
+    def _uses_trading_engine(self):
+        """리밸런싱 또는 거래비용 시뮬레이션이 필요한지 여부"""
+        # 매도세는 리밸런싱 매도에만 붙으므로 리밸런싱이 없으면 결과에 영향 없음
+        return bool(
+            self.rebalance or self.rebalance_threshold or
+            self.commission_rate or self.slippage
+        )
+
     def calculate_portfolio_value(self):
         """포트폴리오 가치 계산"""
         if self.prices_df is None:
             self.fetch_historical_prices()
 
+        # 가격 데이터가 있는 종목의 비중만 사용
+        columns = list(self.prices_df.columns)
+        weights = np.array([self.weights[self.tickers.index(ticker)] for ticker in columns])
+
+        if self._uses_trading_engine():
+            return self._simulate_trading(columns, weights)
+
         # 정규화된 가격 (첫날을 1.0으로)
-        normalized_prices = self.prices_df / self.prices_df.iloc[0]
+        normalized_prices = (self.prices_df / self.prices_df.iloc[0]).values
+
+        # 전체 포트폴리오 가치 = 초기 투자금 * (정규화된 가격 행렬 @ 비중)
+        self.portfolio_values = pd.Series(
+            np.nan_to_num(normalized_prices) @ weights * self.initial_investment,
+            index=self.prices_df.index
+        )
 
-        # 각 종목의 가치 = 초기 투자금 * 비중 * 정규화된 가격
-        portfolio_values = []
-        for ticker, weight in zip(self.tickers, self.weights):
-            if ticker in normalized_prices.columns:
-                portfolio_values.append(normalized_prices[ticker] * weight * self.initial_investment)
+        return self.portfolio_values
 
-        # 전체 포트폴리오 가치 = 각 종목 가치의 합
-        self.portfolio_values = pd.DataFrame(portfolio_values).T.sum(axis=1)
-        self.portfolio_values.index = self.prices_df.index
+    def _simulate_trading(self, columns, weights):
+        """리밸런싱/거래비용을 반영한 포트폴리오 가치 계산"""
+        # 거래정지일은 직전 종가로 채우고, 전 종목 가격이 있는 날부터 시작
+        prices_df = self.prices_df.ffill().dropna()
+        if prices_df.empty:
+            raise ValueError("No overlapping price data available")
+
+        tax_rate = self.tax_rate
+        if np.ndim(tax_rate) > 0:
+            tax_rate = np.array([tax_rate[self.tickers.index(ticker)] for ticker in columns])
+
+        rebalance_mask = calendar_rebalance_mask(prices_df.index, self.rebalance) if self.rebalance else None
+
+        result = simulate_rebalancing(
+            prices_df.values,
+            weights / weights.sum(),
+            self.initial_investment,
+            rebalance_mask=rebalance_mask,
+            threshold=self.rebalance_threshold,
+            commission_rate=self.commission_rate,
+            tax_rate=tax_rate,
+            slippage=self.slippage
+        )
+
+        self.portfolio_values = pd.Series(result['values'], index=prices_df.index)
+        self.trading_summary = {
+            'rebalance': self.rebalance,
+            'rebalance_threshold': self.rebalance_threshold,
+            'rebalance_count': len(result['rebalance_days']),
+            'rebalance_dates': [prices_df.index[i].strftime('%Y-%m-%d') for i in result['rebalance_days']],
+            'total_cost': result['total_cost'],
+            'turnover': result['turnover']
+        }
 
         return self.portfolio_values
 
@@ -74,123 +196,208 @@ class PortfolioBacktester:
         if self.portfolio_values is None:
             self.calculate_portfolio_value()
 
-        # 수익률 계산
-        returns = self.portfolio_values.pct_change().dropna()
+        return calculate_value_metrics(self.portfolio_values, self.initial_investment)
 
-        # 누적 수익률
-        total_return = (self.portfolio_values.iloc[-1] / self.initial_investment - 1) * 100
+    def get_portfolio_history(self, columnar=False, max_points=None, downsample='lttb'):
+        """
+        포트폴리오 가치 변화 이력
+
+        Args:
+            columnar: True면 {'dates': [epoch ms], 'values': [...], 'returns': [...]} 열 배열 형태
+            max_points: 최대 점 개수 (초과 시 서버에서 다운샘플링)
+            downsample: 다운샘플링 방식 ('lttb' 또는 'minmax')
+        """
+        if self.portfolio_values is None:
+            self.calculate_portfolio_value()
 
-        # 연간 수익률 (CAGR)
-        days = len(self.portfolio_values)
-        years = days / 252  # 거래일 기준
-        cagr = (np.power(self.portfolio_values.iloc[-1] / self.initial_investment, 1/years) - 1) * 100 if years > 0 else 0
+        dates = self.portfolio_values.index
+        values = self.portfolio_values.values
 
-        # 변동성 (연간화)
-        volatility = returns.std() * np.sqrt(252) * 100
+        if max_points and len(values) > max_points:
+            idx = downsample_indices(to_epoch_millis(dates), values, max_points, downsample)
+            dates = dates[idx]
+            values = values[idx]
 
-        # 샤프 비율 (무위험 수익률 3% 가정)
-        sharpe = (cagr - 3) / volatility if volatility > 0 else 0
+        returns = (values / self.initial_investment - 1) * 100
 
-        # 최대 손실 (Maximum Drawdown)
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        max_drawdown = drawdown.min() * 100
+        if columnar:
+            return {
+                'dates': to_epoch_millis(dates).tolist(),
+                'values': values.tolist(),
+                'returns': returns.tolist()
+            }
 
-        # 승률 (상승한 날의 비율)
-        win_rate = (returns > 0).sum() / len(returns) * 100
+        return [
+            {'date': date, 'value': value, 'return': ret}
+            for date, value, ret in zip(dates.strftime('%Y-%m-%d'), values.tolist(), returns.tolist())
+        ]
 
-        # 최종 자산
-        final_value = self.portfolio_values.iloc[-1]
-        profit = final_value - self.initial_investment
+    def compare_with_benchmarks(self, benchmark_tickers=None, metrics=None):
+        """
+        여러 벤치마크(지수/섹터 ETF)와 비교
 
-        return {
-            'initial_investment': self.initial_investment,
-            'final_value': float(final_value),
-            'profit': float(profit),
-            'total_return': float(total_return),
-            'cagr': float(cagr),
-            'volatility': float(volatility),
-            'sharpe_ratio': float(sharpe),
-            'max_drawdown': float(max_drawdown),
-            'win_rate': float(win_rate),
-            'total_days': len(self.portfolio_values),
-            'trading_days': len(returns)
-        }
+        Args:
+            benchmark_tickers: 벤치마크 종목 코드 리스트 (기본: KODEX 200)
+            metrics: 이미 계산된 포트폴리오 성과 지표 (없으면 계산)
 
-    def get_portfolio_history(self):
-        """포트폴리오 가치 변화 이력"""
+        Returns:
+            list of dict (추적오차, 정보비율, 알파, 베타 포함)
+        """
         if self.portfolio_values is None:
             self.calculate_portfolio_value()
+        if metrics is None:
+            metrics = self.calculate_metrics()
+
+        return default_registry.compare(
+            self.portfolio_values,
+            benchmark_tickers or [DEFAULT_BENCHMARK],
+            self.start_date,
+            self.end_date,
+            metrics
+        )
+
+    def compare_with_benchmark(self, benchmark_ticker=DEFAULT_BENCHMARK, metrics=None):
+        """벤치마크(KOSPI ETF)와 비교"""
+        try:
+            comparisons = self.compare_with_benchmarks([benchmark_ticker], metrics)
+            return comparisons[0] if comparisons else None
+        except Exception as e:
+            print(f"Benchmark comparison error: {e}")
+            return None
 
-        history = []
-        for date, value in self.portfolio_values.items():
-            history.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'value': float(value),
-                'return': float((value / self.initial_investment - 1) * 100)
-            })
+    def get_monthly_returns(self, columnar=False):
+        """
+        월별 수익률 계산
 
-        return history
+        Args:
+            columnar: True면 {'months': [epoch ms], 'returns': [...]} 열 배열 형태
+        """
+        if self.portfolio_values is None:
+            self.calculate_portfolio_value()
 
-    def compare_with_benchmark(self, benchmark_ticker='069500'):
-        """벤치마크(KOSPI ETF)와 비교"""
-        try:
-            # 벤치마크 데이터 가져오기
-            benchmark_df = stock.get_market_ohlcv_by_date(
-                fromdate=self.start_date,
-                todate=self.end_date,
-                ticker=benchmark_ticker
-            )
+        # 월별로 리샘플링
+        monthly = self.portfolio_values.resample('M').last()
+        monthly_returns = monthly.pct_change().dropna() * 100
 
-            if benchmark_df.empty:
-                return None
+        if columnar:
+            return {
+                'months': to_epoch_millis(monthly_returns.index).tolist(),
+                'returns': monthly_returns.values.tolist()
+            }
 
-            # 벤치마크 정규화
-            benchmark_prices = benchmark_df['종가']
-            benchmark_normalized = benchmark_prices / benchmark_prices.iloc[0]
-            benchmark_values = benchmark_normalized * self.initial_investment
+        return [
+            {'month': month, 'return': ret}
+            for month, ret in zip(monthly_returns.index.strftime('%Y-%m'), monthly_returns.values.tolist())
+        ]
 
-            # 벤치마크 수익률
-            benchmark_return = (benchmark_values.iloc[-1] / self.initial_investment - 1) * 100
+    def _aligned_value_matrix(self):
+        """모든 종목 가격이 있는 날짜로 맞춘 (가격 DataFrame, (날짜, 종목 + 포트폴리오) 행렬)"""
+        if self.portfolio_values is None:
+            self.calculate_portfolio_value()
 
-            # 벤치마크 변동성
-            benchmark_returns = benchmark_values.pct_change().dropna()
-            benchmark_volatility = benchmark_returns.std() * np.sqrt(252) * 100
+        prices_df = self.prices_df.ffill().dropna()
+        matrix = np.column_stack([
+            prices_df.values,
+            self.portfolio_values.loc[prices_df.index].values
+        ])
+        return prices_df, matrix
 
-            # 초과 수익
-            portfolio_metrics = self.calculate_metrics()
-            excess_return = portfolio_metrics['total_return'] - benchmark_return
+    def get_rolling_metrics(self, window=DEFAULT_WINDOW, benchmark_ticker=DEFAULT_BENCHMARK, risk_free_rate=0.03):
+        """
+        포트폴리오와 개별 종목의 롤링 리스크 지표
+
+        Args:
+            window: 롤링 윈도우 (거래일)
+            benchmark_ticker: 베타 계산용 시장 지수 종목 코드
+            risk_free_rate: 무위험 수익률
+
+        Returns:
+            {
+                'dates': [epoch ms],
+                'window': window,
+                'portfolio': {'volatility', 'sharpe_ratio', 'beta', 'drawdown'},
+                'tickers': {ticker: {...}}
+            }
+            변동성/낙폭은 %, 윈도우가 채워지기 전 값은 None
+        """
+        prices_df, matrix = self._aligned_value_matrix()
+        if len(prices_df) <= window:
+            raise ValueError(f"Not enough data for a {window}-day window")
+
+        columns = list(prices_df.columns)
+
+        market = default_store.get_close_series(benchmark_ticker, self.start_date, self.end_date)
+        if market is not None:
+            market = market.reindex(prices_df.index).ffill().bfill()
+            market = None if market.isna().any() else market.values
 
+        rolling = compute_rolling_metrics(matrix, market, window, risk_free_rate)
+
+        def column_series(j):
             return {
-                'benchmark_ticker': benchmark_ticker,
-                'benchmark_name': 'KODEX 200',
-                'benchmark_return': float(benchmark_return),
-                'benchmark_volatility': float(benchmark_volatility),
-                'excess_return': float(excess_return),
-                'outperformed': bool(excess_return > 0)
+                'volatility': series_to_list(rolling['volatility'][:, j], 100),
+                'sharpe_ratio': series_to_list(rolling['sharpe_ratio'][:, j]),
+                'beta': series_to_list(rolling['beta'][:, j]) if rolling['beta'] is not None else None,
+                'drawdown': series_to_list(rolling['drawdown'][:, j], 100)
             }
-        except Exception as e:
-            print(f"Benchmark comparison error: {e}")
-            return None
 
-    def get_monthly_returns(self):
-        """월별 수익률 계산"""
-        if self.portfolio_values is None:
-            self.calculate_portfolio_value()
+        return {
+            'dates': to_epoch_millis(prices_df.index[1:]).tolist(),
+            'window': window,
+            'benchmark_ticker': benchmark_ticker if market is not None else None,
+            'portfolio': column_series(len(columns)),
+            'tickers': {ticker: column_series(j) for j, ticker in enumerate(columns)}
+        }
 
-        # 월별로 리샘플링
-        monthly = self.portfolio_values.resample('M').last()
-        monthly_returns = monthly.pct_change().dropna() * 100
+    def get_drawdown_analysis(self, top_n=5):
+        """
+        포트폴리오와 개별 종목의 낙폭 구간 분석
 
-        result = []
-        for date, ret in monthly_returns.items():
-            result.append({
-                'month': date.strftime('%Y-%m'),
-                'return': float(ret)
-            })
+        Args:
+            top_n: 반환할 상위 낙폭 구간 수
 
-        return result
+        Returns:
+            {'portfolio': {...}, 'tickers': {ticker: {...}}}
+            각 항목은 최대/현재 낙폭, 구간 수, 최장 수면 아래 기간, 상위 구간 목록
+        """
+        prices_df, matrix = self._aligned_value_matrix()
+        if prices_df.empty:
+            raise ValueError("No price data available")
+
+        analysis = top_drawdown_episodes(matrix, prices_df.index, top_n)
+
+        return {
+            'portfolio': analysis[-1],
+            'tickers': {ticker: analysis[j] for j, ticker in enumerate(prices_df.columns)}
+        }
+
+    def get_tail_risk(self, confidence_levels=DEFAULT_CONFIDENCE_LEVELS, horizons=DEFAULT_HORIZONS,
+                      methods=VAR_METHODS, n_paths=10000, seed=None):
+        """
+        포트폴리오 VaR/CVaR (비중을 매일 유지한다고 가정)
+
+        Args:
+            confidence_levels: 신뢰수준 목록 (예: [0.95, 0.99])
+            horizons: 보유기간 목록 (거래일)
+            methods: 'historical', 'parametric', 'monte_carlo' 중 선택
+            n_paths: 몬테카를로 경로 수
+            seed: 난수 시드
+
+        Returns:
+            {method: {'1d': {'95': {'var', 'cvar', 'var_amount', 'cvar_amount'}}}}
+            손실률 %, 금액은 최종 포트폴리오 가치 기준
+        """
+        prices_df, matrix = self._aligned_value_matrix()
+        prices = prices_df.values
+        if len(prices) < 2:
+            raise ValueError("No price data available")
+
+        returns = prices[1:] / prices[:-1] - 1
+        weights = np.array([self.weights[self.tickers.index(t)] for t in prices_df.columns])
+
+        table = tail_risk_table(returns, weights / weights.sum(), confidence_levels, horizons,
+                                methods, n_paths, seed)
+        return format_tail_risk(table, 0, confidence_levels, horizons, float(matrix[-1, -1]))
 
     def get_individual_performance(self):
         """개별 종목 성과"""
@@ -217,8 +424,108 @@ class PortfolioBacktester:
 
         return performance
 
-    def run_full_backtest(self):
-        """전체 백테스트 실행"""
+    def run_batch(self, weight_matrix, rebalance=None):
+        """
+        여러 비중 벡터 일괄 백테스트 (가격 데이터는 한 번만 로드)
+
+        Args:
+            weight_matrix: (k, n) 비중 행렬, 열 순서는 self.tickers와 동일
+            rebalance: None(매수 후 보유) 또는 'daily'
+
+        Returns:
+            dict of 지표 리스트 (각 길이 k)
+        """
+        if self.prices_df is None:
+            self.fetch_historical_prices()
+
+        # 전 종목 가격이 있는 구간에서 평가
+        prices_df = self.prices_df.ffill().dropna()
+        if prices_df.empty:
+            raise ValueError("No overlapping price data available")
+
+        weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+        columns = [self.tickers.index(ticker) for ticker in prices_df.columns]
+
+        # 가격 데이터가 있는 종목의 비중만 사용 (행별로 합계 1.0이 되도록 재정규화)
+        weight_matrix = weight_matrix[:, columns]
+        row_sums = weight_matrix.sum(axis=1, keepdims=True)
+        if np.any(row_sums <= 0):
+            raise ValueError("Weights of tickers with price data must sum to a positive value")
+
+        metrics = batch_backtest_metrics(prices_df.values, weight_matrix / row_sums, rebalance=rebalance)
+
+        return {key: values.tolist() for key, values in metrics.items()}
+
+    def run_contribution_plan(self, contribution, frequency='monthly'):
+        """
+        적립식 백테스트 (첫날 초기 투자금 + 주기별 정기 납입/인출)
+
+        Args:
+            contribution: 주기별 납입액 (음수면 인출)
+            frequency: 납입 주기 ('weekly', 'monthly', 'quarterly', 'yearly')
+
+        Returns:
+            {'metrics': {...}, 'history': [...]}
+        """
+        if self.prices_df is None:
+            self.fetch_historical_prices()
+
+        # 전 종목 가격이 있는 구간에서 평가
+        prices_df = self.prices_df.ffill().dropna()
+        if prices_df.empty:
+            raise ValueError("No overlapping price data available")
+
+        columns = list(prices_df.columns)
+        weights = np.array([self.weights[self.tickers.index(ticker)] for ticker in columns])
+        flow_mask = contribution_schedule_mask(prices_df.index, frequency)
+
+        amounts = np.full(flow_mask.sum(), float(contribution))
+        amounts[0] += self.initial_investment
+
+        result = batch_contribution_backtest(
+            prices_df.values, prices_df.index, weights[None, :] / weights.sum(), flow_mask, amounts[None, :]
+        )
+
+        values = result['values'][:, 0]
+        net_invested = result['net_invested'][:, 0]
+        final_value = float(result['final_value'][0])
+        net_total = float(net_invested[-1])
+
+        # IRR이 수렴하지 않으면 NaN - JSON에는 null로 (NaN은 올바른 JSON이 아님)
+        def to_float(v):
+            return None if np.isnan(v) else float(v)
+
+        metrics = {
+            'final_value': final_value,
+            'total_contributed': float(result['total_contributed'][0]),
+            'total_withdrawn': float(result['total_withdrawn'][0]),
+            'net_invested': net_total,
+            'profit': final_value - net_total,
+            'time_weighted_return': to_float(result['twr'][0]),
+            'money_weighted_return': to_float(result['irr'][0]),
+            'contribution': contribution,
+            'frequency': frequency,
+            'contribution_count': int(flow_mask.sum())
+        }
+
+        dates = prices_df.index.strftime('%Y-%m-%d')
+        history = [
+            {'date': date, 'value': float(value), 'net_invested': float(invested)}
+            for date, value, invested in zip(dates, values, net_invested)
+        ]
+
+        return {'metrics': metrics, 'history': history}
+
+    def run_full_backtest(self, columnar=False, max_points=None, downsample='lttb', benchmarks=None):
+        """
+        전체 백테스트 실행
+
+        Args:
+            columnar: 이력/월별 수익률을 열 배열 형태로 반환
+            max_points: 이력 최대 점 개수 (다운샘플링)
+            downsample: 다운샘플링 방식 ('lttb' 또는 'minmax')
+            benchmarks: 비교할 벤치마크 종목 코드 리스트 (기본: KODEX 200)
+        """
         # 가격 데이터 로드
         self.fetch_historical_prices()
 
@@ -229,21 +536,26 @@ class PortfolioBacktester:
         metrics = self.calculate_metrics()
 
         # 포트폴리오 히스토리
-        history = self.get_portfolio_history()
+        history = self.get_portfolio_history(columnar, max_points, downsample)
 
-        # 벤치마크 비교
-        benchmark = self.compare_with_benchmark()
+        # 벤치마크 비교 (성과 지표 재사용)
+        try:
+            comparisons = self.compare_with_benchmarks(benchmarks, metrics)
+        except Exception as e:
+            print(f"Benchmark comparison error: {e}")
+            comparisons = []
 
         # 월별 수익률
-        monthly_returns = self.get_monthly_returns()
+        monthly_returns = self.get_monthly_returns(columnar)
 
         # 개별 종목 성과
         individual = self.get_individual_performance()
 
-        return {
+        result = {
             'metrics': metrics,
             'history': history,
-            'benchmark': benchmark,
+            'benchmark': comparisons[0] if comparisons else None,
+            'benchmarks': comparisons,
             'monthly_returns': monthly_returns,
             'individual_performance': individual,
             'period': {
@@ -252,6 +564,12 @@ class PortfolioBacktester:
             }
         }
 
+        # 리밸런싱/거래비용 요약
+        if self.trading_summary is not None:
+            result['trading'] = self.trading_summary
+
+        return result
+
 
 def test_backtesting():
     """테스트 함수"""
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지표 커널 벤치마크
+numba 커널과 numpy/scipy 구현, 기존 pandas 방식(ewm, expanding)의 실행 시간을 비교합니다.
+
+실행: python3 bench_indicator_kernels.py
+(numba가 없으면 numpy 결과만 출력합니다. 설치: pip install numba)
+"""
+
+import time
+import numpy as np
+import pandas as pd
+import indicator_kernels as kernels
+
+
+def bench(func, repeat=5):
+    """최소 실행 시간 (ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def pandas_ema_per_ticker(prices, span):
+    return [pd.Series(prices[:, j]).ewm(span=span, adjust=False).mean().values for j in range(prices.shape[1])]
+
+
+def pandas_mdd_per_ticker(prices):
+    results = []
+    for j in range(prices.shape[1]):
+        cumulative = pd.Series(prices[:, j])
+        running_max = cumulative.expanding().max()
+        results.append(((cumulative - running_max) / running_max).min())
+    return results
+
+
+def run_case(title, num_days, num_tickers):
+    rng = np.random.default_rng(0)
+    prices = 50000 * np.cumprod(1 + rng.normal(0.0003, 0.02, (num_days, num_tickers)), axis=0)
+    alpha = 2.0 / 21
+
+    print(f"\n=== {title}: {num_days}일 × {num_tickers}종목 ===")
+
+    rows = [
+        ('EMA(20) pandas ewm (종목별)', lambda: pandas_ema_per_ticker(prices, 20)),
+        ('EMA(20) numpy lfilter', lambda: kernels.ema(prices, alpha, backend='numpy')),
+        ('와일더 평활(14) numpy', lambda: kernels.wilder_smooth(prices, 14, backend='numpy')),
+        ('MDD pandas expanding (종목별)', lambda: pandas_mdd_per_ticker(prices)),
+        ('MDD numpy', lambda: kernels.max_drawdown(prices, backend='numpy')),
+    ]
+    if kernels.HAS_NUMBA:
+        # 첫 호출에서 컴파일 (벤치마크 제외)
+        kernels.ema(prices[:30], alpha, backend='numba')
+        kernels.wilder_smooth(prices[:30], 14, backend='numba')
+        kernels.max_drawdown(prices[:30], backend='numba')
+        rows += [
+            ('EMA(20) numba', lambda: kernels.ema(prices, alpha, backend='numba')),
+            ('와일더 평활(14) numba', lambda: kernels.wilder_smooth(prices, 14, backend='numba')),
+            ('MDD numba', lambda: kernels.max_drawdown(prices, backend='numba')),
+        ]
+
+    for name, func in rows:
+        print(f"  {name:<32} {bench(func):10.3f} ms")
+
+    # 구현 간 결과 일치 확인
+    if kernels.HAS_NUMBA:
+        ema_diff = np.abs(kernels.ema(prices, alpha, 'numba') - kernels.ema(prices, alpha, 'numpy')).max()
+        mdd_diff = np.abs(kernels.max_drawdown(prices, 'numba') - kernels.max_drawdown(prices, 'numpy')).max()
+        print(f"  최대 차이: EMA {ema_diff:.2e}, MDD {mdd_diff:.2e}")
+
+
+if __name__ == '__main__':
+    print(f"커널 기본 구현: {kernels.DEFAULT_BACKEND} (numba 설치: {'예' if kernels.HAS_NUMBA else '아니오'})")
+    run_case('짧은 시계열 단일 종목', 60, 1)
+    run_case('1년 단일 종목', 252, 1)
+    run_case('1년 전체 유니버스', 252, 2000)
+    run_case('20년 포트폴리오', 5000, 50)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크 레지스트리
+지수 ETF(KODEX 200, TIGER 200)와 섹터 ETF의 일간 수익률을 메모리에 유지하고,
+포트폴리오 수익률을 여러 벤치마크에 한 번에 회귀하여
+추적오차, 정보비율, 알파, 베타를 계산합니다.
+"""
+
+import threading
+import numpy as np
+from datetime import datetime
+from price_store import default_store
+
+
+DEFAULT_BENCHMARK = '069500'
+
+# 종목 코드 -> 벤치마크 이름
+BENCHMARKS = {
+    '069500': 'KODEX 200',
+    '102110': 'TIGER 200',
+    '091160': 'KODEX 반도체',
+    '091180': 'KODEX 자동차',
+}
+
+
+class BenchmarkRegistry:
+    def __init__(self, price_store=None):
+        """
+        Args:
+            price_store: 공유 가격 저장소 (기본: default_store)
+        """
+        self.price_store = price_store or default_store
+        self._returns = {}
+        self._lock = threading.Lock()
+
+    def get_returns(self, ticker, start_date, end_date):
+        """
+        벤치마크 일간 수익률 Series (데이터가 없으면 None)
+
+        같은 날 같은 기간 요청은 메모리에 유지한 결과를 그대로 반환합니다.
+        """
+        today = datetime.now().strftime('%Y%m%d')
+        key = (ticker, start_date, end_date)
+
+        with self._lock:
+            cached = self._returns.get(key)
+        if cached is not None and cached[0] == today:
+            return cached[1]
+
+        prices = self.price_store.get_close_series(ticker, start_date, end_date)
+        if prices is None or len(prices) < 2:
+            return None
+
+        returns = prices.pct_change().iloc[1:]
+        with self._lock:
+            # 지난 날짜의 항목은 정리
+            self._returns = {k: v for k, v in self._returns.items() if v[0] == today}
+            self._returns[key] = (today, returns)
+        return returns
+
+    def compare(self, portfolio_values, benchmark_tickers, start_date, end_date,
+                portfolio_metrics, risk_free_rate=0.03):
+        """
+        포트폴리오와 여러 벤치마크 비교
+
+        Args:
+            portfolio_values: 날짜 인덱스의 포트폴리오 가치 Series
+            benchmark_tickers: 벤치마크 종목 코드 리스트
+            start_date, end_date: 벤치마크 조회 기간
+            portfolio_metrics: 이미 계산된 포트폴리오 성과 지표 (total_return 사용)
+            risk_free_rate: 무위험 수익률 (연)
+
+        Returns:
+            list of dict (벤치마크별 수익률/변동성/초과수익/추적오차/정보비율/알파/베타)
+            데이터가 있는 벤치마크가 없으면 빈 리스트
+        """
+        portfolio_returns = portfolio_values.pct_change().iloc[1:]
+
+        tickers = []
+        columns = []
+        for ticker in benchmark_tickers:
+            returns = self.get_returns(ticker, start_date, end_date)
+            if returns is None:
+                print(f'[경고] {ticker} 벤치마크 데이터 없음')
+                continue
+            tickers.append(ticker)
+            columns.append(returns.reindex(portfolio_returns.index).values)
+
+        if not tickers:
+            return []
+
+        # 모든 벤치마크가 있는 날짜로 맞춘 (날짜, 벤치마크) 수익률 행렬
+        bench = np.column_stack(columns)
+        valid = ~np.isnan(bench).any(axis=1)
+        bench = bench[valid]
+        rp = portfolio_returns.values[valid]
+        if len(rp) < 2:
+            return []
+
+        daily_rf = risk_free_rate / 252
+        rp_mean = rp.mean()
+        bench_mean = bench.mean(axis=0)
+        rp_centered = rp - rp_mean
+        bench_centered = bench - bench_mean
+
+        # 벤치마크별 단순회귀 (rp = alpha + beta * rb)
+        bench_var = (bench_centered * bench_centered).sum(axis=0)
+        beta = np.divide(bench_centered.T @ rp_centered, bench_var,
+                         out=np.full(len(tickers), np.nan), where=bench_var > 0)
+        alpha = ((rp_mean - daily_rf) - beta * (bench_mean - daily_rf)) * 252 * 100
+        rp_var = (rp_centered * rp_centered).sum()
+        r_squared = np.divide((bench_centered.T @ rp_centered) ** 2, bench_var * rp_var,
+                              out=np.full(len(tickers), np.nan), where=bench_var * rp_var > 0)
+
+        # 초과 수익률 기반 추적오차/정보비율
+        active = rp[:, None] - bench
+        tracking_error = active.std(axis=0, ddof=1) * np.sqrt(252)
+        information_ratio = np.divide(active.mean(axis=0) * 252, tracking_error,
+                                      out=np.full(len(tickers), np.nan), where=tracking_error > 0)
+
+        bench_return = (np.prod(1 + bench, axis=0) - 1) * 100
+        bench_volatility = bench.std(axis=0, ddof=1) * np.sqrt(252) * 100
+        excess_return = portfolio_metrics['total_return'] - bench_return
+
+        def to_float(v):
+            return None if np.isnan(v) else float(v)
+
+        return [
+            {
+                'benchmark_ticker': ticker,
+                'benchmark_name': BENCHMARKS.get(ticker, ticker),
+                'benchmark_return': float(bench_return[j]),
+                'benchmark_volatility': float(bench_volatility[j]),
+                'excess_return': float(excess_return[j]),
+                'outperformed': bool(excess_return[j] > 0),
+                'tracking_error': float(tracking_error[j] * 100),
+                'information_ratio': to_float(information_ratio[j]),
+                'alpha': to_float(alpha[j]),
+                'beta': to_float(beta[j]),
+                'r_squared': to_float(r_squared[j])
+            }
+            for j, ticker in enumerate(tickers)
+        ]
+
+
+# 서버 전역 레지스트리
+default_registry = BenchmarkRegistry()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목 메타데이터 생성 스크립트
+프론트엔드 종목 데이터(src/data/stockData.js, extendedStocks.js)와 KRX 전체 상장 종목
+(pykrx: KOSPI/KOSDAQ/ETF 목록, 업종, 시가총액, PER/배당수익률)을 합쳐
+data/stock_metadata.json을 만듭니다.
+
+실행: python3 build_stock_metadata.py [--offline]
+(--offline이거나 KRX 조회에 실패하면 프론트엔드 데이터만으로 생성합니다)
+
+우선순위
+- 섹터/유형/종목명: 프론트엔드 데이터 > KRX 업종 분류
+- 배당수익률/PER/ROE: KRX 최신 값 > 프론트엔드 데이터
+- 시장(KOSPI/KOSDAQ/ETF): KRX 목록 > 기존 data/stock_metadata.json (오프라인 재생성 시 유지)
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from stock_metadata import STOCK_METADATA_FILE
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_DATA_FILES = [
+    os.path.join(BASE_DIR, 'src', 'data', 'stockData.js'),
+    os.path.join(BASE_DIR, 'src', 'data', 'extendedStocks.js'),
+]
+
+# 프론트엔드 배열 이름 -> 종목 유형
+FRONTEND_GROUP_TYPES = {
+    'dividendStocks': 'dividend',
+    'largeCapStocks': 'largecap',
+    'growthStocks': 'growth',
+    'bluechip': 'largecap',
+    'etfs': 'etf',
+}
+
+# KRX 업종명 키워드 -> 섹터 (앞에서부터 먼저 일치하는 항목)
+KRX_SECTOR_KEYWORDS = [
+    ('통신', 'telecom'),
+    ('금융', 'finance'), ('은행', 'finance'), ('증권', 'finance'), ('보험', 'finance'),
+    ('의약', 'healthcare'), ('의료', 'healthcare'), ('제약', 'healthcare'), ('바이오', 'healthcare'),
+    ('전기전자', 'tech'), ('반도체', 'tech'), ('IT', 'tech'), ('소프트웨어', 'tech'),
+    ('디지털', 'tech'), ('인터넷', 'tech'), ('게임', 'tech'), ('컴퓨터', 'tech'),
+    ('전기가스', 'energy'), ('에너지', 'energy'),
+    ('화학', 'materials'), ('철강', 'materials'), ('금속', 'materials'), ('비금속', 'materials'),
+    ('종이', 'materials'),
+    ('음식료', 'consumer'), ('유통', 'consumer'), ('섬유', 'consumer'), ('오락', 'consumer'),
+    ('방송', 'consumer'), ('출판', 'consumer'),
+]
+DEFAULT_SECTOR = 'industrial'
+
+# 대형주 기준 시가총액 (원)
+LARGECAP_MIN_MARKET_CAP = 5_000_000_000_000
+# 배당주 기준 배당수익률 (%)
+DIVIDEND_MIN_YIELD = 3.0
+# 성장주 기준 PER
+GROWTH_MIN_PER = 25.0
+
+
+def parse_frontend_stocks(paths=FRONTEND_DATA_FILES):
+    """
+    프론트엔드 JS 데이터 파일의 종목 객체 파싱
+
+    Returns:
+        {ticker: {'name', 'sector', 'type', 'dividendYield', 'per', 'roe'}} (처음 나온 값 우선)
+    """
+    stocks = {}
+    field_pattern = re.compile(r"(\w+):\s*(?:'([^']*)'|(-?[\d.]+))")
+    group_pattern = re.compile(r"^\s*(\w+):\s*\[", re.MULTILINE)
+    object_pattern = re.compile(r"\{[^{}]*ticker:[^{}]*\}")
+
+    for path in paths:
+        if not os.path.exists(path):
+            print(f'[경고] {path} 없음')
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+
+        groups = [(m.start(), m.group(1)) for m in group_pattern.finditer(source)]
+        for match in object_pattern.finditer(source):
+            group = None
+            for start, name in groups:
+                if start < match.start():
+                    group = name
+
+            fields = {}
+            for key, text, number in field_pattern.findall(match.group(0)):
+                fields[key] = text if text or not number else float(number)
+
+            ticker = fields.get('ticker')
+            if not ticker or ticker in stocks:
+                continue
+
+            stock_type = fields.get('type') or FRONTEND_GROUP_TYPES.get(group)
+            stocks[ticker] = {
+                'name': fields.get('name'),
+                'sector': fields.get('sector'),
+                'type': stock_type.lower() if stock_type else None,
+                'dividendYield': fields.get('dividendYield'),
+                'per': fields.get('per'),
+                'roe': fields.get('roe'),
+            }
+
+    return stocks
+
+
+def map_krx_sector(industry):
+    """KRX 업종명을 섹터로 변환"""
+    if not industry:
+        return None
+    for keyword, sector in KRX_SECTOR_KEYWORDS:
+        if keyword in industry:
+            return sector
+    return DEFAULT_SECTOR
+
+
+def fetch_krx_listing():
+    """
+    KRX 전체 상장 종목 (KOSPI, KOSDAQ, ETF)
+
+    Returns:
+        {ticker: {'name', 'market', 'industry', 'marketCap', 'dividendYield', 'per', 'roe'}}
+    """
+    from pykrx import stock
+
+    date = stock.get_nearest_business_day_in_a_week()
+    listing = {}
+
+    for market in ('KOSPI', 'KOSDAQ'):
+        for ticker in stock.get_market_ticker_list(date, market=market):
+            listing[ticker] = {'name': stock.get_market_ticker_name(ticker), 'market': market}
+
+        try:
+            sectors = stock.get_market_sector_classifications(date, market)
+            for ticker, industry in sectors['업종명'].items():
+                if ticker in listing:
+                    listing[ticker]['industry'] = industry
+        except Exception as e:
+            print(f'[경고] {market} 업종 분류 조회 실패: {e}')
+
+    try:
+        caps = stock.get_market_cap(date, market='ALL')
+        for ticker, cap in caps['시가총액'].items():
+            if ticker in listing:
+                listing[ticker]['marketCap'] = float(cap)
+    except Exception as e:
+        print(f'[경고] 시가총액 조회 실패: {e}')
+
+    try:
+        fundamentals = stock.get_market_fundamental(date, market='ALL')
+        for ticker, row in fundamentals.iterrows():
+            if ticker not in listing:
+                continue
+            per = float(row['PER'])
+            listing[ticker]['dividendYield'] = float(row['DIV'])
+            listing[ticker]['per'] = per if per > 0 else None
+            # ROE = EPS / BPS
+            listing[ticker]['roe'] = float(row['EPS'] / row['BPS'] * 100) if row['BPS'] > 0 else None
+    except Exception as e:
+        print(f'[경고] 기본 지표 조회 실패: {e}')
+
+    for ticker in stock.get_etf_ticker_list(date):
+        listing[ticker] = {'name': stock.get_etf_ticker_name(ticker), 'market': 'ETF'}
+
+    print(f'[INFO] KRX 상장 종목 {len(listing)}개 ({date})')
+    return listing
+
+
+def infer_type(meta):
+    """유형이 없는 종목의 유형 추정 (ETF > 배당 > 대형 > 성장 > 중형)"""
+    if meta.get('sector') == 'etf' or meta.get('market') == 'ETF':
+        return 'etf'
+    if (meta.get('dividendYield') or 0) >= DIVIDEND_MIN_YIELD:
+        return 'dividend'
+    if (meta.get('marketCap') or 0) >= LARGECAP_MIN_MARKET_CAP:
+        return 'largecap'
+    if (meta.get('per') or 0) >= GROWTH_MIN_PER:
+        return 'growth'
+    return 'midcap'
+
+
+def _first(key, *sources):
+    """앞선 원본부터 값이 있는 첫 항목"""
+    for source in sources:
+        if source.get(key) is not None:
+            return source[key]
+    return None
+
+
+def load_previous_metadata(path=STOCK_METADATA_FILE):
+    """기존 메타데이터 파일의 종목 항목 (없으면 빈 딕셔너리)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('stocks', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def build_metadata(krx_listing=None, frontend=None, previous=None):
+    """
+    메타데이터 병합
+
+    Args:
+        krx_listing: fetch_krx_listing 결과 (없으면 빈 딕셔너리)
+        frontend: parse_frontend_stocks 결과 (기본: 프론트엔드 파일 파싱)
+        previous: 기존 메타데이터 종목 항목 (KRX 목록에 없는 종목의 시장 유지, 기본: load_previous_metadata)
+
+    Returns:
+        {ticker: {'name', 'market', 'sector', 'type', 'dividendYield', 'per', 'roe', 'marketCap'}}
+    """
+    krx_listing = krx_listing or {}
+    frontend = frontend if frontend is not None else parse_frontend_stocks()
+    previous = previous if previous is not None else load_previous_metadata()
+
+    stocks = {}
+    for ticker in sorted(set(krx_listing) | set(frontend)):
+        krx = krx_listing.get(ticker, {})
+        js = frontend.get(ticker, {})
+
+        sector = js.get('sector')
+        if sector is None:
+            sector = 'etf' if krx.get('market') == 'ETF' else (map_krx_sector(krx.get('industry')) or DEFAULT_SECTOR)
+
+        meta = {
+            'name': _first('name', js, krx) or ticker,
+            'market': _first('market', krx, previous.get(ticker, {})) or ('ETF' if sector == 'etf' else None),
+            'sector': sector,
+            'dividendYield': _first('dividendYield', krx, js) or 0.0,
+            'per': _first('per', krx, js),
+            'roe': _first('roe', krx, js),
+            'marketCap': krx.get('marketCap'),
+        }
+        meta['type'] = js.get('type') or infer_type(meta)
+        stocks[ticker] = meta
+
+    return stocks
+
+
+def main():
+    offline = '--offline' in sys.argv
+
+    krx_listing = {}
+    if not offline:
+        try:
+            krx_listing = fetch_krx_listing()
+        except Exception as e:
+            print(f'[경고] KRX 종목 조회 실패 - 프론트엔드 데이터만 사용: {e}')
+
+    stocks = build_metadata(krx_listing)
+    data = {
+        'version': 1,
+        'built_at': datetime.now().strftime('%Y-%m-%d'),
+        'source': 'krx+frontend' if krx_listing else 'frontend',
+        'stocks': stocks
+    }
+
+    os.makedirs(os.path.dirname(STOCK_METADATA_FILE), exist_ok=True)
+    tmp_path = f'{STOCK_METADATA_FILE}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, STOCK_METADATA_FILE)
+
+    print(f'[INFO] {STOCK_METADATA_FILE} 생성: {len(stocks)}개 종목')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,31 +5,129 @@ Content-Based 추천 엔진
 종목의 특징 기반으로 유사한 종목을 추천합니다.
 """
 
-from feature_extractor import FeatureExtractor
+import numpy as np
+from datetime import datetime
+from feature_extractor import FeatureExtractor, VECTOR_FEATURES, STOCK_TYPES, category_codes
+from feature_store import FeatureStore
+from neighbor_index import NeighborIndex
 import similarity_metrics as sim
 
 
 class ContentBasedRecommender:
     def __init__(self):
         self.feature_extractor = FeatureExtractor()
-        self.stocks_features_cache = {}
+        # 가격 특징은 영속 저장소에서 (하루 한 번 새 거래일이 있는 종목만 재계산)
+        self.feature_store = FeatureStore(self.feature_extractor)
+        # 후보 종목 전체의 유사 종목 상위 K개 (특징이 갱신되면 다시 생성)
+        self.neighbor_index = None
+        self._neighbor_key = None
+        # 장중 갱신된 특징 {ticker: (날짜, 저장소 generation, {feature: value})}
+        # 날짜가 바뀌거나 저장소가 해당 종목 특징을 다시 계산하면 버림
+        self.feature_overrides = {}
 
     def get_stock_features(self, ticker, stock_data=None, sentiment_score=None):
-        """종목의 특징 추출 (캐싱)"""
-        cache_key = ticker
-        if cache_key in self.stocks_features_cache:
-            return self.stocks_features_cache[cache_key]
+        """종목의 특징 추출 (특징 저장소 사용)"""
+        price_features = self.feature_store.get_price_features([ticker]).get(ticker)
+        return self.feature_extractor.combine_features(
+            ticker, price_features, stock_data, sentiment_score
+        )
+
+    def get_feature_matrix(self, tickers):
+        """
+        후보 종목 전체의 특징 테이블과 특징 행렬 (특징 저장소에서 한 번에 조회)
+
+        Returns:
+            {
+                'tickers': list,
+                'table': {ticker: features},
+                'matrix': (N, d) 정규화 특징 (0-1),
+                'raw': (N, d) 원래 특징 값,
+                'sector_codes': (N,), 'type_codes': (N,)
+            }
+        """
+        table = self.feature_store.get_features(tickers)
+        for ticker, changes in self._active_overrides().items():
+            if ticker in table:
+                table[ticker] = {**table[ticker], **changes}
+        tickers, matrix = self.feature_extractor.features_to_matrix(table, 'minmax')
+        _, raw = self.feature_extractor.features_to_matrix(table, 'raw')
+        sector_codes, type_codes = category_codes(table)
+
+        return {
+            'tickers': tickers,
+            'table': table,
+            'matrix': matrix,
+            'raw': raw,
+            'sector_codes': sector_codes,
+            'type_codes': type_codes
+        }
+
+    def _active_overrides(self):
+        """오늘, 저장소 특징이 바뀌기 전에 기록한 장중 갱신만 (나머지는 삭제)"""
+        today = datetime.now().strftime('%Y%m%d')
+        active = {}
+        for ticker, (date, generation, changes) in list(self.feature_overrides.items()):
+            if date == today and self.feature_store.generation_of([ticker]) == generation:
+                active[ticker] = changes
+            else:
+                del self.feature_overrides[ticker]
+        return active
+
+    def get_neighbor_index(self, all_tickers):
+        """
+        후보 종목 전체의 이웃 인덱스 (후보 목록이 바뀌거나 특징이 갱신된 경우에만 다시 생성)
+        """
+        universe = tuple(dict.fromkeys(all_tickers))
+        stale = self.feature_store.needs_refresh(universe)
+
+        key = (universe, self.feature_store.generation_of(universe))
+        if self.neighbor_index is None or stale or self._neighbor_key != key:
+            data = self.get_feature_matrix(universe)
+            self.neighbor_index = NeighborIndex().build(
+                data['tickers'], data['table'], data['matrix'], data['sector_codes'], data['type_codes']
+            )
+            self._neighbor_key = (universe, self.feature_store.generation_of(universe))
+
+        return self.neighbor_index
+
+    def update_stock_features(self, ticker, **changes):
+        """
+        장중에 바뀐 종목 특징 반영 (예: 뉴스 감성 점수)
 
-        features = self.feature_extractor.extract_all_features(
-            ticker, stock_data, sentiment_score
+        이웃 인덱스에 있는 종목이면 전체를 다시 만들지 않고 해당 종목 행과
+        영향받는 이웃 목록만 고칩니다 (유사도에 쓰이지 않는 특징이면 특징만 교체).
+        갱신 값은 당일, 저장소가 해당 종목 특징을 다시 계산하기 전까지만 유지됩니다.
+
+        Args:
+            ticker: 종목 코드
+            **changes: 바꿀 특징 (VECTOR_FEATURES 중), 예: sentiment_score=0.4
+
+        Returns:
+            다시 계산한 이웃 목록 수 (인덱스에 없는 종목이면 0)
+        """
+        unknown = set(changes) - set(VECTOR_FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown features: {sorted(unknown)}")
+
+        previous = self._active_overrides().get(ticker, {})
+        self.feature_overrides[ticker] = (
+            datetime.now().strftime('%Y%m%d'),
+            self.feature_store.generation_of([ticker]),
+            {**previous, **changes}
         )
-        self.stocks_features_cache[cache_key] = features
-        return features
+
+        index = self.neighbor_index
+        if index is None or ticker not in index:
+            return 0
+        return index.update(ticker, {**index.table[ticker], **changes})
 
     def recommend_similar_stocks(self, ticker, all_tickers, top_k=5, exclude_tickers=None):
         """
         특정 종목과 유사한 종목 추천
 
+        후보 목록에 있는 종목은 미리 계산한 이웃 인덱스에서 바로 조회하고,
+        없는 종목은 후보 전체와의 유사도를 계산합니다.
+
         Args:
             ticker: 기준 종목
             all_tickers: 후보 종목 리스트
@@ -47,43 +145,33 @@ class ContentBasedRecommender:
         if exclude_tickers is None:
             exclude_tickers = []
 
-        # 기준 종목 특징 추출
-        target_features = self.get_stock_features(ticker)
-
-        # 모든 후보 종목의 특징 추출
-        candidates = []
-        for candidate_ticker in all_tickers:
-            if candidate_ticker == ticker or candidate_ticker in exclude_tickers:
-                continue
-
-            try:
-                candidate_features = self.get_stock_features(candidate_ticker)
-
-                # 유사도 계산
-                similarity = sim.weighted_similarity(target_features, candidate_features)
-
-                candidates.append({
-                    'ticker': candidate_ticker,
-                    'similarity': similarity,
-                    'features': candidate_features
-                })
-            except Exception as e:
-                print(f'[경고] {candidate_ticker} 추천 생성 실패: {e}')
-                continue
-
-        # 유사도 높은 순으로 정렬
-        candidates.sort(key=lambda x: x['similarity'], reverse=True)
-
-        # 상위 K개 선택
-        recommendations = candidates[:top_k]
-
-        # 추천 이유 생성
-        for rec in recommendations:
-            rec['reason'] = self._generate_similarity_reason(
-                target_features,
-                rec['features'],
-                rec['similarity']
+        index = self.get_neighbor_index(all_tickers)
+        if ticker in index:
+            table = index.table
+            neighbors = index.query(ticker, top_k, exclude_tickers)
+        else:
+            data = self.get_feature_matrix([ticker] + list(all_tickers))
+            table = data['table']
+
+            # 기준 종목(0번 행)과 모든 후보의 유사도
+            similarities = sim.weighted_similarity_to_all(
+                0, data['matrix'], data['sector_codes'], data['type_codes']
             )
+            excluded = set(exclude_tickers) | {ticker}
+            candidates = np.array([i for i, t in enumerate(data['tickers']) if t not in excluded], dtype=int)
+            top = candidates[np.argsort(-similarities[candidates], kind='stable')[:top_k]]
+            neighbors = [(data['tickers'][i], float(similarities[i])) for i in top]
+
+        target_features = table[ticker]
+        recommendations = []
+        for neighbor, similarity in neighbors:
+            features = table[neighbor]
+            recommendations.append({
+                'ticker': neighbor,
+                'similarity': similarity,
+                'features': features,
+                'reason': self._generate_similarity_reason(target_features, features, similarity)
+            })
 
         return recommendations
 
@@ -99,58 +187,30 @@ class ContentBasedRecommender:
         if not portfolio_tickers:
             return []
 
-        # 포트폴리오 종목들의 특징 추출
-        portfolio_features = []
-        for ticker in portfolio_tickers:
-            try:
-                features = self.get_stock_features(ticker)
-                portfolio_features.append(features)
-            except:
-                continue
+        data = self.get_feature_matrix(list(portfolio_tickers) + list(all_tickers))
+        tickers = data['tickers']
+        portfolio_rows = [tickers.index(t) for t in dict.fromkeys(portfolio_tickers)]
 
-        if not portfolio_features:
-            return []
+        # 포트폴리오 각 종목과의 비유사도 평균
+        similarities = sim.weighted_similarity_matrix(
+            data['matrix'], data['sector_codes'], data['type_codes'], rows=portfolio_rows
+        )
+        diversity = 1.0 - similarities.mean(axis=0)
 
-        # 후보 종목 평가
-        candidates = []
-        for candidate_ticker in all_tickers:
-            if candidate_ticker in portfolio_tickers:
-                continue
-
-            try:
-                candidate_features = self.get_stock_features(candidate_ticker)
-
-                # 포트폴리오 각 종목과의 비유사도 계산
-                diversities = []
-                for pf_features in portfolio_features:
-                    similarity = sim.weighted_similarity(pf_features, candidate_features)
-                    diversity = 1.0 - similarity
-                    diversities.append(diversity)
-
-                # 평균 다양성
-                avg_diversity = sum(diversities) / len(diversities)
-
-                candidates.append({
-                    'ticker': candidate_ticker,
-                    'diversity': avg_diversity,
-                    'features': candidate_features
-                })
-            except Exception as e:
-                print(f'[경고] {candidate_ticker} 다양화 추천 실패: {e}')
-                continue
-
-        # 다양성 높은 순으로 정렬
-        candidates.sort(key=lambda x: x['diversity'], reverse=True)
-
-        # 상위 K개 선택
-        recommendations = candidates[:top_k]
-
-        # 추천 이유 생성
-        for rec in recommendations:
-            rec['reason'] = self._generate_diversity_reason(
-                rec['features'],
-                rec['diversity']
-            )
+        candidates = np.array([i for i, t in enumerate(tickers) if t not in portfolio_tickers], dtype=int)
+
+        # 다양성 높은 순으로 상위 K개 선택
+        top = candidates[np.argsort(-diversity[candidates], kind='stable')[:top_k]]
+
+        recommendations = []
+        for i in top:
+            features = data['table'][tickers[i]]
+            recommendations.append({
+                'ticker': tickers[i],
+                'diversity': float(diversity[i]),
+                'features': features,
+                'reason': self._generate_diversity_reason(features, float(diversity[i]))
+            })
 
         return recommendations
 
@@ -187,52 +247,37 @@ class ContentBasedRecommender:
 
         profile = risk_profiles.get(risk_tolerance, risk_profiles['moderate'])
 
-        # 후보 종목 필터링 및 평가
-        candidates = []
-        for ticker in all_tickers:
-            try:
-                features = self.get_stock_features(ticker)
-
-                # 리스크 기준 체크
-                if features['volatility'] > profile['volatility_max']:
-                    continue
-
-                if features['sharpe_ratio'] < profile['sharpe_min']:
-                    continue
-
-                if features['dividend_yield'] < profile['dividend_min']:
-                    continue
-
-                # 타입 선호도 체크
-                if features['type'] not in profile['preferred_types']:
-                    continue
-
-                # 점수 계산 (리스크 조정 수익률)
-                score = features['sharpe_ratio'] * 0.4 + \
-                        features['dividend_yield'] * 0.3 + \
-                        (1.0 - features['volatility']) * 0.3
-
-                candidates.append({
-                    'ticker': ticker,
-                    'score': score,
-                    'features': features
-                })
-            except Exception as e:
-                print(f'[경고] {ticker} 리스크 프로필 추천 실패: {e}')
-                continue
-
-        # 점수 높은 순으로 정렬
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-
-        # 상위 K개 선택
-        recommendations = candidates[:top_k]
-
-        # 추천 이유 생성
-        for rec in recommendations:
-            rec['reason'] = self._generate_risk_profile_reason(
-                rec['features'],
-                risk_tolerance
-            )
+        data = self.get_feature_matrix(all_tickers)
+        tickers = data['tickers']
+        raw = data['raw']
+        volatility = raw[:, VECTOR_FEATURES.index('volatility')]
+        sharpe = raw[:, VECTOR_FEATURES.index('sharpe_ratio')]
+        dividend = raw[:, VECTOR_FEATURES.index('dividend_yield')]
+        preferred = np.isin(data['type_codes'], [STOCK_TYPES[t] for t in profile['preferred_types']])
+
+        # 리스크 기준 + 타입 선호도 필터
+        eligible = (
+            (volatility <= profile['volatility_max']) &
+            (sharpe >= profile['sharpe_min']) &
+            (dividend >= profile['dividend_min']) &
+            preferred
+        )
+
+        # 점수 계산 (리스크 조정 수익률)
+        scores = sharpe * 0.4 + dividend * 0.3 + (1.0 - volatility) * 0.3
+
+        candidates = np.flatnonzero(eligible)
+        top = candidates[np.argsort(-scores[candidates], kind='stable')[:top_k]]
+
+        recommendations = []
+        for i in top:
+            features = data['table'][tickers[i]]
+            recommendations.append({
+                'ticker': tickers[i],
+                'score': float(scores[i]),
+                'features': features,
+                'reason': self._generate_risk_profile_reason(features, risk_tolerance)
+            })
 
         return recommendations
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+전체 종목 상관관계 서비스
+유니버스 전체의 상관관계 행렬을 거래일당 한 번 계산하여 float32 배열로
+메모리에 유지하고, 포트폴리오별 상관관계는 부분 행렬을 잘라서 반환합니다.
+"""
+
+import threading
+import numpy as np
+from datetime import datetime, timedelta
+from price_store import default_store
+
+
+class CorrelationService:
+    def __init__(self, universe, price_store=None, lookback_days=365):
+        """
+        Args:
+            universe: 전체 종목 코드 리스트
+            price_store: 공유 가격 저장소 (기본: default_store)
+            lookback_days: 상관관계 계산 기간 (일)
+        """
+        self.universe = list(universe)
+        self.price_store = price_store or default_store
+        self.lookback_days = lookback_days
+
+        self.tickers = []
+        self.index = {}
+        self.matrix = None
+        self.start_date = None
+        self.as_of = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """상관관계 행렬 계산 (같은 날에는 재계산하지 않음)"""
+        today = datetime.now().strftime('%Y%m%d')
+        if not force and self.as_of == today and self.matrix is not None:
+            return
+
+        with self._lock:
+            if not force and self.as_of == today and self.matrix is not None:
+                return
+
+            start_date = (datetime.now() - timedelta(days=self.lookback_days)).strftime('%Y%m%d')
+            prices_df = self.price_store.get_close_prices(self.universe, start_date, today)
+            if prices_df.empty:
+                raise ValueError("No price data available")
+
+            returns_df = prices_df.pct_change(fill_method=None).iloc[1:]
+
+            if returns_df.isna().values.any():
+                # 상장일이 다른 종목이 있으면 쌍별 유효 구간으로 계산
+                corr = returns_df.corr(min_periods=20).values
+            else:
+                corr = np.corrcoef(returns_df.values, rowvar=False)
+
+            self.tickers = list(returns_df.columns)
+            self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+            self.matrix = corr.astype(np.float32)
+            self.start_date = start_date
+            self.as_of = today
+
+    def _submatrix(self, tickers):
+        """유니버스에 있는 종목들의 상관관계 부분 행렬 ((n, n) float64, 계산 불가 쌍은 0)"""
+        idx = np.array([self.index[t] for t in tickers], dtype=np.intp)
+        return np.nan_to_num(self.matrix[np.ix_(idx, idx)].astype(np.float64))
+
+    def cached_submatrix(self, tickers, start_date, end_date):
+        """
+        이미 계산된 행렬에서 같은 기간의 부분 행렬 조회 (재계산하지 않음)
+
+        Returns:
+            (n, n) float64 배열 - 행렬이 없거나 기간이 다르거나 유니버스에 없는 종목이 있으면 None
+        """
+        if self.matrix is None or start_date != self.start_date or end_date != self.as_of:
+            return None
+        if not all(t in self.index for t in tickers):
+            return None
+        return self._submatrix(tickers)
+
+    def get_submatrix(self, tickers=None):
+        """
+        포트폴리오 종목의 상관관계 부분 행렬
+
+        Returns:
+            {
+                'tickers': [...],      # 행/열 순서
+                'matrix': [[...]],     # 상관계수 (소수점 4자리)
+                'missing': [...],      # 유니버스에 없는 종목
+                'as_of': 'YYYYMMDD'
+            }
+        """
+        self.refresh()
+
+        if tickers is None:
+            tickers = self.tickers
+
+        found = [t for t in tickers if t in self.index]
+        missing = [t for t in tickers if t not in self.index]
+
+        return {
+            'tickers': found,
+            'matrix': np.round(self._submatrix(found), 4).tolist(),
+            'missing': missing,
+            'as_of': self.as_of
+        }
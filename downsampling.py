@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시계열 다운샘플링 모듈
+차트 해상도에 맞춰 긴 시계열의 점 개수를 줄이면서 모양(고점/저점)을 유지합니다.
+- lttb: Largest-Triangle-Three-Buckets
+- minmax: 구간별 최솟값/최댓값 유지
+"""
+
+import numpy as np
+
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def lttb_indices(x, y, n_out):
+    """
+    LTTB 다운샘플링 인덱스
+
+    첫 점과 마지막 점을 유지하고, 나머지를 n_out - 2개 구간으로 나눠 각 구간에서
+    직전 선택점과 다음 구간 평균점이 이루는 삼각형 넓이가 최대인 점을 고릅니다.
+
+    Returns:
+        선택된 인덱스 배열 (오름차순)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # 다음 구간 평균점 (마지막 구간이면 마지막 점)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    구간별 최솟값/최댓값 다운샘플링 인덱스
+
+    n_out / 2개 구간 각각에서 최솟값과 최댓값 위치를 유지합니다.
+
+    Returns:
+        선택된 인덱스 배열 (오름차순, 첫 점/마지막 점 포함)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = (n_out - 2) // 2
+    bucket_size = -(-n // n_buckets)
+
+    # 마지막 구간을 마지막 값으로 채워 (구간 수 × 구간 크기) 행렬로 변형
+    padded = np.pad(y, (0, n_buckets * bucket_size - n), mode='edge').reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    picks = np.concatenate([
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1),
+        [0, n - 1]
+    ])
+
+    return np.unique(np.minimum(picks, n - 1))
+
+
+def downsample_indices(x, y, n_out, method='lttb'):
+    """다운샘플링 방식에 따라 유지할 인덱스 반환"""
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown downsample method: {method}")
+
+
+def to_epoch_millis(dates):
+    """DatetimeIndex -> epoch 밀리초 정수 배열"""
+    return np.asarray(dates, dtype='datetime64[ms]').astype(np.int64)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+낙폭(Drawdown) 구간 분석 모듈
+가치 행렬(날짜 × 종목/포트폴리오)의 모든 열에서 낙폭 구간
+(고점, 저점, 회복일, 깊이, 기간)을 한 번의 선형 패스로 찾아 상위 N개를 반환합니다.
+"""
+
+import numpy as np
+
+
+def find_drawdown_episodes(values):
+    """
+    모든 열의 낙폭 구간 탐지
+
+    열마다 끝에 낙폭 0인 구분 행을 붙여 1차원으로 펼친 뒤 구간 시작/끝을
+    한 번에 찾으므로 전체 원소 수에 대해 O(n)입니다.
+
+    Args:
+        values: (날짜,) 또는 (날짜, 열) 가치 행렬 (결측 없음)
+
+    Returns:
+        dict of (구간 수,) 배열
+        {
+            'column': 열 번호,
+            'peak': 고점 인덱스, 'trough': 저점 인덱스,
+            'recovery': 회복 인덱스 (미회복이면 -1),
+            'depth': 최대 낙폭 (음수 비율)
+        }
+        'drawdown': (날짜, 열) 낙폭 행렬
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    num_days, num_cols = values.shape
+
+    drawdown = values / np.maximum.accumulate(values, axis=0) - 1
+
+    # (열, 날짜 + 1) 모양으로 펼침 - 마지막 구분 칸은 낙폭 0
+    stride = num_days + 1
+    flat = np.zeros((num_cols, stride))
+    flat[:, :num_days] = drawdown.T
+    flat = flat.ravel()
+
+    underwater = flat < 0
+    edges = np.diff(underwater.astype(np.int8), prepend=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)  # 낙폭이 0으로 돌아온 위치 (구분 칸 포함)
+
+    if len(starts) == 0:
+        empty = np.array([], dtype=int)
+        return {
+            'column': empty, 'peak': empty, 'trough': empty, 'recovery': empty,
+            'depth': np.array([]), 'drawdown': drawdown
+        }
+
+    # [시작, 끝) 구간별 최솟값 (시작/끝을 번갈아 넣고 짝수 번째만 사용)
+    depth = np.minimum.reduceat(flat, np.column_stack([starts, ends]).ravel())[::2]
+
+    # 저점 위치: 구간 안에서 최솟값과 같은 첫 위치
+    segment_id = np.cumsum(edges == 1) - 1
+    at_min = underwater & (flat == depth[np.maximum(segment_id, 0)])
+    first_at_min = np.unique(segment_id[at_min], return_index=True)[1]
+    trough = np.flatnonzero(at_min)[first_at_min]
+
+    column = starts // stride
+    offset = column * stride
+    recovery = ends - offset
+    recovery = np.where(recovery >= num_days, -1, recovery)
+
+    return {
+        'column': column,
+        'peak': starts - offset - 1,
+        'trough': trough - offset,
+        'recovery': recovery,
+        'depth': depth,
+        'drawdown': drawdown
+    }
+
+
+def top_drawdown_episodes(values, dates=None, top_n=5):
+    """
+    열별 상위 N개 낙폭 구간과 요약 통계
+
+    Args:
+        values: (날짜,) 또는 (날짜, 열) 가치 행렬
+        dates: 날짜 인덱스 (DatetimeIndex, 없으면 정수 인덱스 반환)
+        top_n: 열마다 반환할 구간 수 (깊이 순)
+
+    Returns:
+        list (열 순서) of {
+            'max_drawdown', 'current_drawdown', 'episode_count',
+            'longest_underwater_days', 'time_underwater',
+            'episodes': [{'peak_date', 'trough_date', 'recovery_date', 'depth',
+                          'duration', 'decline_days', 'recovery_days'}]
+        }
+        낙폭/비율은 %, 기간은 거래일 (미회복 구간은 마지막 날까지)
+    """
+    episodes = find_drawdown_episodes(values)
+    drawdown = episodes['drawdown']
+    num_days, num_cols = drawdown.shape
+
+    column = episodes['column']
+    peak = episodes['peak']
+    trough = episodes['trough']
+    recovery = episodes['recovery']
+    depth = episodes['depth']
+
+    # 구간 길이 (고점 -> 회복, 미회복이면 마지막 날까지)
+    end = np.where(recovery >= 0, recovery, num_days - 1)
+    duration = end - peak
+
+    # 열 안에서 깊이 순 정렬 (구간 단위 정렬이라 가격 길이와 무관)
+    order = np.lexsort((depth, column))
+    counts = np.bincount(column, minlength=num_cols)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+
+    longest = np.zeros(num_cols, dtype=int)
+    np.maximum.at(longest, column, duration)
+    underwater_days = (drawdown < 0).sum(axis=0)
+
+    labels = dates.strftime('%Y-%m-%d').tolist() if dates is not None else list(range(num_days))
+
+    results = []
+    for j in range(num_cols):
+        picks = order[bounds[j]:bounds[j + 1]][:top_n]
+        results.append({
+            'max_drawdown': float(drawdown[:, j].min() * 100),
+            'current_drawdown': float(drawdown[-1, j] * 100),
+            'episode_count': int(counts[j]),
+            'longest_underwater_days': int(longest[j]),
+            'time_underwater': float(underwater_days[j] / num_days * 100),
+            'episodes': [
+                {
+                    'peak_date': labels[peak[e]],
+                    'trough_date': labels[trough[e]],
+                    'recovery_date': labels[recovery[e]] if recovery[e] >= 0 else None,
+                    'depth': float(depth[e] * 100),
+                    'duration': int(duration[e]),
+                    'decline_days': int(trough[e] - peak[e]),
+                    'recovery_days': int(recovery[e] - trough[e]) if recovery[e] >= 0 else None
+                }
+                for e in picks
+            ]
+        })
+
+    return results
@@ -8,10 +8,15 @@
 import numpy as np
 from pykrx import stock
 from datetime import datetime, timedelta
+from streaming_indicators import IndicatorStateStore
+from price_store import default_store
+from benchmarks import DEFAULT_BENCHMARK, default_registry
+from stock_metadata import default_metadata
 import technical_indicators as ti
+import indicator_kernels as kernels
 
 
-# 섹터 매핑 (stockData.js와 동일)
+# 섹터 매핑 (stockData.js, data/stock_metadata.json과 동일)
 SECTORS = {
     'tech': 0,
     'finance': 1,
@@ -33,53 +38,182 @@ STOCK_TYPES = {
     'etf': 4
 }
 
+# extract_risk_features / extract_risk_feature_matrix 특징 이름
+RISK_FEATURE_KEYS = (
+    'volatility', 'sharpe_ratio', 'max_drawdown', 'beta', 'returns_mean', 'returns_std',
+    'market_correlation', 'downside_beta', 'idiosyncratic_volatility'
+)
+
+# 가격 데이터가 없을 때의 리스크 특징
+DEFAULT_RISK_FEATURES = {
+    'volatility': 0.2,  # 기본값 20%
+    'sharpe_ratio': 0.5,
+    'max_drawdown': -0.15,
+    'beta': 1.0,
+    'returns_mean': 0.0,
+    'returns_std': 0.2,
+    'market_correlation': 0.5,
+    'downside_beta': 1.0,
+    'idiosyncratic_volatility': 0.15
+}
+
+# 정규화 범위 (min-max)
+NORMALIZATION_RANGES = {
+    'dividend_yield': (0, 6),  # 0-6%
+    'per': (0, 60),  # 0-60
+    'roe': (0, 30),  # 0-30%
+    'pbr': (0, 5),  # 0-5
+    'volatility': (0, 0.5),  # 0-50%
+    'sharpe_ratio': (-1, 3),  # -1 ~ 3
+    'max_drawdown': (-0.5, 0),  # -50% ~ 0%
+    'beta': (0, 2),  # 0-2
+    'market_correlation': (-1, 1),  # -1 ~ 1
+    'downside_beta': (0, 2),  # 0-2
+    'idiosyncratic_volatility': (0, 0.5),  # 0-50%
+    'returns_mean': (-0.3, 0.3),  # -30% ~ 30%
+    'rsi': (0, 100),  # 0-100
+    'momentum': (0.7, 1.3),  # 0.7-1.3
+    'bb_position': (0, 1),  # 0-1
+    'price_roc': (-20, 20),  # -20% ~ 20%
+    'sentiment_score': (-1, 1),  # -1 ~ 1
+}
+
+# 특징 벡터/행렬의 수치형 열 순서
+VECTOR_FEATURES = (
+    'dividend_yield', 'per', 'roe', 'pbr',
+    'volatility', 'sharpe_ratio', 'max_drawdown', 'beta',
+    'market_correlation', 'downside_beta', 'idiosyncratic_volatility', 'returns_mean',
+    'rsi', 'momentum', 'bb_position', 'price_roc', 'sentiment_score'
+)
+
+NORMALIZATION_METHODS = ('raw', 'minmax', 'robust')
+
+# latest_indicator_matrix 키 -> (기술적 특징 이름, 데이터 부족 시 값)
+TECHNICAL_FEATURE_KEYS = {
+    'rsi_14': ('rsi', 50.0),
+    'sma_20': ('sma_20', None),
+    'sma_60': ('sma_60', None),
+    'momentum_10': ('momentum', 1.0),
+    'bb_position': ('bb_position', 0.5),
+    'macd': ('macd', None),
+    'price_roc_10': ('price_roc', 0.0),
+}
+
+
+def category_codes(table):
+    """
+    특징 테이블의 섹터/타입 코드 (코드가 없으면 'sector'/'type' 문자열을 SECTORS/STOCK_TYPES로 변환)
+
+    Returns:
+        (sector_codes, type_codes) 각 (N,) int 배열 - 알 수 없으면 'etf' 코드
+    """
+    sector_codes = np.array([
+        features['sector_code'] if features.get('sector_code') is not None
+        else SECTORS.get(features.get('sector', 'etf'), SECTORS['etf'])
+        for features in table.values()
+    ], dtype=int)
+    type_codes = np.array([
+        features['type_code'] if features.get('type_code') is not None
+        else STOCK_TYPES.get(features.get('type', 'etf'), STOCK_TYPES['etf'])
+        for features in table.values()
+    ], dtype=int)
+    return sector_codes, type_codes
+
+
+def features_to_matrix(table, method='minmax', include_categorical=False):
+    """
+    특징 테이블을 (종목, 특징) 행렬로 변환
+
+    Args:
+        table: {ticker: features} (extract_universe_features / FeatureStore.get_features)
+        method: 'raw' (원래 값, 없으면 NaN)
+                'minmax' (NORMALIZATION_RANGES 기준 0-1, 없으면 0.5)
+                'robust' (종목 간 중앙값/IQR 기준 z-점수, 없으면 0)
+        include_categorical: 섹터(9)/타입(5) 원-핫 열 추가
+
+    Returns:
+        (tickers, (N, d) float32 배열) - 열 순서는 VECTOR_FEATURES (+ 섹터, 타입)
+    """
+    if method not in NORMALIZATION_METHODS:
+        raise ValueError(f"Unknown normalization method: {method}")
+
+    tickers = list(table.keys())
+    raw = np.array(
+        [[features.get(key) for key in VECTOR_FEATURES] for features in table.values()],
+        dtype=float
+    ).reshape(len(tickers), len(VECTOR_FEATURES))
+
+    if method == 'raw':
+        matrix = raw
+    elif method == 'minmax':
+        low, high = np.array([NORMALIZATION_RANGES[key] for key in VECTOR_FEATURES], dtype=float).T
+        matrix = np.clip((raw - low) / (high - low), 0, 1)
+        matrix[np.isnan(matrix)] = 0.5
+    else:
+        matrix = np.zeros_like(raw)
+        if len(tickers) > 0 and not np.isnan(raw).all():
+            with np.errstate(invalid='ignore'):
+                q25, median, q75 = np.nanpercentile(raw, [25, 50, 75], axis=0)
+            scale = (q75 - q25) / 1.349  # 정규분포에서 IQR = 1.349σ
+            np.divide(raw - median, scale, out=matrix, where=scale > 0)
+        matrix[np.isnan(matrix)] = 0.0
+
+    if include_categorical:
+        sector_codes, type_codes = category_codes(table)
+        matrix = np.hstack([
+            matrix,
+            sector_codes[:, None] == np.arange(len(SECTORS)),
+            type_codes[:, None] == np.arange(len(STOCK_TYPES))
+        ])
+
+    return tickers, matrix.astype(np.float32)
+
+
+def market_regression(returns, valid, market):
+    """
+    종목별 시장 단순회귀 (수익률 = alpha + beta × 시장 수익률)
+
+    종목마다 유효한 날짜가 달라도 마스크 합으로 한 번에 계산합니다.
+
+    Args:
+        returns: (날짜, 종목) 일간 수익률
+        valid: (날짜, 종목) 사용할 관측 여부
+        market: (날짜,) 시장 일간 수익률 (NaN은 제외)
+
+    Returns:
+        (beta, correlation, residual_std) 각 (종목,) 배열 - 일간 기준,
+        관측이 2개 미만이거나 분산이 0이면 NaN
+    """
+    mask = valid & ~np.isnan(market)[:, None]
+    counts = mask.sum(axis=0)
+    market = np.nan_to_num(market)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns_mean = np.where(mask, returns, 0).sum(axis=0) / counts
+        market_mean = (mask.T @ market) / counts
+
+        returns_centered = np.where(mask, returns - returns_mean, 0)
+        market_centered = np.where(mask, market[:, None] - market_mean, 0)
+
+        covariance = (returns_centered * market_centered).sum(axis=0) / counts
+        market_var = (market_centered * market_centered).sum(axis=0) / counts
+        returns_var = (returns_centered * returns_centered).sum(axis=0) / counts
+
+        defined = (counts >= 2) & (market_var > 0)
+        beta = np.where(defined, covariance / market_var, np.nan)
+        correlation = np.where(defined & (returns_var > 0),
+                               np.clip(covariance / np.sqrt(returns_var * market_var), -1, 1), np.nan)
+        residual_std = np.where(defined, np.sqrt(np.maximum(returns_var - beta * covariance, 0)), np.nan)
+
+    return beta, correlation, residual_std
+
 
 class FeatureExtractor:
     def __init__(self):
-        # stockData.js의 메타데이터를 Python dict로 저장
-        self.stock_metadata = self._load_stock_metadata()
-
-    def _load_stock_metadata(self):
-        """
-        stockData.js의 메타데이터를 Python dict로 변환
-        실제 환경에서는 JSON 파일로 공유하거나 DB에서 가져오기
-        """
-        return {
-            '005930': {'sector': 'tech', 'type': 'dividend', 'dividendYield': 2.5, 'per': 12.5, 'roe': 8.2},
-            '000660': {'sector': 'tech', 'type': 'dividend', 'dividendYield': 1.8, 'per': 15.3, 'roe': 7.5},
-            '055550': {'sector': 'finance', 'type': 'dividend', 'dividendYield': 4.2, 'per': 5.8, 'roe': 9.1},
-            '105560': {'sector': 'finance', 'type': 'dividend', 'dividendYield': 4.8, 'per': 6.2, 'roe': 10.3},
-            '033780': {'sector': 'consumer', 'type': 'dividend', 'dividendYield': 5.1, 'per': 9.2, 'roe': 12.5},
-            '086790': {'sector': 'finance', 'type': 'dividend', 'dividendYield': 4.5, 'per': 5.5, 'roe': 9.8},
-            '316140': {'sector': 'finance', 'type': 'dividend', 'dividendYield': 4.3, 'per': 5.2, 'roe': 8.9},
-            '015760': {'sector': 'energy', 'type': 'dividend', 'dividendYield': 3.2, 'per': 8.1, 'roe': 5.5},
-            '017670': {'sector': 'telecom', 'type': 'dividend', 'dividendYield': 4.8, 'per': 7.8, 'roe': 11.2},
-            '030200': {'sector': 'telecom', 'type': 'dividend', 'dividendYield': 5.2, 'per': 6.9, 'roe': 10.5},
-            '035420': {'sector': 'tech', 'type': 'growth', 'dividendYield': 0.3, 'per': 28.5, 'roe': 15.2},
-            '035720': {'sector': 'tech', 'type': 'growth', 'dividendYield': 0.4, 'per': 32.1, 'roe': 18.5},
-            '051910': {'sector': 'tech', 'type': 'growth', 'dividendYield': 0.2, 'per': 45.8, 'roe': 22.3},
-            '006400': {'sector': 'tech', 'type': 'growth', 'dividendYield': 0.5, 'per': 25.3, 'roe': 12.8},
-            '028260': {'sector': 'tech', 'type': 'growth', 'dividendYield': 0.1, 'per': 52.5, 'roe': 28.5},
-            '207940': {'sector': 'tech', 'type': 'growth', 'dividendYield': 0.3, 'per': 38.2, 'roe': 19.5},
-            '068270': {'sector': 'consumer', 'type': 'growth', 'dividendYield': 0.8, 'per': 22.5, 'roe': 14.2},
-            '096770': {'sector': 'tech', 'type': 'growth', 'dividendYield': 0.2, 'per': 42.8, 'roe': 20.1},
-            '000270': {'sector': 'industrial', 'type': 'largecap', 'dividendYield': 2.8, 'per': 10.5, 'roe': 7.8},
-            '005380': {'sector': 'industrial', 'type': 'largecap', 'dividendYield': 3.1, 'per': 9.8, 'roe': 8.5},
-            '012330': {'sector': 'industrial', 'type': 'largecap', 'dividendYield': 3.5, 'per': 8.2, 'roe': 9.2},
-            '009540': {'sector': 'materials', 'type': 'largecap', 'dividendYield': 2.5, 'per': 11.2, 'roe': 6.8},
-            '010130': {'sector': 'materials', 'type': 'largecap', 'dividendYield': 2.8, 'per': 9.5, 'roe': 7.5},
-            '034730': {'sector': 'materials', 'type': 'largecap', 'dividendYield': 3.2, 'per': 8.8, 'roe': 8.2},
-            '011070': {'sector': 'energy', 'type': 'largecap', 'dividendYield': 4.2, 'per': 7.5, 'roe': 9.5},
-            '010950': {'sector': 'materials', 'type': 'largecap', 'dividendYield': 2.9, 'per': 10.2, 'roe': 7.2},
-            '001040': {'sector': 'materials', 'type': 'midcap', 'dividendYield': 2.2, 'per': 12.5, 'roe': 8.5},
-            '009150': {'sector': 'finance', 'type': 'midcap', 'dividendYield': 3.8, 'per': 6.8, 'roe': 9.5},
-            '004020': {'sector': 'industrial', 'type': 'midcap', 'dividendYield': 2.5, 'per': 11.2, 'roe': 7.8},
-            '010620': {'sector': 'materials', 'type': 'midcap', 'dividendYield': 2.8, 'per': 10.5, 'roe': 8.2},
-            '069500': {'sector': 'etf', 'type': 'etf', 'dividendYield': 1.8, 'per': None, 'roe': None},
-            '102110': {'sector': 'etf', 'type': 'etf', 'dividendYield': 1.7, 'per': None, 'roe': None},
-            '091160': {'sector': 'etf', 'type': 'etf', 'dividendYield': 0.5, 'per': None, 'roe': None},
-            '091180': {'sector': 'etf', 'type': 'etf', 'dividendYield': 1.2, 'per': None, 'roe': None},
-        }
+        # 종목 메타데이터 (data/stock_metadata.json, 처음 조회 시 로드)
+        self.stock_metadata = default_metadata
+        # 종목별 기술적 지표 상태 (새 거래일만 O(1) 갱신)
+        self.indicator_states = IndicatorStateStore()
 
     def get_historical_data(self, ticker, days=252):
         """과거 가격 데이터 가져오기"""
@@ -139,58 +273,21 @@ class FeatureExtractor:
         return features
 
     def extract_risk_features(self, ticker, historical_df=None):
-        """리스크 지표 특징 추출"""
+        """리스크 지표 특징 추출 (extract_risk_feature_matrix의 단일 종목 버전)"""
         if historical_df is None or historical_df.empty:
-            return {
-                'volatility': 0.2,  # 기본값 20%
-                'sharpe_ratio': 0.5,
-                'max_drawdown': -0.15,
-                'beta': 1.0,
-                'returns_mean': 0.0,
-                'returns_std': 0.2
-            }
+            return dict(DEFAULT_RISK_FEATURES)
 
         try:
-            # 수익률 계산
-            prices = historical_df['종가'].values
-            returns = np.diff(prices) / prices[:-1]
-
-            # 연율화 지표
-            volatility = np.std(returns) * np.sqrt(252)
-            mean_return = np.mean(returns) * 252
-
-            # 샤프 비율 (무위험 수익률 3% 가정)
-            risk_free_rate = 0.03
-            sharpe = (mean_return - risk_free_rate) / volatility if volatility > 0 else 0
-
-            # 최대 낙폭 (MDD)
-            cumulative = np.cumprod(1 + returns)
-            running_max = np.maximum.accumulate(cumulative)
-            drawdown = (cumulative - running_max) / running_max
-            max_drawdown = np.min(drawdown)
+            prices = historical_df['종가'].values.astype(float)[:, None]
+            market_returns = self.get_market_returns(historical_df.index)
+            features = self.extract_risk_feature_matrix(prices, market_returns)
 
-            # 베타 (시장 대비 - KOSPI 200 ETF와의 상관관계로 근사)
-            # 간단히 변동성 비율로 근사
-            beta = volatility / 0.20  # 시장 변동성 20% 가정
-
-            return {
-                'volatility': float(volatility),
-                'sharpe_ratio': float(sharpe),
-                'max_drawdown': float(max_drawdown),
-                'beta': float(beta),
-                'returns_mean': float(mean_return),
-                'returns_std': float(volatility)
-            }
+            if np.isnan(features['volatility'][0]):
+                return dict(DEFAULT_RISK_FEATURES)
+            return {key: float(values[0]) for key, values in features.items()}
         except Exception as e:
             print(f'[경고] {ticker} 리스크 지표 계산 실패: {e}')
-            return {
-                'volatility': 0.2,
-                'sharpe_ratio': 0.5,
-                'max_drawdown': -0.15,
-                'beta': 1.0,
-                'returns_mean': 0.0,
-                'returns_std': 0.2
-            }
+            return dict(DEFAULT_RISK_FEATURES)
 
     def extract_technical_features(self, ticker, historical_df=None):
         """기술적 지표 특징 추출"""
@@ -207,7 +304,8 @@ class FeatureExtractor:
 
         try:
             prices = historical_df['종가'].tolist()
-            indicators = ti.get_all_technical_indicators(prices)
+            dates = historical_df.index.strftime('%Y%m%d').tolist()
+            indicators = self.indicator_states.update_from_history(ticker, dates, prices)
 
             return {
                 'rsi': indicators.get('rsi_14', 50.0),
@@ -255,30 +353,197 @@ class FeatureExtractor:
 
         return features
 
+    def get_price_matrix(self, tickers, days=252):
+        """
+        여러 종목의 최근 N 거래일 종가 행렬 (공유 가격 저장소에서 한 번에 조회)
+
+        Returns:
+            (날짜, 종목) DataFrame - 상장 전/데이터 없는 구간은 NaN, 데이터가 없는 종목은 열 없음
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days + 50)  # 여유있게
+
+        prices_df = default_store.get_close_prices(
+            tickers,
+            start_date.strftime('%Y%m%d'),
+            end_date.strftime('%Y%m%d')
+        )
+        return prices_df.tail(days)
+
+    def get_market_returns(self, index):
+        """
+        가격 행렬 날짜에 맞춘 시장(KODEX 200) 일간 수익률 (벤치마크 레지스트리 캐시 사용)
+
+        Args:
+            index: 가격 행렬의 날짜 인덱스
+
+        Returns:
+            (len(index) - 1,) 배열 - np.diff 수익률 행과 같은 순서, 시장 데이터가 없는 날은 NaN
+            (시장 데이터를 가져오지 못하면 None)
+        """
+        if len(index) < 2:
+            return None
+
+        returns = default_registry.get_returns(
+            DEFAULT_BENCHMARK,
+            index[0].strftime('%Y%m%d'),
+            index[-1].strftime('%Y%m%d')
+        )
+        if returns is None:
+            print(f'[경고] 시장({DEFAULT_BENCHMARK}) 수익률 없음 - 베타 기본값 사용')
+            return None
+        return returns.reindex(index[1:]).values.astype(float)
+
+    def extract_risk_feature_matrix(self, prices, market_returns=None):
+        """
+        (날짜, 종목) 가격 행렬에서 종목별 리스크 지표를 한 번에 계산 (상장 이후 구간만 사용)
+
+        베타/시장 상관계수/하방 베타/고유 변동성은 시장 수익률에 대한 회귀로 계산합니다.
+        하방 베타는 시장이 하락한 날만 사용합니다.
+
+        Args:
+            prices: (날짜, 종목) 가격 배열 (상장 전은 NaN)
+            market_returns: (날짜 - 1,) 시장 일간 수익률 (get_market_returns, None이면 기본값)
+
+        Returns:
+            dict of (종목,) 배열 - 가격이 2개 미만인 종목은 NaN
+        """
+        filled, first_valid = ti.fill_price_matrix(prices)
+        num_days, num_tickers = filled.shape
+
+        # 상장일 다음 날부터의 수익률만 유효
+        returns = np.diff(filled, axis=0) / filled[:-1]
+        valid = np.arange(1, num_days)[:, None] > first_valid
+        counts = valid.sum(axis=0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(valid, returns, 0).sum(axis=0) / counts
+            centered = np.where(valid, returns - mean, 0)
+            std = np.sqrt((centered ** 2).sum(axis=0) / counts)
+
+            volatility = std * np.sqrt(252)
+            mean_return = mean * 252
+
+            # 샤프 비율 (무위험 수익률 3% 가정)
+            risk_free_rate = 0.03
+            sharpe = np.where(volatility > 0, (mean_return - risk_free_rate) / volatility, 0)
+
+        # 최대 낙폭: 단일 종목과 같이 첫 가격을 제외 (그 이전 구간은 두 번째 가격으로 채움)
+        second = np.minimum(first_valid + 1, num_days - 1)
+        head = np.arange(num_days)[:, None] <= first_valid
+        trimmed = np.where(head, filled[second, np.arange(num_tickers)], filled)
+        max_drawdown = kernels.max_drawdown(trimmed[1:]) if num_days > 1 else np.zeros(num_tickers)
+
+        # 시장 회귀 (시장 데이터가 없거나 관측이 부족하면 기본값)
+        if market_returns is None:
+            market_returns = np.full(num_days - 1, np.nan)
+        beta, correlation, residual_std = market_regression(returns, valid, market_returns)
+        down_beta, _, _ = market_regression(returns, valid, np.where(market_returns < 0, market_returns, np.nan))
+
+        beta = np.where(np.isnan(beta), DEFAULT_RISK_FEATURES['beta'], beta)
+        down_beta = np.where(np.isnan(down_beta), beta, down_beta)
+        correlation = np.where(np.isnan(correlation), DEFAULT_RISK_FEATURES['market_correlation'], correlation)
+        idiosyncratic = np.where(np.isnan(residual_std), volatility, residual_std * np.sqrt(252))
+
+        insufficient = counts < 1
+        features = {
+            'volatility': volatility,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': max_drawdown,
+            'beta': beta,
+            'returns_mean': mean_return,
+            'returns_std': volatility,
+            'market_correlation': correlation,
+            'downside_beta': down_beta,
+            'idiosyncratic_volatility': idiosyncratic
+        }
+        for values in features.values():
+            values[insufficient] = np.nan
+        return features
+
+    def extract_price_features(self, prices_df):
+        """
+        가격 행렬에서 종목별 리스크/기술적 특징 추출 (종목 축 벡터화)
+        기술적 지표도 리스크와 같은 기간의 행렬로 계산하여 저장 특징이 프로세스 상태에 의존하지 않습니다.
+
+        Args:
+            prices_df: (날짜, 종목) 종가 DataFrame (get_price_matrix)
+
+        Returns:
+            {ticker: 리스크 + 기술적 특징} - 가격이 2개 미만인 종목은 제외
+        """
+        if prices_df.empty:
+            return {}
+
+        prices = prices_df.values.astype(float)
+        risk = self.extract_risk_feature_matrix(prices, self.get_market_returns(prices_df.index))
+        technical = ti.latest_indicator_matrix(prices)
+
+        features = {}
+        for j, ticker in enumerate(prices_df.columns):
+            if np.isnan(risk['volatility'][j]):
+                continue
+            row = {key: float(values[j]) for key, values in risk.items()}
+            for key, (name, default) in TECHNICAL_FEATURE_KEYS.items():
+                value = technical[key][j]
+                row[name] = default if np.isnan(value) else float(value)
+            features[ticker] = row
+        return features
+
+    def combine_features(self, ticker, price_features=None, stock_data=None, sentiment_score=None):
+        """
+        가격 특징과 기본 정보/감성 점수를 합쳐 extract_all_features와 같은 특징 생성
+
+        Args:
+            price_features: extract_price_features의 종목 항목 (None이면 기본값)
+        """
+        if price_features is None:
+            price_features = {
+                **self.extract_risk_features(ticker),
+                **self.extract_technical_features(ticker)
+            }
+
+        return {
+            **self.extract_fundamental_features(ticker, stock_data),
+            **price_features,
+            'sentiment_score': sentiment_score if sentiment_score is not None else 0.0
+        }
+
+    def extract_universe_features(self, prices_df, stock_data=None, sentiment_scores=None):
+        """
+        여러 종목의 모든 특징을 가격 행렬 하나로 한 번에 추출 (특징 테이블)
+
+        리스크/기술적 지표는 extract_price_features로 종목 축 벡터화하여 계산하고,
+        기본 정보/감성 점수를 합쳐 extract_all_features와 같은 키를 만듭니다.
+
+        Args:
+            prices_df: (날짜, 종목) 종가 DataFrame (get_price_matrix)
+            stock_data: {ticker: 실시간 데이터} (선택)
+            sentiment_scores: {ticker: 뉴스 감성 점수} (선택)
+
+        Returns:
+            {ticker: features} - 가격이 2개 미만인 종목은 제외 (combine_features 기본값 사용)
+        """
+        stock_data = stock_data or {}
+        sentiment_scores = sentiment_scores or {}
+        price_features = self.extract_price_features(prices_df)
+
+        return {
+            ticker: self.combine_features(
+                ticker,
+                features,
+                stock_data.get(ticker),
+                sentiment_scores.get(ticker)
+            )
+            for ticker, features in price_features.items()
+        }
+
     def normalize_features(self, features):
         """특징 정규화 (0-1 스케일)"""
         normalized = features.copy()
 
-        # 정규화 범위 정의
-        normalization_ranges = {
-            'dividend_yield': (0, 6),  # 0-6%
-            'per': (0, 60),  # 0-60
-            'roe': (0, 30),  # 0-30%
-            'pbr': (0, 5),  # 0-5
-            'volatility': (0, 0.5),  # 0-50%
-            'sharpe_ratio': (-1, 3),  # -1 ~ 3
-            'max_drawdown': (-0.5, 0),  # -50% ~ 0%
-            'beta': (0, 2),  # 0-2
-            'returns_mean': (-0.3, 0.3),  # -30% ~ 30%
-            'rsi': (0, 100),  # 0-100
-            'momentum': (0.7, 1.3),  # 0.7-1.3
-            'bb_position': (0, 1),  # 0-1
-            'price_roc': (-20, 20),  # -20% ~ 20%
-            'sentiment_score': (-1, 1),  # -1 ~ 1
-        }
-
-        for key, (min_val, max_val) in normalization_ranges.items():
-            if key in features:
+        for key, (min_val, max_val) in NORMALIZATION_RANGES.items():
+            if features.get(key) is not None:
                 value = features[key]
                 # min-max 정규화
                 normalized[key + '_norm'] = np.clip(
@@ -289,45 +554,13 @@ class FeatureExtractor:
         return normalized
 
     def features_to_vector(self, features, include_categorical=False):
-        """특징 딕셔너리를 벡터로 변환"""
-        normalized = self.normalize_features(features)
-
-        # 수치형 특징만 추출
-        vector_features = [
-            normalized.get('dividend_yield_norm', 0.5),
-            normalized.get('per_norm', 0.5),
-            normalized.get('roe_norm', 0.5),
-            normalized.get('pbr_norm', 0.5),
-            normalized.get('volatility_norm', 0.5),
-            normalized.get('sharpe_ratio_norm', 0.5),
-            normalized.get('max_drawdown_norm', 0.5),
-            normalized.get('beta_norm', 0.5),
-            normalized.get('returns_mean_norm', 0.5),
-            normalized.get('rsi_norm', 0.5),
-            normalized.get('momentum_norm', 0.5),
-            normalized.get('bb_position_norm', 0.5),
-            normalized.get('price_roc_norm', 0.5),
-            normalized.get('sentiment_score_norm', 0.5),
-        ]
-
-        # 카테고리 특징 (원-핫 인코딩)
-        if include_categorical:
-            # 섹터 (9개)
-            sector_vector = [0] * 9
-            sector_code = features.get('sector_code', 8)
-            if 0 <= sector_code < 9:
-                sector_vector[sector_code] = 1
-
-            # 타입 (5개)
-            type_vector = [0] * 5
-            type_code = features.get('type_code', 4)
-            if 0 <= type_code < 5:
-                type_vector[type_code] = 1
-
-            vector_features.extend(sector_vector)
-            vector_features.extend(type_vector)
-
-        return np.array(vector_features)
+        """특징 딕셔너리를 벡터로 변환 (features_to_matrix의 한 행)"""
+        _, matrix = self.features_to_matrix({None: features}, 'minmax', include_categorical)
+        return matrix[0]
+
+    def features_to_matrix(self, table, method='minmax', include_categorical=False):
+        """특징 테이블을 (종목, 특징) 행렬로 변환 (모듈 함수 features_to_matrix 참고)"""
+        return features_to_matrix(table, method, include_categorical)
 
 
 def test_feature_extraction():
@@ -353,7 +586,9 @@ def test_feature_extraction():
     print(f"  변동성: {features['volatility']*100:.2f}%")
     print(f"  샤프비율: {features['sharpe_ratio']:.2f}")
     print(f"  최대낙폭: {features['max_drawdown']*100:.2f}%")
-    print(f"  베타: {features['beta']:.2f}")
+    print(f"  베타: {features['beta']:.2f} (하방 {features['downside_beta']:.2f})")
+    print(f"  시장 상관계수: {features['market_correlation']:.2f}")
+    print(f"  고유 변동성: {features['idiosyncratic_volatility']*100:.2f}%")
 
     print(f"\n기술적 지표:")
     print(f"  RSI: {features['rsi']:.1f}")
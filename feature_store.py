@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+영속 특징 저장소
+가격에서 계산하는 종목 특징(리스크, 기술적 지표)을 (종목, 기준일) 행 단위로
+컬럼형 .npz 파일에 저장합니다. 파일은 특징 정의 해시로 버전을 관리하여 계산 방식이
+바뀌면 자동으로 버리고, 갱신 시에는 새 거래일이 생긴 종목만 다시 계산합니다.
+기본 정보(섹터, 배당 등)와 감성 점수는 조회 시점에 합칩니다.
+
+일일 갱신: python3 feature_store.py
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+import numpy as np
+from datetime import datetime
+from feature_extractor import FeatureExtractor, RISK_FEATURE_KEYS, TECHNICAL_FEATURE_KEYS
+
+
+FEATURE_STORE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feature_store.npz')
+
+# 저장 특징 (컬럼 순서)
+PRICE_FEATURES = RISK_FEATURE_KEYS + tuple(name for name, _ in TECHNICAL_FEATURE_KEYS.values())
+
+# 종목별로 보관할 최대 기준일 수
+HISTORY_ROWS = 60
+
+
+def feature_definition_hash(days=252):
+    """특징 정의 해시 (저장 컬럼, 기간, 계산 코드가 바뀌면 달라짐)"""
+    sources = []
+    for func in (FeatureExtractor.extract_risk_feature_matrix, FeatureExtractor.extract_price_features):
+        try:
+            sources.append(inspect.getsource(func))
+        except (OSError, TypeError):
+            sources.append(func.__qualname__)
+
+    definition = {
+        'features': PRICE_FEATURES,
+        'technical': {key: list(value) for key, value in TECHNICAL_FEATURE_KEYS.items()},
+        'days': days,
+        'sources': sources
+    }
+    encoded = json.dumps(definition, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class FeatureStore:
+    def __init__(self, extractor=None, path=FEATURE_STORE_FILE, days=252):
+        """
+        종목 특징 저장소
+
+        Args:
+            extractor: FeatureExtractor (기본: 새로 생성)
+            path: 저장 파일 경로
+            days: 특징 계산에 사용할 최근 거래일 수
+        """
+        self.extractor = extractor or FeatureExtractor()
+        self.path = path
+        self.days = days
+        self.version = feature_definition_hash(days)
+        self._lock = threading.Lock()
+        self._reset()
+        self.load()
+
+    def _reset(self):
+        # 컬럼형 행 데이터 (행 = (종목, 기준일))
+        self.tickers = np.array([], dtype='U12')
+        self.dates = np.array([], dtype='U8')
+        self.columns = {name: np.array([], dtype=float) for name in PRICE_FEATURES}
+        # ticker -> 최신 기준일 행 인덱스
+        self.latest = {}
+        # ticker -> 마지막으로 새 거래일을 확인한 날짜 (YYYYMMDD)
+        self.checked_on = {}
+        # 특징 행이 바뀔 때마다 증가 (이웃 인덱스 등 파생 구조의 재생성 판단)
+        self.generation = 0
+        # ticker -> 마지막으로 특징 행이 바뀐 generation
+        self.updated_generation = {}
+
+    def _rebuild_index(self):
+        """종목별 최신 기준일 행 인덱스 재구성"""
+        order = np.lexsort((self.dates, self.tickers))
+        if len(order) == 0:
+            self.latest = {}
+            return
+        last_of_ticker = np.append(self.tickers[order][1:] != self.tickers[order][:-1], True)
+        self.latest = {
+            str(self.tickers[i]): int(i)
+            for i in order[last_of_ticker]
+        }
+
+    def load(self):
+        """저장 파일 로드 (버전이 다르면 비어 있는 상태로 시작)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data['version']) != self.version:
+                    print(f'[INFO] 특징 정의가 바뀌어 저장소를 새로 만듭니다 ({data["version"]} -> {self.version})')
+                    return
+                self.tickers = data['tickers']
+                self.dates = data['dates']
+                self.columns = {name: data[f'f_{name}'] for name in PRICE_FEATURES}
+                self.checked_on = dict(zip(data['checked_tickers'].tolist(), data['checked_dates'].tolist()))
+            self._rebuild_index()
+            print(f'[INFO] 특징 저장소 로드: {len(self.latest)}개 종목, {len(self.tickers)}행')
+        except Exception as e:
+            print(f'[경고] 특징 저장소 로드 실패: {e}')
+            self._reset()
+
+    def save(self):
+        """컬럼형 .npz로 저장 (같은 디렉터리의 고유 임시 파일에 쓴 뒤 교체 - 워커 동시 저장 대비)"""
+        arrays = {
+            'version': np.array(self.version),
+            'tickers': self.tickers,
+            'dates': self.dates,
+            'checked_tickers': np.array(list(self.checked_on.keys()), dtype='U12'),
+            'checked_dates': np.array(list(self.checked_on.values()), dtype='U8'),
+            **{f'f_{name}': values for name, values in self.columns.items()}
+        }
+        tmp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp.npz', delete=False) as f:
+                tmp_path = f.name
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f'[경고] 특징 저장소 저장 실패: {e}')
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _append_rows(self, rows):
+        """(ticker, date, features) 행 추가 (같은 종목/기준일 행은 교체) 후 오래된 행 정리"""
+        new_tickers = np.array([r[0] for r in rows], dtype='U12')
+        new_dates = np.array([r[1] for r in rows], dtype='U8')
+        keep = ~np.isin(
+            np.char.add(np.char.add(self.tickers, '/'), self.dates),
+            np.char.add(np.char.add(new_tickers, '/'), new_dates)
+        )
+
+        tickers = np.concatenate([self.tickers[keep], new_tickers])
+        dates = np.concatenate([self.dates[keep], new_dates])
+        columns = {}
+        for name in PRICE_FEATURES:
+            new_values = np.array([
+                np.nan if r[2][name] is None else r[2][name]
+                for r in rows
+            ], dtype=float)
+            columns[name] = np.concatenate([self.columns[name][keep], new_values])
+
+        # 종목별 최근 HISTORY_ROWS개 기준일만 보관
+        order = np.lexsort((dates, tickers))[::-1]
+        sorted_tickers = tickers[order]
+        group_start = np.r_[0, np.flatnonzero(sorted_tickers[1:] != sorted_tickers[:-1]) + 1]
+        rank = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+        kept = np.sort(order[rank < HISTORY_ROWS])
+
+        self.tickers = tickers[kept]
+        self.dates = dates[kept]
+        self.columns = {name: values[kept] for name, values in columns.items()}
+        self._rebuild_index()
+
+    def refresh(self, tickers, force=False):
+        """
+        새 거래일이 생긴 종목만 특징 재계산
+
+        가격 행렬은 공유 가격 저장소에서 한 번에 조회하고, 종목별 마지막 거래일이
+        저장된 최신 기준일과 같으면 계산을 건너뜁니다.
+
+        Args:
+            tickers: 종목 코드 리스트
+            force: True면 모든 종목 재계산
+
+        Returns:
+            재계산한 종목 수
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return 0
+
+        prices_df = self.extractor.get_price_matrix(tickers, self.days)
+        last_dates = {
+            ticker: prices_df[ticker].last_valid_index().strftime('%Y%m%d')
+            for ticker in prices_df.columns
+            if prices_df[ticker].last_valid_index() is not None
+        }
+
+        with self._lock:
+            stale = [
+                ticker for ticker, last_date in last_dates.items()
+                if force or ticker not in self.latest or str(self.dates[self.latest[ticker]]) != last_date
+            ]
+
+        rows = []
+        if stale:
+            computed = self.extractor.extract_universe_features(prices_df[stale])
+            rows = [(ticker, last_dates[ticker], features) for ticker, features in computed.items()]
+
+        today = datetime.now().strftime('%Y%m%d')
+        with self._lock:
+            if rows:
+                self._append_rows(rows)
+                self.generation += 1
+                for ticker, _, _ in rows:
+                    self.updated_generation[ticker] = self.generation
+            for ticker in tickers:
+                self.checked_on[ticker] = today
+            self.save()
+
+        print(f'[INFO] 특징 저장소 갱신: {len(tickers)}개 종목 중 {len(rows)}개 재계산')
+        return len(rows)
+
+    def _row_features(self, index):
+        return {
+            name: (None if np.isnan(values[index]) else float(values[index]))
+            for name, values in self.columns.items()
+        }
+
+    def needs_refresh(self, tickers):
+        """오늘 새 거래일을 확인하지 않은 종목이 있는지"""
+        today = datetime.now().strftime('%Y%m%d')
+        with self._lock:
+            return any(self.checked_on.get(t) != today for t in tickers)
+
+    def generation_of(self, tickers):
+        """주어진 종목들의 특징이 마지막으로 바뀐 generation (바뀐 적 없으면 0)"""
+        with self._lock:
+            return max((self.updated_generation.get(t, 0) for t in tickers), default=0)
+
+    def get_price_features(self, tickers):
+        """
+        종목별 최신 가격 특징 (오늘 확인하지 않은 종목은 먼저 갱신)
+
+        Returns:
+            {ticker: 리스크 + 기술적 특징} - 가격 데이터가 없는 종목은 제외
+        """
+        today = datetime.now().strftime('%Y%m%d')
+        tickers = list(dict.fromkeys(tickers))
+        with self._lock:
+            unchecked = [t for t in tickers if self.checked_on.get(t) != today]
+
+        if unchecked:
+            self.refresh(unchecked)
+
+        with self._lock:
+            return {
+                ticker: self._row_features(self.latest[ticker])
+                for ticker in tickers
+                if ticker in self.latest
+            }
+
+    def get_features(self, tickers, stock_data=None, sentiment_scores=None):
+        """
+        종목별 전체 특징 (extract_all_features와 같은 키)
+
+        Args:
+            stock_data: {ticker: 실시간 데이터} (선택)
+            sentiment_scores: {ticker: 뉴스 감성 점수} (선택)
+        """
+        stock_data = stock_data or {}
+        sentiment_scores = sentiment_scores or {}
+        price_features = self.get_price_features(tickers)
+
+        return {
+            ticker: self.extractor.combine_features(
+                ticker,
+                price_features.get(ticker),
+                stock_data.get(ticker),
+                sentiment_scores.get(ticker)
+            )
+            for ticker in dict.fromkeys(tickers)
+        }
+
+    def history(self, ticker):
+        """종목의 기준일별 가격 특징 [{'date', ...특징}] (oldest to newest)"""
+        with self._lock:
+            rows = np.flatnonzero(self.tickers == ticker)
+            rows = rows[np.argsort(self.dates[rows])]
+            return [{'date': str(self.dates[i]), **self._row_features(i)} for i in rows]
+
+
+if __name__ == '__main__':
+    # 일일 갱신: 메타데이터 종목 + 이미 저장된 종목
+    store = FeatureStore()
+    universe = list(store.extractor.stock_metadata.keys()) + list(store.latest.keys())
+    store.refresh(universe)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+순차 점화식 계산 커널
+EMA, 와일더 평활, 누적 고점 대비 낙폭처럼 이전 값에 의존하는 계산을 모읍니다.
+numba가 설치되어 있으면 JIT 컴파일한 루프를, 없으면 numpy/scipy 구현을 사용합니다.
+모든 함수는 0번 축(시간)을 따라 계산하며 1차원/2차원 입력을 받습니다.
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+BACKENDS = ('numba', 'numpy')
+DEFAULT_BACKEND = 'numba' if HAS_NUMBA else 'numpy'
+
+
+# ==================== numpy 구현 ====================
+
+def _ema_numpy(x, alpha):
+    zi = ((1 - alpha) * x[0])[None]
+    out, _ = lfilter([alpha], [1.0, alpha - 1.0], x, axis=0, zi=zi)
+    return out
+
+
+def _wilder_numpy(x, period):
+    out = np.full(x.shape, np.nan)
+    seed = x[:period].mean(axis=0)
+    out[period - 1] = seed
+    if len(x) > period:
+        alpha = 1.0 / period
+        out[period:], _ = lfilter([alpha], [1.0, alpha - 1.0], x[period:], axis=0,
+                                  zi=((1 - alpha) * seed)[None])
+    return out
+
+
+def _max_drawdown_numpy(x):
+    # NaN은 건너뜀 (fmax는 NaN이 아닌 쪽을 고점으로 유지)
+    peak = np.fmax.accumulate(x, axis=0)
+    with np.errstate(invalid='ignore'):
+        drawdown = x / peak - 1
+    return np.where(np.isnan(drawdown), 0.0, drawdown).min(axis=0, initial=0.0)
+
+
+# ==================== numba 구현 ====================
+
+if HAS_NUMBA:
+    # 행 우선(C) 배열이므로 시간 축을 바깥 루프로 두어 연속 메모리 접근
+
+    @njit(cache=True)
+    def _ema_numba(x, alpha):
+        num_days, num_cols = x.shape
+        out = np.empty_like(x)
+        out[0] = x[0]
+        for t in range(1, num_days):
+            for j in range(num_cols):
+                out[t, j] = alpha * x[t, j] + (1 - alpha) * out[t - 1, j]
+        return out
+
+    @njit(cache=True)
+    def _wilder_numba(x, period):
+        num_days, num_cols = x.shape
+        out = np.full(x.shape, np.nan)
+        seed = np.zeros(num_cols)
+        for t in range(period):
+            for j in range(num_cols):
+                seed[j] += x[t, j]
+        for j in range(num_cols):
+            out[period - 1, j] = seed[j] / period
+        for t in range(period, num_days):
+            for j in range(num_cols):
+                out[t, j] = (out[t - 1, j] * (period - 1) + x[t, j]) / period
+        return out
+
+    @njit(cache=True)
+    def _max_drawdown_numba(x):
+        num_days, num_cols = x.shape
+        peak = np.full(num_cols, np.nan)
+        worst = np.zeros(num_cols)
+        for t in range(num_days):
+            for j in range(num_cols):
+                v = x[t, j]
+                if np.isnan(v):
+                    continue
+                if np.isnan(peak[j]) or v > peak[j]:
+                    peak[j] = v
+                dd = v / peak[j] - 1
+                if dd < worst[j]:
+                    worst[j] = dd
+        return worst
+
+
+# ==================== 공개 함수 ====================
+
+def _resolve(backend):
+    """사용할 구현 선택 (numba 미설치 시 numpy)"""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {backend}")
+    return 'numba' if backend == 'numba' and HAS_NUMBA else 'numpy'
+
+
+def _as_2d(x):
+    x = np.asarray(x, dtype=float)
+    return (x[:, None], True) if x.ndim == 1 else (x, False)
+
+
+def ema(x, alpha, backend=None):
+    """지수 이동평균 (EMA_0 = x_0, EMA_t = a * x_t + (1 - a) * EMA_(t-1))"""
+    x2, squeeze = _as_2d(x)
+    if len(x2) == 0:
+        return np.asarray(x, dtype=float).copy()
+
+    if _resolve(backend) == 'numba':
+        out = _ema_numba(np.ascontiguousarray(x2), float(alpha))
+    else:
+        out = _ema_numpy(x2, alpha)
+    return out[:, 0] if squeeze else out
+
+
+def wilder_smooth(x, period, backend=None):
+    """
+    와일더 평활 (첫 값은 처음 N개 평균, 이후 (이전 × (N - 1) + 현재) / N)
+
+    Returns:
+        x와 같은 모양, 처음 period - 1개 행은 NaN
+    """
+    x2, squeeze = _as_2d(x)
+    if len(x2) < period:
+        out = np.full(x2.shape, np.nan)
+    elif _resolve(backend) == 'numba':
+        out = _wilder_numba(np.ascontiguousarray(x2), int(period))
+    else:
+        out = _wilder_numpy(x2, period)
+    return out[:, 0] if squeeze else out
+
+
+def max_drawdown(values, backend=None):
+    """
+    최대 낙폭 (누적 고점 대비 최저 하락률, 0 이하)
+    NaN은 두 구현 모두 건너뛰며, 값이 모두 NaN인 열은 0입니다.
+
+    Returns:
+        1차원 입력이면 float, 2차원이면 (열,) 배열
+    """
+    x2, squeeze = _as_2d(values)
+    if len(x2) == 0:
+        return 0.0 if squeeze else np.zeros(x2.shape[1])
+
+    if _resolve(backend) == 'numba':
+        out = _max_drawdown_numba(np.ascontiguousarray(x2))
+    else:
+        out = _max_drawdown_numpy(x2)
+    return float(out[0]) if squeeze else out
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+몬테카를로 포트폴리오 시뮬레이션
+과거 수익률로부터 상관된 미래 수익률 경로를 생성하여 투자금의 미래 가치와
+낙폭 분포(백분위 밴드)를 계산합니다.
+- parametric: 다변량 정규분포 (평균, 공분산의 촐레스키 분해)
+- bootstrap: 과거 수익률 행렬에서 블록 단위 복원추출 (종목 간 상관관계, 변동성 군집 유지)
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from price_store import default_store
+
+
+SIMULATION_METHODS = ('parametric', 'bootstrap')
+
+# 청크당 최대 원소 수 (경로 × 기간 × 종목), 약 32MB (float64)
+CHUNK_MAX_ELEMENTS = 4_000_000
+
+# 병렬 실행 최소 규모 (경로 × 기간 × 종목, 작으면 프로세스 생성 비용이 더 큼)
+MIN_PARALLEL_ELEMENTS = 2 * CHUNK_MAX_ELEMENTS
+
+# 응답에 포함하는 시점 수 (전체 기간을 균등 분할)
+MAX_CHECKPOINTS = 100
+
+
+def _draw_returns(rng, returns, method, n_paths, horizon, block_size, mean, chol):
+    """(경로, 기간, 종목) 모양의 미래 일간 수익률 생성"""
+    n_assets = returns.shape[1]
+
+    if method == 'parametric':
+        z = rng.standard_normal((n_paths, horizon, n_assets))
+        return mean + z @ chol.T
+
+    # 블록 부트스트랩
+    num_days = returns.shape[0]
+    block_size = min(block_size, num_days)
+    n_blocks = -(-horizon // block_size)
+    starts = rng.integers(0, num_days - block_size + 1, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :horizon]
+    return returns[idx]
+
+
+def _cholesky(cov):
+    """공분산 행렬의 촐레스키 분해 (양의 정부호가 아니면 대각에 작은 값을 더함)"""
+    jitter = 0.0
+    while True:
+        try:
+            return np.linalg.cholesky(cov + jitter * np.eye(len(cov)))
+        except np.linalg.LinAlgError:
+            jitter = max(jitter * 10, 1e-12)
+
+
+def _simulate_chunk(returns, weights, method, n_paths, horizon, block_size, checkpoints, seed_seq, mean, chol):
+    """
+    한 청크의 경로 시뮬레이션 (병렬 작업 단위)
+
+    Returns:
+        (wealth, drawdown, max_drawdown, final_growth)
+        wealth, drawdown: (경로, 시점) float32 - 초기 투자금 대비 배율, 현재 낙폭
+        max_drawdown: (경로,) 최대 낙폭
+        final_growth: (경로,) 최종 배율
+    """
+    rng = np.random.default_rng(seed_seq)
+    simulated = _draw_returns(rng, returns, method, n_paths, horizon, block_size, mean, chol)
+
+    # 매수 후 보유: 종목별 누적 성장률의 가중합
+    growth = np.cumprod(1 + simulated, axis=1) @ weights  # (경로, 기간)
+    running_max = np.maximum(np.maximum.accumulate(growth, axis=1), 1.0)
+    drawdown = growth / running_max - 1
+
+    return (
+        growth[:, checkpoints].astype(np.float32),
+        drawdown[:, checkpoints].astype(np.float32),
+        drawdown.min(axis=1),
+        growth[:, -1]
+    )
+
+
+class MonteCarloSimulator:
+    def __init__(self, tickers, weights, initial_investment=10000000, start_date=None, end_date=None,
+                 method='parametric', block_size=20):
+        """
+        몬테카를로 시뮬레이터
+
+        Args:
+            tickers: 종목 코드 리스트
+            weights: 각 종목의 비중 (합계 1.0)
+            initial_investment: 초기 투자금액 (원)
+            start_date: 수익률 추정 시작일 (기본: 3년 전)
+            end_date: 수익률 추정 종료일 (기본: 오늘)
+            method: 'parametric' 또는 'bootstrap'
+            block_size: 부트스트랩 블록 길이 (거래일)
+        """
+        if method not in SIMULATION_METHODS:
+            raise ValueError(f"Unknown simulation method: {method}")
+
+        self.tickers = tickers
+        self.weights = np.array(weights, dtype=float)
+        self.initial_investment = initial_investment
+        self.end_date = end_date or datetime.now().strftime('%Y%m%d')
+        self.start_date = start_date or (datetime.now() - timedelta(days=365 * 3)).strftime('%Y%m%d')
+        self.method = method
+        self.block_size = block_size
+
+        self.columns = None
+        self.returns = None
+
+    def fetch_returns(self):
+        """과거 일간 수익률 행렬 (날짜 × 종목)"""
+        prices_df = default_store.get_close_prices(self.tickers, self.start_date, self.end_date)
+        prices_df = prices_df.ffill().dropna()
+        if len(prices_df) < 2:
+            raise ValueError("No price data available")
+
+        self.columns = list(prices_df.columns)
+        prices = prices_df.values
+        self.returns = prices[1:] / prices[:-1] - 1
+        return self.returns
+
+    def simulate(self, horizon_days=252, n_paths=10000, seed=None, n_jobs=1,
+                 percentiles=(5, 25, 50, 75, 95)):
+        """
+        미래 가치 시뮬레이션
+
+        Args:
+            horizon_days: 시뮬레이션 기간 (거래일)
+            n_paths: 경로 수
+            seed: 난수 시드 (같은 시드면 n_jobs와 무관하게 같은 결과)
+            n_jobs: 병렬 프로세스 수
+            percentiles: 반환할 백분위
+
+        Returns:
+            dict (시점별 자산/낙폭 백분위 밴드, 최종 자산 및 최대 낙폭 분포)
+        """
+        if self.returns is None:
+            self.fetch_returns()
+
+        weights = np.array([self.weights[self.tickers.index(t)] for t in self.columns])
+        weights = weights / weights.sum()
+        n_assets = len(weights)
+
+        checkpoints = np.unique(
+            np.linspace(0, horizon_days - 1, min(horizon_days, MAX_CHECKPOINTS)).round().astype(int)
+        )
+
+        # 메모리 상한에 맞춰 청크 크기 결정, 청크마다 독립 시드 스트림
+        chunk_paths = max(1, CHUNK_MAX_ELEMENTS // (horizon_days * n_assets))
+        chunk_sizes = [min(chunk_paths, n_paths - start) for start in range(0, n_paths, chunk_paths)]
+        seed_seq = np.random.SeedSequence(seed)
+        child_seeds = seed_seq.spawn(len(chunk_sizes))
+
+        mean = chol = None
+        if self.method == 'parametric':
+            mean = self.returns.mean(axis=0)
+            chol = _cholesky(np.cov(self.returns, rowvar=False).reshape(n_assets, n_assets))
+
+        args = [
+            (self.returns, weights, self.method, size, horizon_days, self.block_size, checkpoints, child, mean, chol)
+            for size, child in zip(chunk_sizes, child_seeds)
+        ]
+
+        if n_jobs > 1 and len(args) > 1 and n_paths * horizon_days * n_assets >= MIN_PARALLEL_ELEMENTS:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(args))) as executor:
+                chunks = list(executor.map(_simulate_chunk, *zip(*args)))
+        else:
+            chunks = [_simulate_chunk(*a) for a in args]
+
+        wealth = np.concatenate([c[0] for c in chunks]) * self.initial_investment
+        drawdown = np.concatenate([c[1] for c in chunks])
+        max_drawdown = np.concatenate([c[2] for c in chunks])
+        final = np.concatenate([c[3] for c in chunks]) * self.initial_investment
+
+        q = list(percentiles)
+        wealth_bands = np.percentile(wealth, q, axis=0)
+        drawdown_bands = np.percentile(drawdown, q, axis=0) * 100
+        final_bands = np.percentile(final, q)
+        mdd_bands = np.percentile(max_drawdown, q) * 100
+
+        return {
+            'method': self.method,
+            'n_paths': n_paths,
+            'horizon_days': horizon_days,
+            'seed': seed,
+            'tickers': self.columns,
+            'initial_investment': self.initial_investment,
+            'days': (checkpoints + 1).tolist(),
+            'wealth_percentiles': {f'p{p}': band.tolist() for p, band in zip(q, wealth_bands)},
+            'drawdown_percentiles': {f'p{p}': band.tolist() for p, band in zip(q, drawdown_bands)},
+            'final_value': {
+                'mean': float(final.mean()),
+                'percentiles': {f'p{p}': float(v) for p, v in zip(q, final_bands)},
+                'probability_of_loss': float((final < self.initial_investment).mean() * 100)
+            },
+            'max_drawdown': {
+                'mean': float(max_drawdown.mean() * 100),
+                'percentiles': {f'p{p}': float(v) for p, v in zip(q, mdd_bands)}
+            }
+        }
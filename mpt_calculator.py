@@ -1,13 +1,58 @@
 import numpy as np
 import pandas as pd
-from pykrx import stock
 from datetime import datetime, timedelta
 from scipy.optimize import minimize
+from price_store import default_store
+from tail_risk import DEFAULT_CONFIDENCE_LEVELS, DEFAULT_HORIZONS, tail_risk_table, format_tail_risk
 import warnings
 warnings.filterwarnings('ignore')
 
+
+def max_sharpe_weights(mean_returns, cov_matrix, init_weights=None, risk_free_rate=0.03):
+    """
+    샤프 비율을 최대화하는 비중 (SLSQP)
+
+    Args:
+        mean_returns: (n,) 일간 평균 수익률
+        cov_matrix: (n, n) 일간 공분산 행렬
+        init_weights: 최적화 초기값 (기본: 균등 분배)
+        risk_free_rate: 연간 무위험 수익률
+
+    Returns:
+        (n,) 최적 비중
+    """
+    mean_returns = np.asarray(mean_returns, dtype=float)
+    annual_cov = np.asarray(cov_matrix, dtype=float) * 252
+    num_assets = len(mean_returns)
+
+    def negative_sharpe(weights):
+        returns = np.sum(mean_returns * weights) * 252
+        std = np.sqrt(np.dot(weights.T, np.dot(annual_cov, weights)))
+        return -(returns - risk_free_rate) / std
+
+    # 제약 조건
+    constraints = {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # 비중 합 = 1
+    bounds = tuple((0, 1) for _ in range(num_assets))  # 각 비중 0~1
+
+    # 초기값 (주어지지 않으면 균등 분배)
+    if init_weights is not None and len(init_weights) == num_assets:
+        init_guess = np.asarray(init_weights, dtype=float)
+    else:
+        init_guess = np.full(num_assets, 1. / num_assets)
+
+    result = minimize(
+        negative_sharpe,
+        init_guess,
+        method='SLSQP',
+        bounds=bounds,
+        constraints=constraints
+    )
+
+    return result.x
+
+
 class MPTCalculator:
-    def __init__(self, tickers, start_date=None, end_date=None):
+    def __init__(self, tickers, start_date=None, end_date=None, correlation_service=None):
         """
         MPT 계산기 초기화
 
@@ -15,47 +60,135 @@ class MPTCalculator:
             tickers: 종목 코드 리스트 (예: ['005930', '035420'])
             start_date: 시작일 (기본값: 1년 전)
             end_date: 종료일 (기본값: 오늘)
+            correlation_service: 전체 종목 상관관계 서비스 (있으면 상관관계 행렬을 부분 행렬로 조회)
         """
         self.tickers = tickers
+        self.correlation_service = correlation_service
         self.end_date = end_date or datetime.now().strftime('%Y%m%d')
         self.start_date = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y%m%d')
 
+        self.prices_df = None
         self.returns_df = None
         self.mean_returns = None
         self.cov_matrix = None
 
-    def fetch_historical_data(self):
-        """과거 주가 데이터를 가져와서 수익률 계산"""
-        price_data = {}
+        # 직전 최적화 결과 (what-if 재최적화 시 warm-start 초기값)
+        self.last_weights = None
 
-        for ticker in self.tickers:
-            try:
-                df = stock.get_market_ohlcv_by_date(
-                    fromdate=self.start_date,
-                    todate=self.end_date,
-                    ticker=ticker
-                )
-                if df is not None and not df.empty:
-                    price_data[ticker] = df['종가']
-            except Exception as e:
-                print(f"Error fetching data for {ticker}: {e}")
-                continue
+    def __getstate__(self):
+        # 공유 서비스(잠금 포함)는 저장하지 않음 (what-if 세션 파일)
+        state = self.__dict__.copy()
+        state['correlation_service'] = None
+        return state
 
-        if not price_data:
+    def _fetch_close_prices(self, tickers):
+        """종목별 종가 데이터프레임 가져오기 (공유 가격 저장소 사용)"""
+        prices_df = default_store.get_close_prices(tickers, self.start_date, self.end_date)
+
+        if prices_df.empty:
             raise ValueError("No price data available")
 
-        # 종가 데이터프레임 생성
-        prices_df = pd.DataFrame(price_data)
+        return prices_df
 
+    def _compute_statistics(self):
+        """종가 데이터로부터 수익률, 평균 수익률, 공분산 행렬 재계산"""
         # 일간 수익률 계산
-        self.returns_df = prices_df.pct_change().dropna()
+        self.returns_df = self.prices_df.pct_change().dropna()
 
         # 평균 수익률과 공분산 행렬 계산
         self.mean_returns = self.returns_df.mean()
         self.cov_matrix = self.returns_df.cov()
 
+    def fetch_historical_data(self):
+        """과거 주가 데이터를 가져와서 수익률 계산"""
+        self.prices_df = self._fetch_close_prices(self.tickers)
+        self._compute_statistics()
+
         return self.returns_df
 
+    def add_ticker(self, ticker):
+        """
+        분석 중인 포트폴리오에 종목 추가 (what-if)
+
+        기존 수익률 행렬과 공분산 행렬을 유지한 채 새 종목의 행/열만
+        덧붙이는 bordered-matrix 갱신을 수행합니다. 새 종목의 데이터가
+        기존 기간을 모두 커버하지 못하면 전체 통계를 다시 계산합니다.
+        """
+        if ticker in self.tickers:
+            return
+        if self.returns_df is None:
+            self.fetch_historical_data()
+
+        new_prices = self._fetch_close_prices([ticker])[ticker]
+        self.prices_df = self.prices_df.join(new_prices, how='left')
+
+        # warm-start 초기값: 기존 비중을 줄이고 새 종목에 1/n 배분
+        n = len(self.tickers) + 1
+        if self.last_weights is not None and len(self.last_weights) == n - 1:
+            self.last_weights = np.append(self.last_weights * (1 - 1. / n), 1. / n)
+        else:
+            self.last_weights = None
+        self.tickers = self.tickers + [ticker]
+
+        new_returns = self.prices_df[ticker].pct_change().reindex(self.returns_df.index)
+        if new_returns.isna().any():
+            self._compute_statistics()
+            return
+
+        # bordered-matrix 갱신: [[C, c], [c^T, v]]
+        X = self.returns_df.values
+        y = new_returns.values
+        X_centered = X - X.mean(axis=0)
+        y_centered = y - y.mean()
+        cov_col = X_centered.T @ y_centered / (len(y) - 1)
+        var = y_centered @ y_centered / (len(y) - 1)
+
+        cov = np.empty((n, n))
+        cov[:-1, :-1] = self.cov_matrix.values
+        cov[:-1, -1] = cov_col
+        cov[-1, :-1] = cov_col
+        cov[-1, -1] = var
+
+        columns = list(self.returns_df.columns) + [ticker]
+        self.returns_df[ticker] = y
+        self.mean_returns = pd.concat([self.mean_returns, pd.Series({ticker: y.mean()})])
+        self.cov_matrix = pd.DataFrame(cov, index=columns, columns=columns)
+
+    def remove_ticker(self, ticker):
+        """
+        분석 중인 포트폴리오에서 종목 제거 (what-if)
+
+        공분산 행렬에서 해당 행/열만 삭제합니다. 제거할 종목 때문에 분석
+        기간이 잘려 있었다면 (상장일이 늦은 경우 등) 전체 통계를 다시 계산합니다.
+        """
+        if ticker not in self.tickers:
+            return
+        if self.returns_df is None:
+            self.fetch_historical_data()
+
+        idx = self.tickers.index(ticker)
+        if self.last_weights is not None and len(self.last_weights) == len(self.tickers):
+            remaining = np.delete(self.last_weights, idx)
+            self.last_weights = remaining / remaining.sum() if remaining.sum() > 0 else None
+        self.tickers = [t for t in self.tickers if t != ticker]
+
+        if ticker not in self.returns_df.columns:
+            return
+
+        constrained_window = self.prices_df[ticker].isna().any()
+        self.prices_df = self.prices_df.drop(columns=ticker)
+        if constrained_window:
+            self._compute_statistics()
+            return
+
+        col = self.returns_df.columns.get_loc(ticker)
+        columns = self.returns_df.columns.drop(ticker)
+        cov = np.delete(np.delete(self.cov_matrix.values, col, axis=0), col, axis=1)
+
+        self.returns_df = self.returns_df.drop(columns=ticker)
+        self.mean_returns = self.mean_returns.drop(ticker)
+        self.cov_matrix = pd.DataFrame(cov, index=columns, columns=columns)
+
     def portfolio_performance(self, weights):
         """
         포트폴리오 성과 계산
@@ -78,27 +211,19 @@ class MPTCalculator:
         """최적화를 위한 음수 샤프 비율"""
         return -self.portfolio_performance(weights)[2]
 
-    def optimize_portfolio(self):
-        """샤프 비율을 최대화하는 최적 포트폴리오 찾기"""
-        num_assets = len(self.tickers)
-
-        # 제약 조건
-        constraints = {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # 비중 합 = 1
-        bounds = tuple((0, 1) for _ in range(num_assets))  # 각 비중 0~1
-
-        # 초기값 (균등 분배)
-        init_guess = num_assets * [1. / num_assets]
+    def optimize_portfolio(self, init_weights=None):
+        """
+        샤프 비율을 최대화하는 최적 포트폴리오 찾기
 
-        # 최적화 실행
-        result = minimize(
-            self.negative_sharpe,
-            init_guess,
-            method='SLSQP',
-            bounds=bounds,
-            constraints=constraints
-        )
+        Args:
+            init_weights: 최적화 초기값 (기본: 직전 최적 비중, 없으면 균등 분배)
+        """
+        # 초기값 (직전 최적 비중으로 warm-start, 없으면 균등 분배)
+        if init_weights is None:
+            init_weights = self.last_weights
 
-        optimal_weights = result.x
+        optimal_weights = max_sharpe_weights(self.mean_returns.values, self.cov_matrix.values, init_weights)
+        self.last_weights = optimal_weights
         returns, std, sharpe = self.portfolio_performance(optimal_weights)
 
         return {
@@ -190,22 +315,67 @@ class MPTCalculator:
             'weights': weights.tolist()
         }
 
-    def get_correlation_matrix(self):
-        """종목 간 상관관계 행렬"""
+    def calculate_tail_risk(self, weights=None, confidence_levels=DEFAULT_CONFIDENCE_LEVELS,
+                            horizons=DEFAULT_HORIZONS, methods=('historical', 'parametric')):
+        """
+        포트폴리오 VaR/CVaR (손실률 %, 양수 = 손실)
+
+        Args:
+            weights: 비중 (기본: 마지막 최적화 비중)
+            confidence_levels: 신뢰수준 목록
+            horizons: 보유기간 목록 (거래일)
+            methods: 'historical', 'parametric', 'monte_carlo' 중 선택
+        """
         if self.returns_df is None:
             self.fetch_historical_data()
 
-        corr_matrix = self.returns_df.corr()
+        if weights is None:
+            weights = self.last_weights if self.last_weights is not None else self.optimize_portfolio()['weights']
 
-        # JSON 직렬화 가능한 형태로 변환
-        result = {}
-        for ticker in self.tickers:
-            result[ticker] = {
-                t: float(corr_matrix.loc[ticker, t])
-                for t in self.tickers if t in corr_matrix.columns
+        table = tail_risk_table(self.returns_df.values, np.asarray(weights, dtype=float),
+                                confidence_levels, horizons, methods)
+        return format_tail_risk(table, 0, confidence_levels, horizons)
+
+    def get_correlation_matrix(self, as_matrix=False):
+        """
+        종목 간 상관관계 행렬
+
+        상관관계 서비스가 같은 기간의 전체 행렬을 이미 갖고 있고, 모든 종목이 유니버스에 있으며
+        수익률에 빠진 날이 없으면 (공분산과 같은 표본) 그 부분 행렬을 사용합니다 (/api/correlation과 같은 값).
+        그 밖의 경우 (상장일이 다르거나 거래정지일이 있는 종목 등)에는 공분산과 같은 수익률로 직접 계산합니다.
+
+        Args:
+            as_matrix: True면 {'tickers': [...], 'matrix': [[...]]} 형태의 압축 배열 반환
+        """
+        if self.returns_df is None:
+            self.fetch_historical_data()
+
+        columns = list(self.returns_df.columns)
+        values = None
+        complete = (
+            len(self.returns_df) == len(self.prices_df) - 1 and
+            not self.prices_df[columns].isna().values.any()
+        )
+        if self.correlation_service is not None and complete:
+            try:
+                values = self.correlation_service.cached_submatrix(columns, self.start_date, self.end_date)
+            except Exception as e:
+                print(f'[경고] 상관관계 서비스 조회 실패, 직접 계산: {e}')
+
+        if values is None:
+            values = self.returns_df.corr().values
+
+        if as_matrix:
+            return {
+                'tickers': columns,
+                'matrix': np.round(values, 4).tolist()
             }
 
-        return result
+        # JSON 직렬화 가능한 형태로 변환
+        return {
+            ticker: dict(zip(columns, row))
+            for ticker, row in zip(columns, values.tolist())
+        }
 
     def get_full_analysis(self):
         """전체 MPT 분석 수행"""
@@ -224,6 +394,9 @@ class MPTCalculator:
         # 상관관계 행렬
         correlation = self.get_correlation_matrix()
 
+        # 최적 포트폴리오 꼬리 위험 (VaR/CVaR)
+        tail_risk = self.calculate_tail_risk(optimal['weights'])
+
         # 개별 종목 통계
         individual_stats = []
         for ticker in self.tickers:
@@ -242,6 +415,7 @@ class MPTCalculator:
             'minimum_variance_portfolio': min_variance,
             'efficient_frontier': efficient_frontier,
             'correlation_matrix': correlation,
+            'tail_risk': tail_risk,
             'individual_stats': individual_stats,
             'tickers': self.tickers,
             'data_period': {
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+유사 종목 이웃 인덱스
+특징이 갱신될 때 한 번, 모든 종목의 가중 유사도 상위 K개 이웃을 미리 계산해 두고
+유사 종목 조회는 저장된 목록을 읽기만 합니다 (조회 O(K)).
+계산은 행 블록 단위 정확 계산(블록 × N 유사도 + argpartition)으로 메모리를 블록 크기로 제한합니다.
+장중에 한 종목의 특징만 바뀌면 update()로 해당 종목 행(O(N·d))만 다시 계산하고
+영향을 받는 이웃 목록만 고칩니다.
+"""
+
+import numpy as np
+from datetime import datetime
+from feature_extractor import features_to_matrix, category_codes
+import similarity_metrics as sim
+
+
+# 종목별 저장 이웃 수
+NEIGHBOR_K = 20
+
+# 한 번에 계산할 기준 행 수 (메모리: BLOCK_SIZE × N)
+BLOCK_SIZE = 512
+
+
+def top_k_neighbors(matrix, sector_codes, type_codes, k=NEIGHBOR_K, weights=None, block_size=BLOCK_SIZE):
+    """
+    모든 종목의 가중 유사도 상위 K개 이웃 (자기 자신 제외)
+
+    Args:
+        matrix: (N, d) 정규화 특징 행렬
+        sector_codes, type_codes: (N,) 섹터/타입 코드
+        k: 이웃 수 (N - 1보다 크면 N - 1)
+
+    Returns:
+        (indices, scores) 각 (N, k) 배열 - 유사도 내림차순
+    """
+    num_stocks = len(matrix)
+    k = max(min(k, num_stocks - 1), 0)
+    indices = np.zeros((num_stocks, k), dtype=np.int64)
+    scores = np.zeros((num_stocks, k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    for start in range(0, num_stocks, block_size):
+        rows = np.arange(start, min(start + block_size, num_stocks))
+        block = sim.weighted_similarity_matrix(matrix, sector_codes, type_codes, weights, rows=rows)
+        indices[rows], scores[rows] = _select_top_k(block, rows, k)
+
+    return indices, scores
+
+
+def _select_top_k(block, rows, k):
+    """유사도 블록 (len(rows), N)에서 행별 상위 k개 (자기 자신 제외, 내림차순)"""
+    num_stocks = block.shape[1]
+    block[np.arange(len(rows)), rows] = -np.inf
+
+    # 상위 k개만 골라서 정렬 (전체 정렬 O(N log N) 대신 O(N + k log k))
+    if k < num_stocks - 1:
+        candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(num_stocks), (len(rows), 1))
+        candidates = candidates[candidates != rows[:, None]].reshape(len(rows), k)
+    candidate_scores = np.take_along_axis(block, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+class NeighborIndex:
+    def __init__(self, k=NEIGHBOR_K, weights=None):
+        """
+        Args:
+            k: 종목별 저장 이웃 수
+            weights: 유사도 가중치 (기본: sim.DEFAULT_WEIGHTS)
+        """
+        self.k = k
+        self.weights = weights
+        self.tickers = []
+        self.position = {}
+        self.table = {}
+        self.matrix = None
+        self.sector_codes = None
+        self.type_codes = None
+        self.neighbor_indices = None
+        self.neighbor_scores = None
+        self.built_at = None
+
+    def build(self, tickers, table, matrix, sector_codes, type_codes):
+        """
+        이웃 인덱스 생성
+
+        Args:
+            tickers: 종목 코드 리스트 (matrix 행 순서)
+            table: {ticker: features} (추천 결과에 함께 반환할 특징)
+            matrix, sector_codes, type_codes: 유사도 계산용 배열 (sim.feature_arrays)
+        """
+        indices, scores = top_k_neighbors(matrix, sector_codes, type_codes, self.k, self.weights)
+
+        self.tickers = list(tickers)
+        self.position = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.table = table
+        self.matrix = matrix
+        self.sector_codes = np.asarray(sector_codes)
+        self.type_codes = np.asarray(type_codes)
+        self.neighbor_indices = indices
+        self.neighbor_scores = scores
+        self.built_at = datetime.now()
+
+        print(f'[INFO] 이웃 인덱스 생성: {len(self.tickers)}개 종목, 종목당 {indices.shape[1]}개')
+        return self
+
+    def __contains__(self, ticker):
+        return ticker in self.position
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def query(self, ticker, top_k=5, exclude_tickers=None):
+        """
+        유사 종목 상위 K개 (저장된 이웃 목록에서 제외 종목을 건너뛰며 선택)
+
+        제외 종목 때문에 저장된 이웃이 모자라면 해당 종목 한 행만 다시 계산합니다.
+
+        Returns:
+            list of (ticker, similarity) - 유사도 내림차순
+        """
+        i = self.position[ticker]
+        excluded = set(exclude_tickers or []) | {ticker}
+
+        results = []
+        for j, score in zip(self.neighbor_indices[i], self.neighbor_scores[i]):
+            neighbor = self.tickers[j]
+            if neighbor in excluded:
+                continue
+            results.append((neighbor, float(score)))
+            if len(results) == top_k:
+                return results
+
+        if self.neighbor_indices.shape[1] >= len(self.tickers) - 1:
+            return results
+
+        # 저장된 이웃 부족: 한 행만 전체 계산
+        scores = sim.weighted_similarity_to_all(i, self.matrix, self.sector_codes, self.type_codes, self.weights)
+        candidates = np.array([j for j, t in enumerate(self.tickers) if t not in excluded], dtype=int)
+        top = candidates[np.argsort(-scores[candidates], kind='stable')[:top_k]]
+        return [(self.tickers[j], float(scores[j])) for j in top]
+
+    def update(self, ticker, features):
+        """
+        한 종목의 특징 갱신 (전체 재생성 없이 해당 종목 행과 영향받는 이웃 목록만 수정)
+
+        바뀐 종목과 모든 종목의 유사도 한 행(O(N·d))만 계산한 뒤, 다른 종목 j의 목록은
+        저장된 K번째 점수(목록 밖 종목 점수의 상한)와 비교해 고칩니다.
+            - 목록에 있고 새 점수가 K번째 이상: 점수만 바꾸고 재정렬
+            - 목록에 있고 새 점수가 K번째 미만: 목록 밖 종목이 앞설 수 있으므로 j 행만 재계산
+            - 목록에 없고 새 점수가 K번째 초과: 마지막 이웃과 교체 후 재정렬
+
+        Args:
+            ticker: 인덱스에 있는 종목 코드
+            features: 새 특징 (extract_all_features와 같은 키)
+
+        유사도에 쓰이는 특징(섹터, 타입, SIMILARITY_BLOCKS)이 그대로면 (예: 감성 점수만 변경)
+        특징만 바꾸고 이웃 목록은 건드리지 않습니다.
+
+        Returns:
+            다시 계산한 이웃 목록 수 (바뀐 종목 자신 포함, 유사도가 그대로면 0)
+        """
+        i = self.position[ticker]
+        row = features_to_matrix({ticker: features}, 'minmax')[1][0]
+        sector_codes, type_codes = category_codes({ticker: features})
+        unchanged = (
+            np.array_equal(self.matrix[i, sim.SIMILARITY_COLUMNS], row[sim.SIMILARITY_COLUMNS]) and
+            self.sector_codes[i] == sector_codes[0] and
+            self.type_codes[i] == type_codes[0]
+        )
+
+        self.table[ticker] = features
+        self.matrix[i] = row
+        self.sector_codes[i], self.type_codes[i] = sector_codes[0], type_codes[0]
+
+        k = self.neighbor_indices.shape[1]
+        if unchanged or k == 0:
+            return 0
+
+        row = sim.weighted_similarity_matrix(
+            self.matrix, self.sector_codes, self.type_codes, self.weights, rows=[i]
+        )
+        new_scores = row[0].astype(self.neighbor_scores.dtype)
+        indices, scores = _select_top_k(row, np.array([i]), k)
+        self.neighbor_indices[i], self.neighbor_scores[i] = indices[0], scores[0]
+
+        others = np.arange(len(self.tickers)) != i
+        member = self.neighbor_indices == i
+        listed = member.any(axis=1) & others
+        threshold = self.neighbor_scores[:, -1]
+        stores_all = k >= len(self.tickers) - 1
+
+        # 목록 안에서 점수만 바뀌는 행 / 새로 들어가는 행 / 다시 계산할 행
+        rescored = listed & ((new_scores >= threshold) | stores_all)
+        inserted = ~listed & others & (new_scores > threshold)
+        repaired = np.flatnonzero(listed & ~rescored)
+
+        self.neighbor_scores[member & rescored[:, None]] = new_scores[rescored]
+        self.neighbor_indices[inserted, -1] = i
+        self.neighbor_scores[inserted, -1] = new_scores[inserted]
+
+        resorted = np.flatnonzero(rescored | inserted)
+        if len(resorted) > 0:
+            order = np.argsort(-self.neighbor_scores[resorted], axis=1, kind='stable')
+            self.neighbor_indices[resorted] = np.take_along_axis(self.neighbor_indices[resorted], order, axis=1)
+            self.neighbor_scores[resorted] = np.take_along_axis(self.neighbor_scores[resorted], order, axis=1)
+
+        if len(repaired) > 0:
+            block = sim.weighted_similarity_matrix(
+                self.matrix, self.sector_codes, self.type_codes, self.weights, rows=repaired
+            )
+            self.neighbor_indices[repaired], self.neighbor_scores[repaired] = _select_top_k(block, repaired, k)
+
+        print(f'[INFO] 이웃 인덱스 갱신: {ticker} (목록 {len(resorted)}개 수정, {len(repaired) + 1}개 재계산)')
+        return len(repaired) + 1
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공유 가격 데이터 저장소
+종목별 종가 시계열을 메모리에 캐싱하여 MPT, 백테스팅, 상관관계 서비스가
+같은 데이터를 재사용하도록 합니다. 캐시는 거래일(날짜)이 바뀌면 갱신됩니다.
+"""
+
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pykrx import stock
+from datetime import datetime
+
+
+# 캐시에 없는 종목을 동시에 가져올 최대 스레드 수
+FETCH_WORKERS = 8
+
+
+class PriceStore:
+    def __init__(self):
+        # ticker -> {'prices': Series, 'start': str, 'end': str, 'fetched_on': str}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, entry, start_date, end_date):
+        """캐시 항목이 요청 기간을 커버하고 오늘 가져온 데이터인지 확인"""
+        return (
+            entry['fetched_on'] == datetime.now().strftime('%Y%m%d') and
+            entry['start'] <= start_date and
+            entry['end'] >= end_date
+        )
+
+    def _fetch(self, ticker, start_date, end_date):
+        """pykrx에서 종가 시계열 가져오기"""
+        try:
+            df = stock.get_market_ohlcv_by_date(
+                fromdate=start_date,
+                todate=end_date,
+                ticker=ticker
+            )
+            if df is not None and not df.empty:
+                return df['종가']
+        except Exception as e:
+            print(f"Error fetching {ticker}: {e}")
+        return None
+
+    def get_close_series(self, ticker, start_date, end_date):
+        """단일 종목 종가 시계열 (데이터가 없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(ticker)
+
+        if entry is None or not self._is_fresh(entry, start_date, end_date):
+            # 기존 캐시 기간과 합쳐서 가져와 커버 범위를 넓힘
+            fetch_start, fetch_end = start_date, end_date
+            if entry is not None and entry['fetched_on'] == datetime.now().strftime('%Y%m%d'):
+                fetch_start = min(fetch_start, entry['start'])
+                fetch_end = max(fetch_end, entry['end'])
+
+            prices = self._fetch(ticker, fetch_start, fetch_end)
+            if prices is None:
+                return None
+
+            entry = {
+                'prices': prices,
+                'start': fetch_start,
+                'end': fetch_end,
+                'fetched_on': datetime.now().strftime('%Y%m%d')
+            }
+            with self._lock:
+                self._entries[ticker] = entry
+
+        prices = entry['prices']
+        sliced = prices.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
+        return sliced if not sliced.empty else None
+
+    def get_close_prices(self, tickers, start_date, end_date):
+        """
+        여러 종목의 종가 데이터프레임 (날짜 × 종목)
+
+        데이터가 없는 종목은 열에서 제외됩니다.
+        캐시에 없는 종목은 FETCH_WORKERS개 스레드로 동시에 가져옵니다.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if len(tickers) > 1:
+            with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(tickers))) as executor:
+                results = list(executor.map(
+                    lambda ticker: self.get_close_series(ticker, start_date, end_date),
+                    tickers
+                ))
+        else:
+            results = [self.get_close_series(ticker, start_date, end_date) for ticker in tickers]
+
+        price_data = {
+            ticker: prices
+            for ticker, prices in zip(tickers, results)
+            if prices is not None
+        }
+
+        return pd.DataFrame(price_data)
+
+    def clear(self):
+        """캐시 초기화"""
+        with self._lock:
+            self._entries.clear()
+
+
+# 프로세스 전역 공유 저장소
+default_store = PriceStore()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+롤링 리스크 지표 모듈
+가격 행렬(날짜 × 종목) 전체에 대해 롤링 변동성, 롤링 샤프 비율, 롤링 베타,
+누적 낙폭을 한 번에 계산합니다.
+윈도우 합은 누적 합의 차로 구하므로 기간/윈도우 길이와 무관하게 O(n)입니다.
+"""
+
+import numpy as np
+
+
+DEFAULT_WINDOW = 63  # 약 3개월 (거래일)
+
+
+def _as_2d(x):
+    """1차원 시계열은 (날짜, 1) 행렬로 변환"""
+    x = np.asarray(x, dtype=float)
+    return x[:, None] if x.ndim == 1 else x
+
+
+def rolling_sum(x, window):
+    """
+    축 0 방향 롤링 합 (누적 합의 차)
+
+    Returns:
+        x와 같은 모양, 처음 window - 1개 행은 NaN
+    """
+    x = _as_2d(x)
+    csum = np.cumsum(x, axis=0)
+    out = np.full(x.shape, np.nan)
+    if len(x) < window:
+        return out
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    return out
+
+
+def rolling_mean_std(returns, window):
+    """
+    롤링 평균과 표본 표준편차 (ddof=1)
+
+    누적 합의 수치 오차를 줄이기 위해 열 평균을 뺀 값으로 제곱합을 계산합니다.
+    """
+    returns = _as_2d(returns)
+    center = returns.mean(axis=0)
+    centered = returns - center
+
+    s1 = rolling_sum(centered, window)
+    s2 = rolling_sum(centered * centered, window)
+
+    mean = s1 / window + center
+    var = (s2 - s1 * s1 / window) / (window - 1)
+    std = np.sqrt(np.maximum(var, 0))
+    return mean, std
+
+
+def rolling_volatility(returns, window=DEFAULT_WINDOW):
+    """연율화 롤링 변동성"""
+    _, std = rolling_mean_std(returns, window)
+    return std * np.sqrt(252)
+
+
+def rolling_sharpe(returns, window=DEFAULT_WINDOW, risk_free_rate=0.03):
+    """연율화 롤링 샤프 비율 ((평균 수익률 × 252 - 무위험 수익률) / 변동성)"""
+    mean, std = rolling_mean_std(returns, window)
+    volatility = std * np.sqrt(252)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean * 252 - risk_free_rate) / volatility
+    return np.where(volatility > 0, sharpe, np.nan)
+
+
+def rolling_beta(returns, market_returns, window=DEFAULT_WINDOW):
+    """
+    시장 수익률 대비 롤링 베타 (cov(r, m) / var(m))
+
+    Args:
+        returns: (날짜, 종목) 수익률 행렬
+        market_returns: (날짜,) 시장 수익률
+    """
+    returns = _as_2d(returns)
+    market = np.asarray(market_returns, dtype=float)
+    x = returns - returns.mean(axis=0)
+    m = (market - market.mean())[:, None]
+
+    sx = rolling_sum(x, window)
+    sm = rolling_sum(m, window)
+    sxm = rolling_sum(x * m, window)
+    smm = rolling_sum(m * m, window)
+
+    cov = sxm - sx * sm / window
+    var = smm - sm * sm / window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = cov / var
+    return np.where(var > 0, beta, np.nan)
+
+
+def running_drawdown(prices):
+    """누적 낙폭 (고점 대비 하락률, 0 이하)"""
+    prices = _as_2d(prices)
+    return prices / np.maximum.accumulate(prices, axis=0) - 1
+
+
+def compute_rolling_metrics(prices, market_prices=None, window=DEFAULT_WINDOW, risk_free_rate=0.03):
+    """
+    가격 행렬의 롤링 리스크 지표 일괄 계산
+
+    Args:
+        prices: (날짜, 종목) 가격 행렬 (결측 없음)
+        market_prices: (날짜,) 시장 지수 가격 (없으면 베타 생략)
+        window: 롤링 윈도우 (거래일)
+        risk_free_rate: 무위험 수익률
+
+    Returns:
+        dict of (날짜 - 1, 종목) 배열 - returns[i]는 prices[i] -> prices[i + 1] 구간
+        {'volatility', 'sharpe_ratio', 'beta', 'drawdown'}
+    """
+    prices = _as_2d(prices)
+    returns = prices[1:] / prices[:-1] - 1
+    mean, std = rolling_mean_std(returns, window)
+    volatility = std * np.sqrt(252)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(volatility > 0, (mean * 252 - risk_free_rate) / volatility, np.nan)
+
+    beta = None
+    if market_prices is not None:
+        market_prices = np.asarray(market_prices, dtype=float)
+        market_returns = market_prices[1:] / market_prices[:-1] - 1
+        beta = rolling_beta(returns, market_returns, window)
+
+    return {
+        'volatility': volatility,
+        'sharpe_ratio': sharpe,
+        'beta': beta,
+        'drawdown': running_drawdown(prices)[1:]
+    }
+
+
+def series_to_list(values, scale=1.0, decimals=6):
+    """NaN을 None으로 바꾼 JSON 직렬화용 리스트"""
+    values = np.round(np.asarray(values, dtype=float) * scale, decimals)
+    return [None if np.isnan(v) else v for v in values.tolist()]
@@ -12,10 +12,25 @@ from datetime import datetime, timedelta
 import time
 import json
 import os
+import pickle
+import re
+import tempfile
+import uuid
+import numpy as np
 from mpt_calculator import MPTCalculator
-from backtesting import PortfolioBacktester
+from backtesting import PortfolioBacktester, default_sell_tax_rates
+from downsampling import DOWNSAMPLE_METHODS, to_epoch_millis
+from benchmarks import BENCHMARKS
+from tail_risk import TailRiskAnalyzer, VAR_METHODS
+from stress_test import StressTester, STRESS_SCENARIOS
+from price_store import default_store
+from rolling_metrics import series_to_list
+import technical_indicators as ti
 from news_sentiment import NewsSentimentAnalyzer
 from hybrid_recommender import HybridRecommender
+from correlation_service import CorrelationService
+from walk_forward import WalkForwardBacktester
+from monte_carlo import MonteCarloSimulator
 
 app = Flask(__name__)
 
@@ -24,7 +39,7 @@ if os.getenv('FLASK_ENV') == 'production':
     CORS(app, resources={
         r"/api/*": {
             "origins": "*",  # 프로덕션에서는 모든 origin 허용
-            "methods": ["GET", "POST", "OPTIONS"],
+            "methods": ["GET", "POST", "DELETE", "OPTIONS"],
             "allow_headers": ["Content-Type"]
         }
     })
@@ -33,7 +48,7 @@ else:
     CORS(app, resources={
         r"/api/*": {
             "origins": ALLOWED_ORIGINS,
-            "methods": ["GET", "POST", "OPTIONS"],
+            "methods": ["GET", "POST", "DELETE", "OPTIONS"],
             "allow_headers": ["Content-Type"],
             "supports_credentials": True
         }
@@ -417,7 +432,7 @@ def mpt_analyze():
         print(f'[INFO] MPT 분석 시작: {tickers}')
 
         # MPT 계산
-        calculator = MPTCalculator(tickers, start_date, end_date)
+        calculator = MPTCalculator(tickers, start_date, end_date, correlation_service)
         result = calculator.get_full_analysis()
 
         # 종목명 추가
@@ -459,7 +474,7 @@ def mpt_optimize():
 
         print(f'[INFO] 포트폴리오 최적화 시작: {tickers}')
 
-        calculator = MPTCalculator(tickers, start_date, end_date)
+        calculator = MPTCalculator(tickers, start_date, end_date, correlation_service)
         calculator.fetch_historical_data()
         result = calculator.optimize_portfolio()
 
@@ -477,6 +492,169 @@ def mpt_optimize():
         print(traceback.format_exc())
         return jsonify({'error': '최적화 중 오류가 발생했습니다.', 'detail': str(e)}), 500
 
+# MPT what-if 세션: 세션마다 계산기 상태를 파일 하나로 저장
+# (gunicorn 워커끼리 공유 - 후속 요청이 다른 워커로 가도 같은 세션을 읽음)
+MPT_SESSION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mpt_sessions')
+MPT_SESSION_TTL = 30 * 60  # 30분
+
+
+def _mpt_session_path(session_id):
+    """세션 파일 경로 (세션 ID 형식이 아니면 None)"""
+    if not re.fullmatch(r'[0-9a-f]{32}', session_id):
+        return None
+    return os.path.join(MPT_SESSION_DIR, f'{session_id}.pkl')
+
+
+def _purge_mpt_sessions():
+    """만료된 MPT 세션 파일 정리 (마지막 저장 시각 기준)"""
+    if not os.path.isdir(MPT_SESSION_DIR):
+        return
+    now = time.time()
+    for name in os.listdir(MPT_SESSION_DIR):
+        path = os.path.join(MPT_SESSION_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > MPT_SESSION_TTL:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _save_mpt_session(session_id, calculator):
+    """계산기 상태 저장 (같은 디렉터리의 고유 임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(MPT_SESSION_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=MPT_SESSION_DIR, suffix='.tmp', delete=False) as f:
+        pickle.dump(calculator, f)
+    os.replace(f.name, _mpt_session_path(session_id))
+
+
+def _load_mpt_session(session_id):
+    """저장된 계산기 상태 (없거나 만료되었으면 None)"""
+    path = _mpt_session_path(session_id)
+    if path is None or not os.path.exists(path):
+        return None
+    if time.time() - os.path.getmtime(path) > MPT_SESSION_TTL:
+        return None
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _mpt_session_response(session_id, calculator, optimal, started):
+    """MPT 세션 응답 생성"""
+    optimal['tickers'] = calculator.tickers
+    optimal['ticker_names'] = {ticker: get_ticker_name(ticker) for ticker in calculator.tickers}
+    return {
+        'sessionId': session_id,
+        'optimal_portfolio': optimal,
+        'data_period': {
+            'start': calculator.start_date,
+            'end': calculator.end_date,
+            'days': len(calculator.returns_df)
+        },
+        'elapsed_ms': round((time.time() - started) * 1000, 1)
+    }
+
+
+@app.route('/api/mpt/session', methods=['POST'])
+def mpt_session_create():
+    """
+    POST /api/mpt/session
+    what-if 분석용 MPT 세션 생성 (수익률/공분산 행렬을 서버에 유지)
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "startDate": "20231101",  // Optional
+        "endDate": "20241101"     // Optional
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data:
+            return jsonify({'error': 'tickers 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        if len(tickers) < 2:
+            return jsonify({'error': '최소 2개 이상의 종목이 필요합니다.'}), 400
+
+        started = time.time()
+        _purge_mpt_sessions()
+
+        calculator = MPTCalculator(tickers, data.get('startDate'), data.get('endDate'))
+        calculator.fetch_historical_data()
+        optimal = calculator.optimize_portfolio()
+
+        session_id = uuid.uuid4().hex
+        _save_mpt_session(session_id, calculator)
+
+        print(f'[INFO] MPT 세션 생성: {session_id} {tickers}')
+        return jsonify(_mpt_session_response(session_id, calculator, optimal, started))
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] MPT 세션 생성 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': 'MPT 세션 생성 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+
+@app.route('/api/mpt/session/<session_id>/whatif', methods=['POST'])
+def mpt_session_whatif(session_id):
+    """
+    POST /api/mpt/session/{sessionId}/whatif
+    종목 추가/제거 후 직전 비중에서 warm-start하여 재최적화
+
+    Body: {
+        "add": ["000660"],     // Optional
+        "remove": ["005380"]   // Optional
+    }
+    """
+    try:
+        _purge_mpt_sessions()
+        # 파일에서 읽은 사본에 변경을 적용하고, 모두 성공한 경우에만 세션을 교체
+        calculator = _load_mpt_session(session_id)
+        if calculator is None:
+            return jsonify({'error': '세션이 없거나 만료되었습니다.'}), 404
+
+        data = request.get_json() or {}
+        add = data.get('add', [])
+        remove = data.get('remove', [])
+
+        remaining = [t for t in calculator.tickers if t not in remove] + [t for t in add if t not in calculator.tickers]
+        if len(remaining) < 2:
+            return jsonify({'error': '최소 2개 이상의 종목이 필요합니다.'}), 400
+
+        started = time.time()
+        for ticker in remove:
+            calculator.remove_ticker(ticker)
+        for ticker in add:
+            calculator.add_ticker(ticker)
+
+        optimal = calculator.optimize_portfolio()
+        _save_mpt_session(session_id, calculator)
+
+        return jsonify(_mpt_session_response(session_id, calculator, optimal, started))
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] MPT what-if 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': 'what-if 분석 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+
+@app.route('/api/mpt/session/<session_id>', methods=['DELETE'])
+def mpt_session_delete(session_id):
+    """MPT 세션 종료"""
+    path = _mpt_session_path(session_id)
+    if path is not None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return jsonify({'message': '세션이 종료되었습니다.'})
+
 @app.route('/api/backtest', methods=['POST'])
 def backtest_portfolio():
     """
@@ -488,7 +666,16 @@ def backtest_portfolio():
         "weights": [0.5, 0.3, 0.2],
         "initialInvestment": 10000000,  // Optional (기본: 1000만원)
         "startDate": "20231101",        // Optional (기본: 1년 전)
-        "endDate": "20241101"           // Optional (기본: 오늘)
+        "endDate": "20241101",          // Optional (기본: 오늘)
+        "rebalance": "monthly",         // Optional (weekly/monthly/quarterly/yearly, 기본: 매수 후 보유)
+        "rebalanceThreshold": 0.05,     // Optional (비중 이탈 리밸런싱 임계값)
+        "commissionRate": 0.00015,      // Optional (매수/매도 수수료율)
+        "taxRate": 0.002,               // Optional (매도 증권거래세율, 기본: 주식 0.2%, ETF 0)
+        "slippage": 0.001,              // Optional (슬리피지율)
+        "historyFormat": "columnar",    // Optional (records/columnar, 기본: records)
+        "maxPoints": 500,               // Optional (이력 최대 점 개수, 초과 시 다운샘플링)
+        "downsample": "lttb",           // Optional (lttb/minmax, 기본: lttb)
+        "benchmarks": ["069500", "091160"]  // Optional (비교 벤치마크, 기본: KODEX 200)
     }
     """
     try:
@@ -502,6 +689,24 @@ def backtest_portfolio():
         initial_investment = data.get('initialInvestment', 10000000)
         start_date = data.get('startDate')
         end_date = data.get('endDate')
+        rebalance = data.get('rebalance')
+        if rebalance == 'none':
+            rebalance = None
+
+        history_format = data.get('historyFormat', 'records')
+        max_points = data.get('maxPoints')
+        downsample = data.get('downsample', 'lttb')
+
+        if history_format not in ('records', 'columnar'):
+            return jsonify({'error': 'historyFormat은 records 또는 columnar여야 합니다.'}), 400
+        if downsample not in DOWNSAMPLE_METHODS:
+            return jsonify({'error': f'downsample은 {", ".join(DOWNSAMPLE_METHODS)} 중 하나여야 합니다.'}), 400
+        if max_points is not None and int(max_points) < 4:
+            return jsonify({'error': 'maxPoints는 4 이상이어야 합니다.'}), 400
+
+        benchmarks = data.get('benchmarks')
+        if benchmarks is not None and not isinstance(benchmarks, list):
+            return jsonify({'error': 'benchmarks는 종목 코드 리스트여야 합니다.'}), 400
 
         if len(tickers) != len(weights):
             return jsonify({'error': 'tickers와 weights의 개수가 일치해야 합니다.'}), 400
@@ -519,10 +724,20 @@ def backtest_portfolio():
             weights=weights,
             initial_investment=initial_investment,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            rebalance=rebalance,
+            rebalance_threshold=data.get('rebalanceThreshold'),
+            commission_rate=data.get('commissionRate', 0.0),
+            tax_rate=data.get('taxRate', default_sell_tax_rates(tickers)),
+            slippage=data.get('slippage', 0.0)
         )
 
-        result = backtester.run_full_backtest()
+        result = backtester.run_full_backtest(
+            columnar=(history_format == 'columnar'),
+            max_points=int(max_points) if max_points is not None else None,
+            downsample=downsample,
+            benchmarks=benchmarks
+        )
 
         # 종목명 추가
         ticker_names = {ticker: get_ticker_name(ticker) for ticker in tickers}
@@ -539,6 +754,261 @@ def backtest_portfolio():
         print(traceback.format_exc())
         return jsonify({'error': '백테스팅 중 오류가 발생했습니다.', 'detail': str(e)}), 500
 
+@app.route('/api/benchmarks', methods=['GET'])
+def list_benchmarks():
+    """
+    GET /api/benchmarks
+    백테스트 비교에 사용할 수 있는 벤치마크 목록
+    """
+    return jsonify({
+        'benchmarks': [{'ticker': ticker, 'name': name} for ticker, name in BENCHMARKS.items()]
+    })
+
+@app.route('/api/backtest/batch', methods=['POST'])
+def backtest_batch():
+    """
+    POST /api/backtest/batch
+    여러 비중 조합 일괄 백테스팅 (가격 데이터 공유)
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "weights": [[0.5, 0.3, 0.2], [0.4, 0.4, 0.2], ...],
+        "rebalance": "daily",           // Optional (기본: 매수 후 보유)
+        "startDate": "20231101",        // Optional (기본: 1년 전)
+        "endDate": "20241101"           // Optional (기본: 오늘)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data or 'weights' not in data:
+            return jsonify({'error': 'tickers와 weights 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        weight_matrix = np.asarray(data['weights'], dtype=float)
+
+        if weight_matrix.ndim != 2 or weight_matrix.shape[1] != len(tickers):
+            return jsonify({'error': 'weights는 (조합 수 × 종목 수) 형태여야 합니다.'}), 400
+
+        # 비중 합계 검증
+        if np.any(np.abs(weight_matrix.sum(axis=1) - 1.0) > 0.01):
+            return jsonify({'error': '각 비중 조합의 합계는 1.0이어야 합니다.'}), 400
+
+        print(f'[INFO] 일괄 백테스팅 시작: {tickers}, 조합 {len(weight_matrix)}개')
+
+        backtester = PortfolioBacktester(
+            tickers=tickers,
+            weights=weight_matrix[0],
+            start_date=data.get('startDate'),
+            end_date=data.get('endDate')
+        )
+        metrics = backtester.run_batch(weight_matrix, rebalance=data.get('rebalance'))
+
+        print('[INFO] 일괄 백테스팅 완료')
+        return jsonify({
+            'tickers': tickers,
+            'count': len(weight_matrix),
+            'metrics': metrics,
+            'best_sharpe_index': int(np.argmax(metrics['sharpe_ratio'])),
+            'period': {
+                'start': backtester.start_date,
+                'end': backtester.end_date
+            }
+        })
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 일괄 백테스팅 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '일괄 백테스팅 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+# 요청 하나가 쓸 수 있는 병렬 프로세스 수 상한
+# (gunicorn 워커들이 CPU를 나눠 쓰므로 코어 수를 워커 수로 나눔, Procfile: --workers 2)
+GUNICORN_WORKERS = int(os.getenv('WEB_CONCURRENCY', 2))
+MAX_REQUEST_JOBS = max(1, min(4, (os.cpu_count() or 1) // GUNICORN_WORKERS))
+
+
+@app.route('/api/backtest/walkforward', methods=['POST'])
+def backtest_walk_forward():
+    """
+    POST /api/backtest/walkforward
+    워크포워드 최적화 백테스팅 (학습 구간 최적화 -> 다음 구간 적용 반복)
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "initialInvestment": 10000000,  // Optional (기본: 1000만원)
+        "startDate": "20211101",        // Optional (기본: 3년 전)
+        "endDate": "20241101",          // Optional (기본: 오늘)
+        "trainDays": 252,               // Optional (학습 구간 거래일 수)
+        "testDays": 63,                 // Optional (테스트 구간 거래일 수)
+        "parallel": true                // Optional (여러 코어에서 병렬 실행)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data:
+            return jsonify({'error': 'tickers 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        if len(tickers) < 2:
+            return jsonify({'error': '최소 2개 이상의 종목이 필요합니다.'}), 400
+
+        train_days = int(data.get('trainDays', 252))
+        test_days = int(data.get('testDays', 63))
+        if train_days < 20 or test_days < 1:
+            return jsonify({'error': 'trainDays는 20 이상, testDays는 1 이상이어야 합니다.'}), 400
+
+        print(f'[INFO] 워크포워드 백테스팅 시작: {tickers}')
+
+        backtester = WalkForwardBacktester(
+            tickers=tickers,
+            initial_investment=data.get('initialInvestment', 10000000),
+            start_date=data.get('startDate'),
+            end_date=data.get('endDate'),
+            train_days=train_days,
+            test_days=test_days,
+            n_jobs=MAX_REQUEST_JOBS if data.get('parallel') else 1
+        )
+        result = backtester.run()
+        result['ticker_names'] = {ticker: get_ticker_name(ticker) for ticker in result['tickers']}
+
+        print('[INFO] 워크포워드 백테스팅 완료')
+        return jsonify(result)
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 워크포워드 백테스팅 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '워크포워드 백테스팅 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+@app.route('/api/backtest/simulate', methods=['POST'])
+def backtest_simulate():
+    """
+    POST /api/backtest/simulate
+    몬테카를로 미래 가치 시뮬레이션
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "weights": [0.5, 0.3, 0.2],
+        "initialInvestment": 10000000,  // Optional (기본: 1000만원)
+        "method": "bootstrap",          // Optional (parametric/bootstrap, 기본: parametric)
+        "horizonDays": 252,             // Optional (시뮬레이션 거래일 수)
+        "paths": 10000,                 // Optional (경로 수)
+        "seed": 42,                     // Optional (재현용 시드)
+        "parallel": true,               // Optional (여러 코어에서 병렬 실행)
+        "startDate": "20211101",        // Optional (추정 기간 시작, 기본: 3년 전)
+        "endDate": "20241101"           // Optional (추정 기간 종료, 기본: 오늘)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data or 'weights' not in data:
+            return jsonify({'error': 'tickers와 weights 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        weights = data['weights']
+
+        if len(tickers) != len(weights):
+            return jsonify({'error': 'tickers와 weights의 개수가 일치해야 합니다.'}), 400
+
+        horizon_days = int(data.get('horizonDays', 252))
+        n_paths = int(data.get('paths', 10000))
+        if not (1 <= horizon_days <= 252 * 30) or not (1 <= n_paths <= 200000):
+            return jsonify({'error': 'horizonDays는 1~7560, paths는 1~200000 범위여야 합니다.'}), 400
+
+        print(f'[INFO] 몬테카를로 시뮬레이션 시작: {tickers}, 경로 {n_paths}개')
+
+        simulator = MonteCarloSimulator(
+            tickers=tickers,
+            weights=weights,
+            initial_investment=data.get('initialInvestment', 10000000),
+            start_date=data.get('startDate'),
+            end_date=data.get('endDate'),
+            method=data.get('method', 'parametric')
+        )
+        result = simulator.simulate(
+            horizon_days=horizon_days,
+            n_paths=n_paths,
+            seed=data.get('seed'),
+            n_jobs=MAX_REQUEST_JOBS if data.get('parallel') else 1
+        )
+
+        print('[INFO] 몬테카를로 시뮬레이션 완료')
+        return jsonify(result)
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 몬테카를로 시뮬레이션 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '시뮬레이션 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+@app.route('/api/backtest/contributions', methods=['POST'])
+def backtest_contributions():
+    """
+    POST /api/backtest/contributions
+    적립식(정기 납입/인출) 백테스팅 - 시간가중/금액가중(IRR) 수익률
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "weights": [0.5, 0.3, 0.2],
+        "contribution": 500000,         // 주기별 납입액 (음수면 인출)
+        "frequency": "monthly",         // Optional (weekly/monthly/quarterly/yearly)
+        "initialInvestment": 0,         // Optional (첫날 추가 투자금, 기본: 0)
+        "startDate": "20141101",        // Optional (기본: 1년 전)
+        "endDate": "20241101"           // Optional (기본: 오늘)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data or 'weights' not in data or 'contribution' not in data:
+            return jsonify({'error': 'tickers, weights, contribution 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        weights = data['weights']
+
+        if len(tickers) != len(weights):
+            return jsonify({'error': 'tickers와 weights의 개수가 일치해야 합니다.'}), 400
+
+        weight_sum = sum(weights)
+        if abs(weight_sum - 1.0) > 0.01:
+            return jsonify({'error': f'비중의 합계는 1.0이어야 합니다. (현재: {weight_sum})'}), 400
+
+        print(f'[INFO] 적립식 백테스팅 시작: {tickers}, 납입액: {data["contribution"]}')
+
+        backtester = PortfolioBacktester(
+            tickers=tickers,
+            weights=weights,
+            initial_investment=data.get('initialInvestment', 0),
+            start_date=data.get('startDate'),
+            end_date=data.get('endDate')
+        )
+        result = backtester.run_contribution_plan(
+            float(data['contribution']),
+            frequency=data.get('frequency', 'monthly')
+        )
+        result['ticker_names'] = {ticker: get_ticker_name(ticker) for ticker in tickers}
+        result['period'] = {'start': backtester.start_date, 'end': backtester.end_date}
+
+        print('[INFO] 적립식 백테스팅 완료')
+        return jsonify(result)
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 적립식 백테스팅 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '적립식 백테스팅 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
 @app.route('/api/news/sentiment', methods=['POST'])
 def news_sentiment():
     """
@@ -571,7 +1041,6 @@ def news_sentiment():
         for ticker in tickers:
             try:
                 sentiment_result = analyzer.analyze_stock_sentiment(ticker, max_news)
-                results.append(sentiment_result)
             except Exception as e:
                 print(f'[경고] {ticker} 감성 분석 실패: {e}')
                 # 실패한 종목도 기본 정보 포함
@@ -587,6 +1056,15 @@ def news_sentiment():
                     'news': [],
                     'error': str(e)
                 })
+            else:
+                results.append(sentiment_result)
+                # 추천 특징에 새 감성 점수 반영 (실패해도 분석 결과는 그대로 반환)
+                try:
+                    recommender.content_recommender.update_stock_features(
+                        ticker, sentiment_score=sentiment_result['overall_score']
+                    )
+                except Exception as e:
+                    print(f'[경고] {ticker} 추천 특징 갱신 실패: {e}')
 
         print('[INFO] 뉴스 감성 분석 완료')
         return jsonify({'results': results})
@@ -598,6 +1076,293 @@ def news_sentiment():
         return jsonify({'error': '뉴스 감성 분석 중 오류가 발생했습니다.', 'detail': str(e)}), 500
 
 
+# ==================== 리스크 분석 API ====================
+
+@app.route('/api/risk/rolling', methods=['POST'])
+def rolling_risk_metrics():
+    """
+    POST /api/risk/rolling
+    포트폴리오와 개별 종목의 롤링 변동성/샤프 비율/베타, 누적 낙폭 시계열
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "weights": [0.5, 0.3, 0.2],
+        "window": 63,                   // Optional (롤링 윈도우, 거래일)
+        "benchmark": "069500",          // Optional (베타 기준 지수, 기본: KODEX 200)
+        "startDate": "20231101",        // Optional (기본: 1년 전)
+        "endDate": "20241101"           // Optional (기본: 오늘)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data or 'weights' not in data:
+            return jsonify({'error': 'tickers와 weights 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        weights = data['weights']
+        window = int(data.get('window', 63))
+
+        if len(tickers) != len(weights):
+            return jsonify({'error': 'tickers와 weights의 개수가 일치해야 합니다.'}), 400
+        if window < 2:
+            return jsonify({'error': 'window는 2 이상이어야 합니다.'}), 400
+
+        backtester = PortfolioBacktester(
+            tickers=tickers,
+            weights=weights,
+            start_date=data.get('startDate'),
+            end_date=data.get('endDate')
+        )
+        result = backtester.get_rolling_metrics(window, data.get('benchmark', '069500'))
+        result['ticker_names'] = {ticker: get_ticker_name(ticker) for ticker in tickers}
+
+        return jsonify(result)
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 롤링 리스크 지표 계산 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '롤링 리스크 지표 계산 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+@app.route('/api/risk/drawdowns', methods=['POST'])
+def drawdown_analysis():
+    """
+    POST /api/risk/drawdowns
+    포트폴리오와 개별 종목의 상위 낙폭 구간 (고점, 저점, 회복일, 깊이, 기간)
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "weights": [0.5, 0.3, 0.2],
+        "topN": 5,                      // Optional (구간 수, 기본: 5)
+        "startDate": "20141101",        // Optional (기본: 1년 전)
+        "endDate": "20241101"           // Optional (기본: 오늘)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data or 'weights' not in data:
+            return jsonify({'error': 'tickers와 weights 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        weights = data['weights']
+        top_n = int(data.get('topN', 5))
+
+        if len(tickers) != len(weights):
+            return jsonify({'error': 'tickers와 weights의 개수가 일치해야 합니다.'}), 400
+        if top_n < 1:
+            return jsonify({'error': 'topN은 1 이상이어야 합니다.'}), 400
+
+        backtester = PortfolioBacktester(
+            tickers=tickers,
+            weights=weights,
+            start_date=data.get('startDate'),
+            end_date=data.get('endDate')
+        )
+        result = backtester.get_drawdown_analysis(top_n)
+        result['ticker_names'] = {ticker: get_ticker_name(ticker) for ticker in tickers}
+
+        return jsonify(result)
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 낙폭 분석 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '낙폭 분석 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+@app.route('/api/risk/var', methods=['POST'])
+def value_at_risk():
+    """
+    POST /api/risk/var
+    VaR/CVaR (과거/모수/몬테카를로) - 여러 포트폴리오 일괄 계산
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "weights": [[0.5, 0.3, 0.2], [0.2, 0.3, 0.5]],  // 단일 비중 또는 비중 목록
+        "confidenceLevels": [0.95, 0.99],  // Optional
+        "horizons": [1, 10],            // Optional (보유기간, 거래일)
+        "methods": ["historical", "parametric", "monte_carlo"],  // Optional
+        "paths": 10000,                 // Optional (몬테카를로 경로 수)
+        "seed": 42,                     // Optional
+        "portfolioValue": 10000000,     // Optional (금액 환산 기준)
+        "startDate": "20211101",        // Optional (기본: 3년 전)
+        "endDate": "20241101"           // Optional (기본: 오늘)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data or 'weights' not in data:
+            return jsonify({'error': 'tickers와 weights 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        weight_matrix = np.atleast_2d(np.array(data['weights'], dtype=float))
+        confidence_levels = [float(c) for c in data.get('confidenceLevels', [0.95, 0.99])]
+        horizons = [int(h) for h in data.get('horizons', [1, 10])]
+        methods = data.get('methods', list(VAR_METHODS))
+        n_paths = int(data.get('paths', 10000))
+
+        if weight_matrix.ndim != 2 or weight_matrix.shape[1] != len(tickers):
+            return jsonify({'error': 'weights의 각 행은 tickers와 개수가 일치해야 합니다.'}), 400
+        if np.any(np.abs(weight_matrix.sum(axis=1) - 1.0) > 0.01):
+            return jsonify({'error': '각 비중 행의 합계는 1.0이어야 합니다.'}), 400
+        if not confidence_levels or any(not 0 < c < 1 for c in confidence_levels):
+            return jsonify({'error': 'confidenceLevels는 0과 1 사이여야 합니다.'}), 400
+        if not horizons or min(horizons) < 1:
+            return jsonify({'error': 'horizons는 1 이상이어야 합니다.'}), 400
+        if any(m not in VAR_METHODS for m in methods):
+            return jsonify({'error': f'methods는 {", ".join(VAR_METHODS)} 중에서 선택해야 합니다.'}), 400
+        if not 100 <= n_paths <= 100000:
+            return jsonify({'error': 'paths는 100 이상 100000 이하여야 합니다.'}), 400
+
+        print(f'[INFO] VaR 계산 시작: {tickers}, 포트폴리오 {len(weight_matrix)}개')
+
+        analyzer = TailRiskAnalyzer(tickers, data.get('startDate'), data.get('endDate'))
+        portfolios = analyzer.analyze(
+            weight_matrix,
+            confidence_levels=confidence_levels,
+            horizons=horizons,
+            methods=methods,
+            n_paths=n_paths,
+            seed=data.get('seed'),
+            portfolio_value=data.get('portfolioValue')
+        )
+
+        return jsonify({
+            'tickers': analyzer.columns,
+            'confidence_levels': confidence_levels,
+            'horizons': horizons,
+            'portfolios': portfolios,
+            'period': {'start': analyzer.start_date, 'end': analyzer.end_date}
+        })
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] VaR 계산 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': 'VaR 계산 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+@app.route('/api/risk/stress', methods=['POST'])
+def stress_test():
+    """
+    POST /api/risk/stress
+    과거 위기 구간 스트레스 테스트 (여러 포트폴리오 × 여러 시나리오 일괄)
+
+    Body: {
+        "tickers": ["005930", "035420", "005380"],
+        "weights": [[0.5, 0.3, 0.2], [0.2, 0.3, 0.5]],  // 단일 비중 또는 비중 목록
+        "scenarios": ["gfc_2008", "covid_2020"],      // Optional (기본: 전체)
+        "customScenarios": [                          // Optional (사용자 정의 구간)
+            {"name": "2018 하락장", "start": "20180129", "end": "20181029"}
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'tickers' not in data or 'weights' not in data:
+            return jsonify({'error': 'tickers와 weights 필드가 필요합니다.'}), 400
+
+        tickers = data['tickers']
+        weight_matrix = np.atleast_2d(np.array(data['weights'], dtype=float))
+
+        if weight_matrix.ndim != 2 or weight_matrix.shape[1] != len(tickers):
+            return jsonify({'error': 'weights의 각 행은 tickers와 개수가 일치해야 합니다.'}), 400
+        if np.any(np.abs(weight_matrix.sum(axis=1) - 1.0) > 0.01):
+            return jsonify({'error': '각 비중 행의 합계는 1.0이어야 합니다.'}), 400
+
+        scenario_ids = data.get('scenarios', list(STRESS_SCENARIOS))
+        unknown = [s for s in scenario_ids if s not in STRESS_SCENARIOS]
+        if unknown:
+            return jsonify({'error': f'알 수 없는 시나리오: {", ".join(unknown)}'}), 400
+
+        scenarios = {s: STRESS_SCENARIOS[s] for s in scenario_ids}
+        for i, custom in enumerate(data.get('customScenarios', [])):
+            if 'start' not in custom or 'end' not in custom or custom['start'] >= custom['end']:
+                return jsonify({'error': 'customScenarios에는 start < end인 구간이 필요합니다.'}), 400
+            scenarios[f'custom_{i + 1}'] = {
+                'name': custom.get('name', f'사용자 정의 {i + 1}'),
+                'start': custom['start'],
+                'end': custom['end']
+            }
+
+        if not scenarios:
+            return jsonify({'error': '시나리오를 하나 이상 선택해야 합니다.'}), 400
+
+        print(f'[INFO] 스트레스 테스트 시작: {tickers}, 포트폴리오 {len(weight_matrix)}개, 시나리오 {len(scenarios)}개')
+
+        tester = StressTester(tickers, scenarios)
+        result = tester.run(weight_matrix)
+        result['ticker_names'] = {ticker: get_ticker_name(ticker) for ticker in tickers}
+
+        return jsonify(result)
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 스트레스 테스트 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '스트레스 테스트 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+@app.route('/api/risk/stress/scenarios', methods=['GET'])
+def list_stress_scenarios():
+    """
+    GET /api/risk/stress/scenarios
+    스트레스 테스트 시나리오 목록
+    """
+    return jsonify({
+        'scenarios': [{'id': scenario_id, **scenario} for scenario_id, scenario in STRESS_SCENARIOS.items()]
+    })
+
+
+# ==================== 기술적 지표 API ====================
+
+@app.route('/api/indicators/<ticker>', methods=['GET'])
+def get_indicator_series(ticker):
+    """
+    GET /api/indicators/005930?days=365 - 전체 기간 기술적 지표 시계열
+
+    Query params:
+    - days: 조회 기간 (일, 기본: 365)
+    """
+    try:
+        days = int(request.args.get('days', 365))
+        if days < 1:
+            return jsonify({'error': 'days는 1 이상이어야 합니다.'}), 400
+
+        end_date = datetime.now().strftime('%Y%m%d')
+        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y%m%d')
+        prices = default_store.get_close_series(ticker, start_date, end_date)
+        if prices is None:
+            return jsonify({'error': f'{ticker} 가격 데이터가 없습니다.'}), 404
+
+        indicators = ti.get_all_indicator_series(prices.values)
+
+        return jsonify({
+            'ticker': ticker,
+            'name': get_ticker_name(ticker),
+            'dates': to_epoch_millis(prices.index).tolist(),
+            'close': prices.values.tolist(),
+            'indicators': {key: series_to_list(values) for key, values in indicators.items()}
+        })
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 기술적 지표 계산 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '기술적 지표 계산 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
+
 # ==================== 추천 시스템 API ====================
 
 # 추천 시스템 인스턴스 (전역)
@@ -760,6 +1525,36 @@ def get_popular_recommendations():
         return jsonify({'error': '인기 종목 추천 중 오류가 발생했습니다.', 'detail': str(e)}), 500
 
 
+
+# ==================== 상관관계 API ====================
+
+# 전체 유니버스 상관관계 (거래일당 1회 계산)
+correlation_service = CorrelationService(ALL_TICKERS)
+
+
+@app.route('/api/correlation', methods=['GET'])
+def get_correlation():
+    """
+    GET /api/correlation?tickers=005930,035420 - 상관관계 부분 행렬
+
+    Query params:
+    - tickers: 종목 코드 (생략 시 전체 유니버스)
+    """
+    try:
+        tickers_param = request.args.get('tickers')
+        tickers = [t.strip() for t in tickers_param.split(',')] if tickers_param else None
+
+        result = correlation_service.get_submatrix(tickers)
+        return jsonify(result)
+
+    except ValueError as e:
+        return jsonify({'error': f'데이터 오류: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f'[에러] 상관관계 조회 실패: {e}')
+        print(traceback.format_exc())
+        return jsonify({'error': '상관관계 조회 중 오류가 발생했습니다.', 'detail': str(e)}), 500
+
 if __name__ == '__main__':
     # 환경 변수에서 포트 및 디버그 모드 설정
     port = int(os.getenv('PORT', 3001))
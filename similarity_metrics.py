@@ -7,6 +7,27 @@
 
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity, euclidean_distances
+from feature_extractor import VECTOR_FEATURES, STOCK_TYPES, features_to_matrix, category_codes
+
+
+DEFAULT_WEIGHTS = {
+    'sector': 0.2,
+    'type': 0.15,
+    'risk': 0.25,
+    'fundamental': 0.2,
+    'technical': 0.2
+}
+
+# 블록별 비교 특징 (features_to_matrix 열 이름)
+SIMILARITY_BLOCKS = {
+    'risk': ['volatility', 'sharpe_ratio', 'beta', 'max_drawdown',
+             'downside_beta', 'market_correlation', 'idiosyncratic_volatility'],
+    'fundamental': ['per', 'pbr', 'roe', 'dividend_yield'],
+    'technical': ['rsi', 'momentum', 'bb_position', 'price_roc'],
+}
+
+# 가중 유사도에 쓰이는 특징 열 (features_to_matrix 열 인덱스)
+SIMILARITY_COLUMNS = sorted(VECTOR_FEATURES.index(key) for keys in SIMILARITY_BLOCKS.values() for key in keys)
 
 
 def cosine_sim(vector1, vector2):
@@ -79,18 +100,19 @@ def type_similarity(type1, type2):
     return 0.3
 
 
+def _block_similarity(features1, features2, block):
+    """두 종목의 특징 블록 유사도 (0-1 정규화 특징의 유클리디안 유사도, 행렬 경로와 같은 값)"""
+    _, matrix = features_to_matrix({0: features1, 1: features2}, 'minmax')
+    columns = [VECTOR_FEATURES.index(key) for key in SIMILARITY_BLOCKS[block]]
+    return euclidean_sim(matrix[0, columns], matrix[1, columns])
+
+
 def risk_profile_similarity(features1, features2):
     """
     리스크 프로필 유사도
-    변동성, 샤프비율, 베타 등을 비교
+    변동성, 샤프비율, 베타(전체/하방), 시장 상관계수 등을 비교
     """
-    # 리스크 관련 특징만 추출
-    risk_keys = ['volatility', 'sharpe_ratio', 'beta', 'max_drawdown']
-
-    vec1 = [features1.get(key, 0.5) for key in risk_keys]
-    vec2 = [features2.get(key, 0.5) for key in risk_keys]
-
-    return euclidean_sim(vec1, vec2)
+    return _block_similarity(features1, features2, 'risk')
 
 
 def fundamental_similarity(features1, features2):
@@ -98,12 +120,7 @@ def fundamental_similarity(features1, features2):
     기본 지표 유사도
     PER, PBR, ROE, 배당수익률 비교
     """
-    fundamental_keys = ['per', 'pbr', 'roe', 'dividend_yield']
-
-    vec1 = [features1.get(key, 0.5) for key in fundamental_keys]
-    vec2 = [features2.get(key, 0.5) for key in fundamental_keys]
-
-    return euclidean_sim(vec1, vec2)
+    return _block_similarity(features1, features2, 'fundamental')
 
 
 def technical_similarity(features1, features2):
@@ -111,12 +128,7 @@ def technical_similarity(features1, features2):
     기술적 지표 유사도
     RSI, 모멘텀, 볼린저밴드 위치 등 비교
     """
-    technical_keys = ['rsi', 'momentum', 'bb_position', 'price_roc']
-
-    vec1 = [features1.get(key, 0.5) for key in technical_keys]
-    vec2 = [features2.get(key, 0.5) for key in technical_keys]
-
-    return euclidean_sim(vec1, vec2)
+    return _block_similarity(features1, features2, 'technical')
 
 
 def correlation_based_similarity(correlation_value):
@@ -141,6 +153,7 @@ def diversification_score(correlation_value):
 def weighted_similarity(features1, features2, weights=None):
     """
     가중치 기반 종합 유사도
+    리스크/기본/기술적 블록은 0-1 정규화 특징(NORMALIZATION_RANGES)으로 비교합니다.
 
     Args:
         features1, features2: 특징 딕셔너리
@@ -153,40 +166,122 @@ def weighted_similarity(features1, features2, weights=None):
                 'technical': 0.2
             }
     """
+    # 두 종목 행렬로 계산 (weighted_similarity_matrix와 같은 정규화, 같은 값)
+    _, matrix, sector_codes, type_codes = feature_arrays({0: features1, 1: features2})
+    return float(weighted_similarity_matrix(matrix, sector_codes, type_codes, weights, rows=[0])[0, 1])
+
+
+def type_similarity_table():
+    """타입 코드 쌍별 유사도 조회 테이블 (STOCK_TYPES 코드 순서, type_similarity와 같은 값)"""
+    names = sorted(STOCK_TYPES, key=STOCK_TYPES.get)
+    return np.array([[type_similarity(a, b) for b in names] for a in names])
+
+
+TYPE_SIMILARITY_TABLE = type_similarity_table()
+
+
+def euclidean_distance_matrix(matrix, rows=None):
+    """
+    행 간 유클리디안 거리 (|a - b|² = |a|² + |b|² - 2a·b, 행렬 곱 한 번)
+
+    가까운 두 행은 전개식에서 자릿수 손실이 커서 float64로 계산합니다
+    (float32면 거리 오차가 1e-4 수준).
+
+    Args:
+        matrix: (N, d) 배열
+        rows: 기준 행 인덱스 (None이면 전체 N×N)
+
+    Returns:
+        (len(rows), N) float64 거리 배열 - 자기 자신과의 거리는 정확히 0
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    rows = np.arange(len(matrix)) if rows is None else np.asarray(rows, dtype=int)
+    squared_norms = np.einsum('ij,ij->i', matrix, matrix)
+    squared = squared_norms[rows, None] + squared_norms[None, :] - 2 * (matrix[rows] @ matrix.T)
+    np.maximum(squared, 0, out=squared)
+    squared[np.arange(len(rows)), rows] = 0
+    return np.sqrt(squared, out=squared)
+
+
+def weighted_similarity_matrix(matrix, sector_codes, type_codes, weights=None, rows=None):
+    """
+    가중치 기반 종합 유사도 행렬 (weighted_similarity의 행렬 버전)
+
+    섹터는 코드 비교, 타입은 TYPE_SIMILARITY_TABLE 조회, 리스크/기본/기술적 블록은
+    정규화된 특징 행렬의 해당 열로 유클리디안 유사도(exp(-거리))를 계산합니다.
+
+    Args:
+        matrix: (N, d) 특징 행렬 (features_to_matrix, 열 순서 VECTOR_FEATURES)
+        sector_codes, type_codes: (N,) 섹터/타입 코드
+        weights: 가중치 딕셔너리 (기본: DEFAULT_WEIGHTS)
+        rows: 기준 행 인덱스 (None이면 전체 N×N)
+
+    Returns:
+        (len(rows), N) 유사도 배열
+    """
     if weights is None:
-        weights = {
-            'sector': 0.2,
-            'type': 0.15,
-            'risk': 0.25,
-            'fundamental': 0.2,
-            'technical': 0.2
-        }
-
-    # 각 카테고리별 유사도 계산
-    sector_sim = sector_similarity(
-        features1.get('sector', 'etf'),
-        features2.get('sector', 'etf')
-    )
-
-    type_sim = type_similarity(
-        features1.get('type', 'etf'),
-        features2.get('type', 'etf')
-    )
-
-    risk_sim = risk_profile_similarity(features1, features2)
-    fund_sim = fundamental_similarity(features1, features2)
-    tech_sim = technical_similarity(features1, features2)
-
-    # 가중 평균
-    total_similarity = (
-        weights['sector'] * sector_sim +
-        weights['type'] * type_sim +
-        weights['risk'] * risk_sim +
-        weights['fundamental'] * fund_sim +
-        weights['technical'] * tech_sim
-    )
-
-    return float(total_similarity)
+        weights = DEFAULT_WEIGHTS
+
+    sector_codes = np.asarray(sector_codes)
+    type_codes = np.asarray(type_codes)
+    rows = np.arange(len(matrix)) if rows is None else np.asarray(rows, dtype=int)
+
+    total = weights['sector'] * (sector_codes[rows, None] == sector_codes[None, :]).astype(matrix.dtype)
+    total += weights['type'] * TYPE_SIMILARITY_TABLE[type_codes[rows]][:, type_codes].astype(matrix.dtype)
+
+    for block, keys in SIMILARITY_BLOCKS.items():
+        columns = [VECTOR_FEATURES.index(key) for key in keys]
+        distance = euclidean_distance_matrix(np.ascontiguousarray(matrix[:, columns]), rows)
+        total += weights[block] * np.exp(-distance)
+
+    return total
+
+
+def weighted_similarity_to_all(target, matrix, sector_codes, type_codes, weights=None):
+    """한 종목과 모든 종목의 가중치 기반 종합 유사도 ((N,) 배열)"""
+    return weighted_similarity_matrix(matrix, sector_codes, type_codes, weights, rows=[target])[0]
+
+
+def update_similarity_matrix(similarity, matrix, sector_codes, type_codes, index, weights=None):
+    """
+    한 종목의 특징이 바뀐 뒤 유사도 행렬의 해당 행/열만 다시 계산 (O(N·d), 제자리 갱신)
+
+    Args:
+        similarity: (N, N) 유사도 행렬 (weighted_similarity_matrix 결과)
+        matrix: (N, d) 특징 행렬 (index 행은 이미 새 특징으로 교체된 상태)
+        index: 바뀐 종목의 행 인덱스
+
+    Returns:
+        (N,) 새 유사도 행
+    """
+    row = weighted_similarity_matrix(matrix, sector_codes, type_codes, weights, rows=[index])[0]
+    similarity[index, :] = row
+    similarity[:, index] = row
+    return row
+
+
+def cosine_similarity_matrix(vectors):
+    """특징 벡터 간 코사인 유사도 행렬 (영벡터는 0)"""
+    norms = np.linalg.norm(vectors, axis=1)
+    unit = np.divide(vectors, norms[:, None], out=np.zeros_like(vectors), where=norms[:, None] > 0)
+    return np.clip(unit @ unit.T, -1, 1)
+
+
+def euclidean_similarity_matrix(vectors):
+    """특징 벡터 간 유클리디안 거리 기반 유사도 행렬 (exp(-거리), euclidean_sim과 같은 변환)"""
+    return np.exp(-euclidean_distance_matrix(vectors))
+
+
+def feature_arrays(stocks_features):
+    """
+    특징 딕셔너리를 유사도 계산용 배열로 변환
+
+    Returns:
+        (tickers, matrix, sector_codes, type_codes) - matrix는 0-1 정규화 특징 (VECTOR_FEATURES 순서)
+    """
+    tickers, matrix = features_to_matrix(stocks_features, 'minmax')
+    sector_codes, type_codes = category_codes(stocks_features)
+    return tickers, matrix, sector_codes, type_codes
 
 
 def calculate_similarity_matrix(stocks_features, method='weighted'):
@@ -195,30 +290,41 @@ def calculate_similarity_matrix(stocks_features, method='weighted'):
 
     Args:
         stocks_features: dict of {ticker: features_dict}
-        method: 'cosine', 'euclidean', 'weighted'
+        method: 'cosine', 'euclidean' (정규화 특징 + 섹터/타입 원-핫 벡터), 'weighted'
 
     Returns:
         numpy array of shape (n_stocks, n_stocks)
     """
-    tickers = list(stocks_features.keys())
-    n = len(tickers)
+    if method == 'weighted':
+        _, matrix, sector_codes, type_codes = feature_arrays(stocks_features)
+        similarity_matrix = weighted_similarity_matrix(matrix, sector_codes, type_codes)
+    elif method in ('cosine', 'euclidean'):
+        _, vectors = features_to_matrix(stocks_features, 'minmax', include_categorical=True)
+        if method == 'cosine':
+            similarity_matrix = cosine_similarity_matrix(vectors)
+        else:
+            similarity_matrix = euclidean_similarity_matrix(vectors)
+    else:
+        raise ValueError(f"Unknown similarity method: {method}")
+
+    np.fill_diagonal(similarity_matrix, 1.0)
+    return similarity_matrix
+
 
-    similarity_matrix = np.zeros((n, n))
+def _rank_against(target_ticker, stocks_features, top_k, exclude_tickers, diverse):
+    """기준 종목 대비 유사도(또는 1 - 유사도) 상위 K개"""
+    if target_ticker not in stocks_features:
+        return []
 
-    for i, ticker1 in enumerate(tickers):
-        for j, ticker2 in enumerate(tickers):
-            if i == j:
-                similarity_matrix[i][j] = 1.0
-            elif method == 'weighted':
-                similarity_matrix[i][j] = weighted_similarity(
-                    stocks_features[ticker1],
-                    stocks_features[ticker2]
-                )
-            else:
-                # 벡터 기반 방법은 특징 벡터가 필요
-                pass
+    excluded = set(exclude_tickers or []) | {target_ticker}
+    tickers, matrix, sector_codes, type_codes = feature_arrays(stocks_features)
+    scores = weighted_similarity_to_all(tickers.index(target_ticker), matrix, sector_codes, type_codes)
+    if diverse:
+        scores = 1.0 - scores
 
-    return similarity_matrix
+    candidates = np.array([i for i, t in enumerate(tickers) if t not in excluded], dtype=int)
+    top = candidates[np.argsort(-scores[candidates], kind='stable')[:top_k]]
+    return [(tickers[i], float(scores[i])) for i in top]
 
 
 def find_most_similar(target_ticker, stocks_features, top_k=5, exclude_tickers=None):
@@ -234,27 +340,7 @@ def find_most_similar(target_ticker, stocks_features, top_k=5, exclude_tickers=N
     Returns:
         list of (ticker, similarity_score) tuples
     """
-    if target_ticker not in stocks_features:
-        return []
-
-    if exclude_tickers is None:
-        exclude_tickers = []
-
-    target_features = stocks_features[target_ticker]
-    similarities = []
-
-    for ticker, features in stocks_features.items():
-        # 자기 자신과 제외 목록은 스킵
-        if ticker == target_ticker or ticker in exclude_tickers:
-            continue
-
-        sim = weighted_similarity(target_features, features)
-        similarities.append((ticker, sim))
-
-    # 유사도 높은 순으로 정렬
-    similarities.sort(key=lambda x: x[1], reverse=True)
-
-    return similarities[:top_k]
+    return _rank_against(target_ticker, stocks_features, top_k, exclude_tickers, diverse=False)
 
 
 def find_most_diverse(target_ticker, stocks_features, top_k=5, exclude_tickers=None):
@@ -262,27 +348,7 @@ def find_most_diverse(target_ticker, stocks_features, top_k=5, exclude_tickers=N
     특정 종목과 가장 다양한 (상관관계 낮은) 종목들을 찾기
     포트폴리오 다양화에 유용
     """
-    if target_ticker not in stocks_features:
-        return []
-
-    if exclude_tickers is None:
-        exclude_tickers = []
-
-    target_features = stocks_features[target_ticker]
-    diversities = []
-
-    for ticker, features in stocks_features.items():
-        if ticker == target_ticker or ticker in exclude_tickers:
-            continue
-
-        sim = weighted_similarity(target_features, features)
-        diversity = 1.0 - sim  # 유사도의 역
-        diversities.append((ticker, diversity))
-
-    # 다양성 높은 순으로 정렬
-    diversities.sort(key=lambda x: x[1], reverse=True)
-
-    return diversities[:top_k]
+    return _rank_against(target_ticker, stocks_features, top_k, exclude_tickers, diverse=True)
 
 
 def portfolio_diversity_score(portfolio_features_list):
@@ -296,21 +362,12 @@ def portfolio_diversity_score(portfolio_features_list):
     if n < 2:
         return 1.0
 
-    total_diversity = 0
-    count = 0
-
-    for i in range(n):
-        for j in range(i + 1, n):
-            sim = weighted_similarity(
-                portfolio_features_list[i],
-                portfolio_features_list[j]
-            )
-            diversity = 1.0 - sim
-            total_diversity += diversity
-            count += 1
-
-    avg_diversity = total_diversity / count if count > 0 else 1.0
-    return float(avg_diversity)
+    _, matrix, sector_codes, type_codes = feature_arrays(dict(enumerate(portfolio_features_list)))
+    similarity = weighted_similarity_matrix(matrix, sector_codes, type_codes)
+
+    # 상삼각 (i < j) 쌍의 평균 비유사도
+    upper = np.triu_indices(n, k=1)
+    return float((1.0 - similarity[upper]).mean())
 
 
 def test_similarity():
@@ -2,21 +2,26 @@
 export const extendedStocks = {
   // 추가 대형 우량주
   bluechip: [
-    { ticker: '000270', name: '기아', sector: 'consumer', description: '현대차그룹 자동차 제조' },
+    { ticker: '000270', name: '기아', sector: 'consumer', dividendYield: 2.8, per: 10.5, roe: 7.8, description: '현대차그룹 자동차 제조' },
     { ticker: '051910', name: 'LG화학', sector: 'energy', description: '배터리 및 화학 소재' },
     { ticker: '068270', name: '셀트리온', sector: 'healthcare', description: '바이오시밀러 선도' },
-    { ticker: '096770', name: 'SK이노베이션', sector: 'energy', description: '배터리 및 석유화학' },
+    { ticker: '096770', name: 'SK이노베이션', sector: 'energy', dividendYield: 0.2, per: 42.8, roe: 20.1, description: '배터리 및 석유화학' },
     { ticker: '003550', name: 'LG', sector: 'tech', description: 'LG그룹 지주사' },
     { ticker: '000810', name: '삼성화재', sector: 'finance', description: '손해보험 1위' },
     { ticker: '018260', name: '삼성에스디에스', sector: 'tech', description: 'IT서비스 및 솔루션' },
-    { ticker: '028260', name: '삼성물산', sector: 'industrial', description: '종합상사 및 건설' },
-    { ticker: '009150', name: '삼성전기', sector: 'tech', description: '전자부품 제조' },
+    { ticker: '028260', name: '삼성물산', sector: 'industrial', dividendYield: 0.1, per: 52.5, roe: 28.5, description: '종합상사 및 건설' },
+    { ticker: '009150', name: '삼성전기', sector: 'tech', dividendYield: 3.8, per: 6.8, roe: 9.5, description: '전자부품 제조' },
     { ticker: '003670', name: '포스코홀딩스', sector: 'materials', description: '철강 및 소재' },
     { ticker: '010140', name: '삼성중공업', sector: 'industrial', description: '조선 및 해양플랜트' },
     { ticker: '034020', name: '두산에너빌리티', sector: 'energy', description: '발전설비 제조' },
     { ticker: '011200', name: 'HMM', sector: 'industrial', description: '해운 및 물류' },
     { ticker: '047810', name: '한국항공우주', sector: 'industrial', description: '항공우주 방산' },
     { ticker: '012450', name: '한화에어로스페이스', sector: 'industrial', description: '항공우주 방산' },
+    { ticker: '034730', name: 'SK', sector: 'materials', dividendYield: 3.2, per: 8.8, roe: 8.2, description: 'SK그룹 지주사' },
+    { ticker: '011070', name: 'LG이노텍', sector: 'energy', dividendYield: 4.2, per: 7.5, roe: 9.5, description: '카메라 모듈 및 전자부품' },
+    { ticker: '001040', name: 'CJ', sector: 'materials', type: 'midcap', dividendYield: 2.2, per: 12.5, roe: 8.5, description: 'CJ그룹 지주사' },
+    { ticker: '004020', name: '현대제철', sector: 'industrial', type: 'midcap', dividendYield: 2.5, per: 11.2, roe: 7.8, description: '철강 제조' },
+    { ticker: '010620', name: '현대미포조선', sector: 'materials', type: 'midcap', dividendYield: 2.8, per: 10.5, roe: 8.2, description: '중형 선박 건조' },
   ],
 
   // IT/기술주
@@ -95,12 +100,12 @@ export const extendedStocks = {
     { ticker: '069500', name: 'KODEX 200', sector: 'etf', description: 'KOSPI 200 추종' },
     { ticker: '360750', name: 'TIGER 미국S&P500', sector: 'etf', description: 'S&P 500 추종' },
     { ticker: '148070', name: 'KOSEF 국고채10년', sector: 'etf', description: '국고채 ETF' },
-    { ticker: '102110', name: 'TIGER 200', sector: 'etf', description: 'KOSPI 200' },
+    { ticker: '102110', name: 'TIGER 200', sector: 'etf', dividendYield: 1.7, description: 'KOSPI 200' },
     { ticker: '114800', name: 'KODEX 인버스', sector: 'etf', description: 'KOSPI 200 인버스' },
     { ticker: '122630', name: 'KODEX 레버리지', sector: 'etf', description: 'KOSPI 200 레버리지' },
     { ticker: '229200', name: 'KODEX 코스닥150', sector: 'etf', description: '코스닥 150' },
-    { ticker: '091160', name: 'KODEX 반도체', sector: 'etf', description: '반도체 테마' },
-    { ticker: '091180', name: 'KODEX 자동차', sector: 'etf', description: '자동차 테마' },
+    { ticker: '091160', name: 'KODEX 반도체', sector: 'etf', dividendYield: 0.5, description: '반도체 테마' },
+    { ticker: '091180', name: 'KODEX 자동차', sector: 'etf', dividendYield: 1.2, description: '자동차 테마' },
     { ticker: '091170', name: 'KODEX 은행', sector: 'etf', description: '은행 테마' },
   ]
 };
@@ -168,6 +168,7 @@ export const stocks = {
       ticker: '035420',
       name: 'NAVER',
       sector: 'tech',
+      dividendYield: 0.3,
       per: 28.3,
       roe: 11.2,
       type: 'largeCap',
@@ -177,6 +178,7 @@ export const stocks = {
       ticker: '005380',
       name: '현대차',
       sector: 'consumer',
+      dividendYield: 3.1,
       per: 7.8,
       roe: 9.5,
       type: 'largeCap',
@@ -186,6 +188,7 @@ export const stocks = {
       ticker: '051910',
       name: 'LG화학',
       sector: 'energy',
+      dividendYield: 0.2,
       per: 15.2,
       roe: 7.8,
       type: 'largeCap',
@@ -195,6 +198,7 @@ export const stocks = {
       ticker: '006400',
       name: '삼성SDI',
       sector: 'energy',
+      dividendYield: 0.5,
       per: 18.5,
       roe: 6.5,
       type: 'largeCap',
@@ -208,6 +212,7 @@ export const stocks = {
       ticker: '035720',
       name: '카카오',
       sector: 'tech',
+      dividendYield: 0.4,
       per: 45.2,
       roe: 5.3,
       type: 'growth',
@@ -226,6 +231,7 @@ export const stocks = {
       ticker: '207940',
       name: '삼성바이오로직스',
       sector: 'healthcare',
+      dividendYield: 0.3,
       per: 52.8,
       roe: 8.9,
       type: 'growth',
@@ -235,6 +241,7 @@ export const stocks = {
       ticker: '068270',
       name: '셀트리온',
       sector: 'healthcare',
+      dividendYield: 0.8,
       per: 38.5,
       roe: 14.2,
       type: 'growth',
@@ -266,6 +273,7 @@ export const stocks = {
       ticker: '069500',
       name: 'KODEX 200',
       sector: 'etf',
+      dividendYield: 1.8,
       type: 'etf',
       description: 'KOSPI 200 추종 ETF'
     },
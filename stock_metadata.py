@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목 메타데이터 저장소
+data/stock_metadata.json (build_stock_metadata.py로 생성)을 처음 조회할 때 한 번 읽어
+종목 코드, 섹터, 유형별 인덱스를 만듭니다. 프론트엔드 stockData.js와 같은 원본에서 생성합니다.
+"""
+
+import json
+import os
+import threading
+
+
+STOCK_METADATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'stock_metadata.json')
+
+
+class StockMetadata:
+    def __init__(self, path=STOCK_METADATA_FILE):
+        """
+        Args:
+            path: 메타데이터 JSON 파일 경로
+        """
+        self.path = path
+        self._stocks = None
+        self._by_sector = None
+        self._by_type = None
+        self._by_market = None
+        self.built_at = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """파일 로드 및 인덱스 생성 (처음 접근 시 한 번)"""
+        if self._stocks is not None:
+            return self._stocks
+
+        with self._lock:
+            if self._stocks is not None:
+                return self._stocks
+
+            stocks = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                stocks = data.get('stocks', {})
+                self.built_at = data.get('built_at')
+                print(f'[INFO] 종목 메타데이터 로드: {len(stocks)}개 종목 ({self.built_at})')
+            except Exception as e:
+                print(f'[경고] 종목 메타데이터 로드 실패: {e}')
+
+            by_sector, by_type, by_market = {}, {}, {}
+            for ticker, meta in stocks.items():
+                by_sector.setdefault(meta.get('sector'), []).append(ticker)
+                by_type.setdefault(meta.get('type'), []).append(ticker)
+                by_market.setdefault(meta.get('market'), []).append(ticker)
+
+            self._by_sector, self._by_type, self._by_market = by_sector, by_type, by_market
+            self._stocks = stocks
+            return stocks
+
+    def reload(self):
+        """파일을 다시 읽음 (메타데이터 재생성 후)"""
+        with self._lock:
+            self._stocks = None
+        self._load()
+
+    def get(self, ticker, default=None):
+        """종목 메타데이터 (없으면 default)"""
+        return self._load().get(ticker, default)
+
+    def __contains__(self, ticker):
+        return ticker in self._load()
+
+    def __len__(self):
+        return len(self._load())
+
+    def keys(self):
+        return self._load().keys()
+
+    def name(self, ticker):
+        """종목명 (없으면 종목 코드)"""
+        return self._load().get(ticker, {}).get('name', ticker)
+
+    def tickers(self, sector=None, stock_type=None, market=None):
+        """
+        조건에 맞는 종목 코드 리스트 (조건을 주지 않으면 전체)
+
+        Args:
+            sector: 섹터 ('tech', 'finance', ...)
+            stock_type: 유형 ('dividend', 'growth', 'largecap', 'midcap', 'etf')
+            market: 시장 ('KOSPI', 'KOSDAQ', 'ETF')
+        """
+        stocks = self._load()
+        candidates = None
+        for index, key in ((self._by_sector, sector), (self._by_type, stock_type), (self._by_market, market)):
+            if key is None:
+                continue
+            matched = index.get(key, [])
+            if candidates is None:
+                candidates = matched
+            else:
+                matched = set(matched)
+                candidates = [t for t in candidates if t in matched]
+
+        return list(stocks.keys()) if candidates is None else list(candidates)
+
+    def sectors(self):
+        """섹터별 종목 수"""
+        self._load()
+        return {sector: len(tickers) for sector, tickers in self._by_sector.items()}
+
+
+# 프로세스 전역 공유 메타데이터
+default_metadata = StockMetadata()
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스트리밍 기술적 지표 모듈
+지표 상태(EMA, RSI, MACD, 이동 평균/표준편차, 모멘텀)를 객체로 유지하여
+새 거래일 가격 하나로 O(1) 갱신하고, 상태를 JSON 파일로 저장/복원합니다.
+값은 technical_indicators.get_all_technical_indicators와 같은 정의를 따릅니다.
+"""
+
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+
+
+INDICATOR_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indicator_state.json')
+STATE_VERSION = 2
+
+# 자동 저장 최소 간격 (초)
+AUTOSAVE_INTERVAL = 60
+
+
+class RollingWindowState:
+    """고정 길이 링 버퍼 + 누적 합/제곱합 (이동 평균, 모표준편차)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.buffer = [0.0] * period
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, x):
+        x = float(x)
+        old = self.buffer[self.pos]
+        self.buffer[self.pos] = x
+        self.pos = (self.pos + 1) % self.period
+
+        if self.count < self.period:
+            self.count += 1
+            self.total += x
+            self.total_sq += x * x
+        elif self.pos == 0:
+            # 버퍼가 한 바퀴 돌 때마다 누적 오차 제거 (분할 상환 O(1))
+            self.total = float(np.sum(self.buffer))
+            self.total_sq = float(np.dot(self.buffer, self.buffer))
+        else:
+            self.total += x - old
+            self.total_sq += x * x - old * old
+
+    @property
+    def ready(self):
+        return self.count >= self.period
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self):
+        if not self.count:
+            return None
+        mean = self.mean
+        return float(np.sqrt(max(self.total_sq / self.count - mean * mean, 0.0)))
+
+    def oldest(self):
+        """버퍼에서 가장 오래된 값 (가득 찬 경우)"""
+        return self.buffer[self.pos] if self.ready else self.buffer[0]
+
+    def to_dict(self):
+        return {
+            'period': self.period, 'buffer': self.buffer, 'pos': self.pos,
+            'count': self.count, 'total': self.total, 'total_sq': self.total_sq
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(data['period'])
+        state.buffer = [float(v) for v in data['buffer']]
+        state.pos = data['pos']
+        state.count = data['count']
+        state.total = data['total']
+        state.total_sq = data['total_sq']
+        return state
+
+
+class EMAState:
+    """지수 이동평균 (ewm(span=period, adjust=False)와 동일)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+        self.count = 0
+
+    def update(self, x):
+        x = float(x)
+        self.value = x if self.value is None else self.alpha * x + (1 - self.alpha) * self.value
+        self.count += 1
+        return self.value
+
+    def to_dict(self):
+        return {'period': self.period, 'value': self.value, 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(data['period'])
+        state.value = data['value']
+        state.count = data['count']
+        return state
+
+
+class RSIState:
+    """
+    RSI 상태
+
+    method='simple': 최근 N개 상승/하락폭의 단순 평균 (calculate_rsi와 동일)
+    method='wilder': 와일더 평활 (첫 N개는 단순 평균, 이후 (이전 × (N - 1) + 현재) / N)
+    """
+
+    def __init__(self, period=14, method='simple'):
+        if method not in ('simple', 'wilder'):
+            raise ValueError(f"Unknown RSI method: {method}")
+        self.period = period
+        self.method = method
+        self.last_price = None
+        self.gains = RollingWindowState(period)
+        self.losses = RollingWindowState(period)
+        self.avg_gain = None
+        self.avg_loss = None
+
+    def update(self, price):
+        price = float(price)
+        if self.last_price is not None:
+            delta = price - self.last_price
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+
+            if self.method == 'wilder' and self.gains.ready:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+            else:
+                self.gains.update(gain)
+                self.losses.update(loss)
+                if self.gains.ready:
+                    self.avg_gain = self.gains.mean
+                    self.avg_loss = self.losses.mean
+        self.last_price = price
+        return self.value
+
+    @property
+    def value(self):
+        if self.avg_gain is None:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+    def to_dict(self):
+        return {
+            'period': self.period, 'method': self.method, 'last_price': self.last_price,
+            'gains': self.gains.to_dict(), 'losses': self.losses.to_dict(),
+            'avg_gain': self.avg_gain, 'avg_loss': self.avg_loss
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(data['period'], data['method'])
+        state.last_price = data['last_price']
+        state.gains = RollingWindowState.from_dict(data['gains'])
+        state.losses = RollingWindowState.from_dict(data['losses'])
+        state.avg_gain = data['avg_gain']
+        state.avg_loss = data['avg_loss']
+        return state
+
+
+class MACDState:
+    """MACD (빠른/느린 EMA 차이와 시그널 EMA)"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+
+    def update(self, price):
+        macd = self.fast.update(price) - self.slow.update(price)
+        self.signal.update(macd)
+        return self.value
+
+    @property
+    def value(self):
+        """(macd_line, signal_line, histogram), 데이터 부족 시 None"""
+        if self.slow.count < self.slow.period + self.signal.period:
+            return None, None, None
+        macd = self.fast.value - self.slow.value
+        return macd, self.signal.value, macd - self.signal.value
+
+    def to_dict(self):
+        return {'fast': self.fast.to_dict(), 'slow': self.slow.to_dict(), 'signal': self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        state.fast = EMAState.from_dict(data['fast'])
+        state.slow = EMAState.from_dict(data['slow'])
+        state.signal = EMAState.from_dict(data['signal'])
+        return state
+
+
+class MomentumState:
+    """모멘텀 (현재 가격 / N일 전 가격), 최근 N + 1개 가격 유지"""
+
+    def __init__(self, period=10):
+        self.period = period
+        self.window = RollingWindowState(period + 1)
+        self.last_price = None
+
+    def update(self, price):
+        self.window.update(price)
+        self.last_price = float(price)
+        return self.value
+
+    @property
+    def value(self):
+        if not self.window.ready:
+            return None
+        return self.last_price / self.window.oldest()
+
+    def to_dict(self):
+        return {'period': self.period, 'window': self.window.to_dict(), 'last_price': self.last_price}
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(data['period'])
+        state.window = RollingWindowState.from_dict(data['window'])
+        state.last_price = data['last_price']
+        return state
+
+
+class TechnicalIndicatorState:
+    """종목 하나의 전체 기술적 지표 상태 (get_all_technical_indicators와 같은 키)"""
+
+    def __init__(self):
+        self.sma_20 = RollingWindowState(20)   # 볼린저 밴드와 공유
+        self.sma_60 = RollingWindowState(60)
+        self.ema_20 = EMAState(20)
+        self.rsi_14 = RSIState(14)
+        self.momentum_10 = MomentumState(10)
+        self.volatility_20 = RollingWindowState(20)  # 일간 수익률
+        self.macd = MACDState()
+        self.last_price = None
+        self.last_date = None
+        # 마지막 봉이 잠정값(장중 가격일 수 있음)이면 그 봉을 반영하기 전 상태
+        self.previous = None
+
+    def update(self, price, date=None, provisional=False):
+        """
+        새 거래일 종가 하나 반영 (O(1))
+
+        Args:
+            provisional: True면 반영 전 상태를 보관 (같은 날 가격이 다시 오면 되돌린 뒤 교체)
+        """
+        self.previous = None
+        if provisional:
+            self.previous = copy.deepcopy(self)
+
+        price = float(price)
+        if self.last_price is not None:
+            self.volatility_20.update(price / self.last_price - 1)
+
+        self.sma_20.update(price)
+        self.sma_60.update(price)
+        self.ema_20.update(price)
+        self.rsi_14.update(price)
+        self.momentum_10.update(price)
+        self.macd.update(price)
+
+        self.last_price = price
+        if date is not None:
+            self.last_date = date
+
+    @classmethod
+    def from_prices(cls, prices, dates=None):
+        """과거 가격으로 상태 초기화 (마지막 봉은 잠정값으로 반영)"""
+        state = cls()
+        dates = dates if dates is not None else [None] * len(prices)
+        for i, (price, date) in enumerate(zip(prices, dates)):
+            state.update(price, date, provisional=(i == len(prices) - 1))
+        return state
+
+    def indicators(self):
+        """현재 지표 값 (데이터 부족 시 calculate_* 함수와 같은 기본값)"""
+        price = self.last_price
+        momentum = self.momentum_10.value
+        rsi = self.rsi_14.value
+
+        if self.sma_20.ready:
+            middle = self.sma_20.mean
+            std = self.sma_20.std
+            bb_upper, bb_middle, bb_lower = middle + 2 * std, middle, middle - 2 * std
+        else:
+            bb_upper = bb_middle = bb_lower = None
+
+        macd, signal, histogram = self.macd.value
+
+        if bb_upper and bb_lower and bb_upper != bb_lower:
+            bb_position = (price - bb_lower) / (bb_upper - bb_lower)
+        else:
+            bb_position = 0.5
+
+        return {
+            'sma_20': bb_middle,
+            'sma_60': self.sma_60.mean if self.sma_60.ready else None,
+            'ema_20': self.ema_20.value if self.ema_20.count >= 20 else None,
+            'rsi_14': rsi if rsi is not None else 50,
+            'momentum_10': momentum if momentum is not None else 1.0,
+            'volatility_20': self.volatility_20.std * np.sqrt(252) if self.volatility_20.ready else None,
+            'price_roc_10': (momentum - 1) * 100 if momentum is not None else 0.0,
+            'bollinger_upper': bb_upper,
+            'bollinger_middle': bb_middle,
+            'bollinger_lower': bb_lower,
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': histogram,
+            'bb_position': bb_position
+        }
+
+    def to_dict(self):
+        return {
+            'sma_20': self.sma_20.to_dict(),
+            'sma_60': self.sma_60.to_dict(),
+            'ema_20': self.ema_20.to_dict(),
+            'rsi_14': self.rsi_14.to_dict(),
+            'momentum_10': self.momentum_10.to_dict(),
+            'volatility_20': self.volatility_20.to_dict(),
+            'macd': self.macd.to_dict(),
+            'last_price': self.last_price,
+            'last_date': self.last_date,
+            'previous': self.previous.to_dict() if self.previous is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        state.sma_20 = RollingWindowState.from_dict(data['sma_20'])
+        state.sma_60 = RollingWindowState.from_dict(data['sma_60'])
+        state.ema_20 = EMAState.from_dict(data['ema_20'])
+        state.rsi_14 = RSIState.from_dict(data['rsi_14'])
+        state.momentum_10 = MomentumState.from_dict(data['momentum_10'])
+        state.volatility_20 = RollingWindowState.from_dict(data['volatility_20'])
+        state.macd = MACDState.from_dict(data['macd'])
+        state.last_price = data['last_price']
+        state.last_date = data['last_date']
+        if data.get('previous') is not None:
+            state.previous = cls.from_dict(data['previous'])
+        return state
+
+
+class IndicatorStateStore:
+    def __init__(self, path=INDICATOR_STATE_FILE):
+        """
+        종목별 지표 상태 저장소 (JSON 파일 스냅샷)
+
+        Args:
+            path: 상태 파일 경로
+        """
+        self.path = path
+        self.states = None
+        self._dirty = False
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """상태 파일 로드 (처음 접근 시 한 번)"""
+        if self.states is not None:
+            return
+        self.states = {}
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == STATE_VERSION:
+                    self.states = {
+                        ticker: TechnicalIndicatorState.from_dict(state)
+                        for ticker, state in data['states'].items()
+                    }
+                print(f'[INFO] 지표 상태 로드: {len(self.states)}개 종목')
+        except Exception as e:
+            print(f'[경고] 지표 상태 파일 로드 실패: {e}')
+            self.states = {}
+
+    def update_from_history(self, ticker, dates, prices):
+        """
+        과거 가격으로 종목 상태 갱신 후 현재 지표 반환
+
+        저장된 상태의 마지막 날짜 이후 거래일만 반영하고, 상태가 없거나
+        마지막 날짜가 주어진 기간에 없으면 전체 기간으로 다시 만듭니다.
+        마지막 봉은 잠정값으로 반영하여, 장중에 가져온 가격이 이후 다시 조회되면
+        (같은 날 또는 다음 날 확정 종가) 그 봉만 되돌린 뒤 다시 반영합니다.
+
+        Args:
+            dates: 'YYYYMMDD' 문자열 리스트 (oldest to newest)
+            prices: 종가 리스트
+        """
+        with self._lock:
+            self._load()
+            state = self.states.get(ticker)
+            last_bar = (state.last_date, state.last_price) if state is not None else None
+
+            # 잠정 봉이 다시 조회되었으면 반영 전 상태로 되돌려 다시 반영
+            if state is not None and state.previous is not None and state.last_date in dates:
+                state = state.previous
+
+            if state is not None and state.last_date in dates:
+                start = dates.index(state.last_date) + 1
+                for i in range(start, len(dates)):
+                    state.update(prices[i], dates[i], provisional=(i == len(dates) - 1))
+                self.states[ticker] = state
+                changed = (state.last_date, state.last_price) != last_bar or start < len(dates) - 1
+            else:
+                state = TechnicalIndicatorState.from_prices(prices, dates)
+                self.states[ticker] = state
+                changed = True
+
+            self._dirty = self._dirty or changed
+            indicators = state.indicators()
+
+        self.maybe_save()
+        return indicators
+
+    def maybe_save(self):
+        """변경 사항이 있고 마지막 저장 후 AUTOSAVE_INTERVAL이 지났으면 저장"""
+        if self._dirty and time.time() - self._last_save >= AUTOSAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        """상태 스냅샷을 파일로 저장 (같은 디렉터리의 고유 임시 파일에 쓴 뒤 교체 - 워커 동시 저장 대비)"""
+        with self._lock:
+            if self.states is None:
+                return
+            data = {
+                'version': STATE_VERSION,
+                'states': {ticker: state.to_dict() for ticker, state in self.states.items()}
+            }
+            tmp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                                 suffix='.tmp', delete=False) as f:
+                    tmp_path = f.name
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+                self._last_save = time.time()
+            except Exception as e:
+                print(f'[경고] 지표 상태 저장 실패: {e}')
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
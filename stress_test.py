@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+과거 위기 구간 스트레스 테스트
+이름 붙은 과거 하락 구간(2008 금융위기, 2020 코로나, 2022 금리 인상)을
+여러 비중 벡터에 한 번에 적용하여 구간 손실과 이후 회복 통계를 계산합니다.
+가격은 전체 구간을 한 번만 조회하고, 포트폴리오 가치는 (날짜, 종목) @ (종목, 포트폴리오)
+행렬 곱으로 계산합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from price_store import default_store
+from benchmarks import DEFAULT_BENCHMARK
+
+
+# 시나리오 ID -> 이름, 구간 (YYYYMMDD)
+STRESS_SCENARIOS = {
+    'gfc_2008': {'name': '2008 글로벌 금융위기', 'start': '20080516', 'end': '20081024'},
+    'covid_2020': {'name': '2020 코로나19 급락', 'start': '20200122', 'end': '20200319'},
+    'rate_hike_2022': {'name': '2022 금리 인상 약세장', 'start': '20220103', 'end': '20220930'},
+}
+
+
+def scenario_statistics(prices, weight_matrix, end_index):
+    """
+    한 시나리오의 포트폴리오별 손실/회복 통계 (매수 후 보유)
+
+    Args:
+        prices: (날짜, 종목) 시나리오 시작일부터 최근까지의 가격 (결측 없음)
+        weight_matrix: (포트폴리오, 종목) 비중
+        end_index: 시나리오 종료일의 행 인덱스
+
+    Returns:
+        dict of (포트폴리오,) 배열
+        {'scenario_return', 'max_drawdown', 'trough_index', 'recovery_index'(-1이면 미회복)}
+    """
+    values = (prices / prices[0]) @ weight_matrix.T  # (날짜, 포트폴리오), 시작일 = 1
+    window = values[:end_index + 1]
+
+    drawdown = window / np.maximum.accumulate(window, axis=0) - 1
+    trough_index = window.argmin(axis=0)
+
+    # 저점 이후 시작일 가치(1.0)를 처음 회복한 날
+    after_trough = np.arange(len(values))[:, None] > trough_index
+    recovered = (values >= 1.0) & after_trough
+    recovery_index = np.where(recovered.any(axis=0), recovered.argmax(axis=0), -1)
+
+    return {
+        'scenario_return': window[-1] - 1,
+        'max_drawdown': drawdown.min(axis=0),
+        'trough_index': trough_index,
+        'recovery_index': recovery_index
+    }
+
+
+class StressTester:
+    def __init__(self, tickers, scenarios=None, benchmark_ticker=DEFAULT_BENCHMARK):
+        """
+        스트레스 테스트
+
+        Args:
+            tickers: 종목 코드 리스트
+            scenarios: {id: {'name', 'start', 'end'}} (기본: STRESS_SCENARIOS)
+            benchmark_ticker: 시나리오별 비교 지수
+        """
+        self.tickers = tickers
+        self.scenarios = scenarios or STRESS_SCENARIOS
+        self.benchmark_ticker = benchmark_ticker
+        self.prices_df = None
+
+    def fetch_prices(self):
+        """가장 이른 시나리오 시작일부터 오늘까지 종목 + 벤치마크 가격 (한 번만 조회)"""
+        start_date = min(s['start'] for s in self.scenarios.values())
+        end_date = datetime.now().strftime('%Y%m%d')
+
+        tickers = list(dict.fromkeys(self.tickers + [self.benchmark_ticker]))
+        self.prices_df = default_store.get_close_prices(tickers, start_date, end_date)
+        if self.prices_df.empty:
+            raise ValueError("No price data available")
+        return self.prices_df
+
+    def run(self, weight_matrix):
+        """
+        모든 시나리오를 모든 포트폴리오에 적용
+
+        Args:
+            weight_matrix: (포트폴리오, 종목) 비중 (tickers 순서)
+
+        Returns:
+            {'scenarios': [{
+                'id', 'name', 'start', 'end', 'trading_days', 'benchmark_return',
+                'missing_tickers',  # 시나리오 시작 시 가격이 없는 종목
+                'results': [{'available', 'scenario_return', 'max_drawdown', 'trough_date',
+                             'recovery_date', 'days_to_recover'}]  # 포트폴리오 순서
+            }]}
+            수익률/낙폭은 %, 회복 기간은 시나리오 시작일부터 거래일
+        """
+        if self.prices_df is None:
+            self.fetch_prices()
+
+        weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+        prices_df = self.prices_df.ffill()
+
+        summaries = []
+        for scenario_id, scenario in self.scenarios.items():
+            segment = prices_df.loc[pd.Timestamp(scenario['start']):]
+            end_index = int(np.searchsorted(segment.index, pd.Timestamp(scenario['end']), side='right')) - 1
+
+            summary = {
+                'id': scenario_id,
+                'name': scenario['name'],
+                'start': scenario['start'],
+                'end': scenario['end'],
+                'trading_days': max(end_index + 1, 0),
+                'benchmark_return': None,
+                'missing_tickers': list(self.tickers),
+                'results': [{'available': False} for _ in weight_matrix]
+            }
+            summaries.append(summary)
+            if end_index < 1:
+                continue
+
+            if self.benchmark_ticker in segment.columns and not np.isnan(segment[self.benchmark_ticker].iloc[0]):
+                bench = segment[self.benchmark_ticker].values
+                summary['benchmark_return'] = float((bench[end_index] / bench[0] - 1) * 100)
+
+            # 시나리오 시작일에 가격이 있는 종목만 사용, 없는 종목에 비중이 있으면 계산 불가
+            columns = [t for t in self.tickers if t in segment.columns and not np.isnan(segment[t].iloc[0])]
+            summary['missing_tickers'] = [t for t in self.tickers if t not in columns]
+            if not columns:
+                continue
+
+            column_index = [self.tickers.index(t) for t in columns]
+            weights = weight_matrix[:, column_index]
+            covered = weights.sum(axis=1)
+            available = np.isclose(covered, weight_matrix.sum(axis=1)) & (covered > 0)
+            if not available.any():
+                continue
+
+            weights = weights[available] / covered[available, None]
+            stats = scenario_statistics(segment[columns].values, weights, end_index)
+            dates = segment.index.strftime('%Y-%m-%d')
+
+            for row, j in enumerate(np.flatnonzero(available)):
+                recovery = int(stats['recovery_index'][row])
+                summary['results'][j] = {
+                    'available': True,
+                    'scenario_return': float(stats['scenario_return'][row] * 100),
+                    'max_drawdown': float(stats['max_drawdown'][row] * 100),
+                    'trough_date': dates[stats['trough_index'][row]],
+                    'recovery_date': dates[recovery] if recovery >= 0 else None,
+                    'days_to_recover': recovery if recovery >= 0 else None
+                }
+
+        return {'scenarios': summaries}
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+꼬리 위험(VaR/CVaR) 계산 모듈
+여러 포트폴리오(비중 벡터)에 대해 신뢰수준/보유기간별 VaR, CVaR을 계산합니다.
+- historical: 과거 수익률의 경험적 분위수 (겹치는 기간 수익률)
+- parametric: 정규분포 가정
+- monte_carlo: 다변량 정규분포 시뮬레이션
+분위수는 전체 정렬 대신 np.partition으로 선택합니다.
+"""
+
+import numpy as np
+from datetime import datetime, timedelta
+from scipy.stats import norm
+from price_store import default_store
+from monte_carlo import CHUNK_MAX_ELEMENTS, _cholesky
+
+
+VAR_METHODS = ('historical', 'parametric', 'monte_carlo')
+DEFAULT_CONFIDENCE_LEVELS = (0.95, 0.99)
+DEFAULT_HORIZONS = (1, 10)
+
+
+def horizon_returns(portfolio_returns, horizon):
+    """
+    겹치는 보유기간 누적 수익률
+
+    Args:
+        portfolio_returns: (날짜, 포트폴리오) 일간 수익률
+        horizon: 보유기간 (거래일)
+
+    Returns:
+        (날짜 - horizon + 1, 포트폴리오) 수익률
+    """
+    growth = np.vstack([
+        np.ones((1, portfolio_returns.shape[1])),
+        np.cumprod(1 + portfolio_returns, axis=0)
+    ])
+    return growth[horizon:] / growth[:-horizon] - 1
+
+
+def empirical_var_cvar(samples, confidence_levels):
+    """
+    표본 수익률의 경험적 VaR/CVaR
+
+    Args:
+        samples: (표본, 포트폴리오) 수익률
+        confidence_levels: 신뢰수준 목록 (예: [0.95, 0.99])
+
+    Returns:
+        (var, cvar) - 각각 (신뢰수준, 포트폴리오), 손실을 양수로 표시
+    """
+    num_samples = len(samples)
+    kth = [min(int(np.floor((1 - c) * num_samples)), num_samples - 1) for c in confidence_levels]
+    partitioned = np.partition(samples, sorted(set(kth)), axis=0)
+
+    var = np.array([-partitioned[k] for k in kth])
+    cvar = np.array([-partitioned[:k + 1].mean(axis=0) for k in kth])
+    return var, cvar
+
+
+def parametric_var_cvar(portfolio_returns, confidence_levels, horizon):
+    """정규분포 가정 VaR/CVaR ((신뢰수준, 포트폴리오), 손실을 양수로 표시)"""
+    mean = portfolio_returns.mean(axis=0) * horizon
+    std = portfolio_returns.std(axis=0, ddof=1) * np.sqrt(horizon)
+
+    levels = np.asarray(confidence_levels, dtype=float)[:, None]
+    z = norm.ppf(1 - levels)
+    var = -(mean + z * std)
+    cvar = -(mean - std * norm.pdf(z) / (1 - levels))
+    return var, cvar
+
+
+def simulate_horizon_returns(asset_returns, weight_matrix, horizons, n_paths=10000, seed=None):
+    """
+    다변량 정규분포로 보유기간 수익률 시뮬레이션 (비중은 매일 유지)
+
+    Args:
+        asset_returns: (날짜, 종목) 과거 일간 수익률
+        weight_matrix: (포트폴리오, 종목) 비중
+        horizons: 보유기간 목록 (거래일)
+        n_paths: 경로 수
+        seed: 난수 시드
+
+    Returns:
+        dict {horizon: (경로, 포트폴리오) 수익률}
+    """
+    n_assets = asset_returns.shape[1]
+    max_horizon = max(horizons)
+    mean = asset_returns.mean(axis=0)
+    chol = _cholesky(np.cov(asset_returns, rowvar=False).reshape(n_assets, n_assets))
+    rng = np.random.default_rng(seed)
+
+    # 종목 수와 포트폴리오 수 중 큰 쪽 기준으로 청크 메모리 제한
+    chunk_paths = max(1, CHUNK_MAX_ELEMENTS // (max_horizon * max(n_assets, len(weight_matrix))))
+    results = {h: [] for h in horizons}
+
+    for start in range(0, n_paths, chunk_paths):
+        size = min(chunk_paths, n_paths - start)
+        z = rng.standard_normal((size, max_horizon, n_assets))
+        daily = (mean + z @ chol.T) @ weight_matrix.T  # (경로, 기간, 포트폴리오)
+        growth = np.cumprod(1 + daily, axis=1)
+        for h in horizons:
+            results[h].append(growth[:, h - 1, :] - 1)
+
+    return {h: np.concatenate(chunks) for h, chunks in results.items()}
+
+
+def tail_risk_table(asset_returns, weight_matrix, confidence_levels=DEFAULT_CONFIDENCE_LEVELS,
+                    horizons=DEFAULT_HORIZONS, methods=('historical', 'parametric'), n_paths=10000, seed=None):
+    """
+    방법/보유기간/신뢰수준별 VaR, CVaR 일괄 계산
+
+    Returns:
+        dict {method: {'var': (포트폴리오, 신뢰수준, 보유기간), 'cvar': 같은 모양}}
+        손실률 (양수 = 손실)
+    """
+    for method in methods:
+        if method not in VAR_METHODS:
+            raise ValueError(f"Unknown VaR method: {method}")
+
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+    portfolio_returns = asset_returns @ weight_matrix.T  # (날짜, 포트폴리오)
+
+    if max(horizons) >= len(portfolio_returns):
+        raise ValueError("Horizon is longer than the return history")
+
+    simulated = None
+    if 'monte_carlo' in methods:
+        simulated = simulate_horizon_returns(asset_returns, weight_matrix, horizons, n_paths, seed)
+
+    table = {}
+    for method in methods:
+        per_horizon = []
+        for h in horizons:
+            if method == 'historical':
+                per_horizon.append(empirical_var_cvar(horizon_returns(portfolio_returns, h), confidence_levels))
+            elif method == 'parametric':
+                per_horizon.append(parametric_var_cvar(portfolio_returns, confidence_levels, h))
+            else:
+                per_horizon.append(empirical_var_cvar(simulated[h], confidence_levels))
+
+        # (보유기간, 신뢰수준, 포트폴리오) -> (포트폴리오, 신뢰수준, 보유기간)
+        table[method] = {
+            'var': np.stack([v for v, _ in per_horizon]).transpose(2, 1, 0),
+            'cvar': np.stack([c for _, c in per_horizon]).transpose(2, 1, 0)
+        }
+
+    return table
+
+
+def format_tail_risk(table, index, confidence_levels, horizons, portfolio_value=None):
+    """
+    한 포트폴리오의 VaR/CVaR 표를 JSON 형태로 변환
+
+    Returns:
+        {method: {'1d': {'95': {'var': %, 'cvar': %[, 'var_amount', 'cvar_amount']}}}}
+    """
+    result = {}
+    for method, values in table.items():
+        result[method] = {}
+        for h_idx, h in enumerate(horizons):
+            levels = {}
+            for c_idx, c in enumerate(confidence_levels):
+                var = float(values['var'][index, c_idx, h_idx])
+                cvar = float(values['cvar'][index, c_idx, h_idx])
+                entry = {'var': var * 100, 'cvar': cvar * 100}
+                if portfolio_value is not None:
+                    entry['var_amount'] = var * portfolio_value
+                    entry['cvar_amount'] = cvar * portfolio_value
+                levels[f'{c * 100:g}'] = entry
+            result[method][f'{h}d'] = levels
+    return result
+
+
+class TailRiskAnalyzer:
+    def __init__(self, tickers, start_date=None, end_date=None):
+        """
+        여러 포트폴리오의 꼬리 위험 분석
+
+        Args:
+            tickers: 종목 코드 리스트
+            start_date: 수익률 추정 시작일 (기본: 3년 전)
+            end_date: 수익률 추정 종료일 (기본: 오늘)
+        """
+        self.tickers = tickers
+        self.end_date = end_date or datetime.now().strftime('%Y%m%d')
+        self.start_date = start_date or (datetime.now() - timedelta(days=365 * 3)).strftime('%Y%m%d')
+
+        self.columns = None
+        self.returns = None
+
+    def fetch_returns(self):
+        """과거 일간 수익률 행렬 (날짜 × 종목)"""
+        prices_df = default_store.get_close_prices(self.tickers, self.start_date, self.end_date)
+        prices_df = prices_df.ffill().dropna()
+        if len(prices_df) < 2:
+            raise ValueError("No price data available")
+
+        self.columns = list(prices_df.columns)
+        prices = prices_df.values
+        self.returns = prices[1:] / prices[:-1] - 1
+        return self.returns
+
+    def analyze(self, weight_matrix, confidence_levels=DEFAULT_CONFIDENCE_LEVELS, horizons=DEFAULT_HORIZONS,
+                methods=VAR_METHODS, n_paths=10000, seed=None, portfolio_value=None):
+        """
+        VaR/CVaR 계산
+
+        Args:
+            weight_matrix: (포트폴리오, 종목) 비중 (tickers 순서)
+            confidence_levels: 신뢰수준 목록
+            horizons: 보유기간 목록 (거래일)
+            methods: 계산 방법 목록
+            n_paths: 몬테카를로 경로 수
+            seed: 난수 시드
+            portfolio_value: 금액 환산 기준 (원)
+
+        Returns:
+            list (포트폴리오 순서) of {method: {horizon: {level: {...}}}}
+        """
+        if self.returns is None:
+            self.fetch_returns()
+
+        weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+        column_index = [self.tickers.index(t) for t in self.columns]
+        weights = weight_matrix[:, column_index]
+        weights = weights / weights.sum(axis=1, keepdims=True)
+
+        table = tail_risk_table(self.returns, weights, confidence_levels, horizons, methods, n_paths, seed)
+        return [
+            format_tail_risk(table, j, confidence_levels, horizons, portfolio_value)
+            for j in range(len(weights))
+        ]
@@ -3,12 +3,270 @@
 """
 기술적 지표 계산 모듈
 RSI, 이동평균, 모멘텀 등의 기술적 분석 지표를 계산합니다.
+최신 값만 반환하는 calculate_* 함수와 전체 기간을 반환하는 *_series 함수를 제공합니다.
 """
 
-import pandas as pd
 import numpy as np
+import indicator_kernels as kernels
 
 
+# ==================== 전체 시계열 지표 ====================
+# 모든 함수는 0번 축(시간)을 따라 계산하며 입력과 같은 길이를 반환합니다.
+# 기간이 채워지기 전 값은 NaN입니다.
+
+def sma_series(prices, period=20):
+    """단순 이동평균 시계열 (누적 합의 차)"""
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(prices.shape, np.nan)
+    if len(prices) < period:
+        return out
+
+    csum = np.cumsum(prices, axis=0)
+    out[period - 1] = csum[period - 1]
+    out[period:] = csum[period:] - csum[:-period]
+    return out / period
+
+
+def rolling_std_series(prices, period=20, mean=None):
+    """
+    이동 표준편차 시계열 (모표준편차, ddof=0)
+
+    Args:
+        mean: 이미 계산한 같은 기간의 SMA (있으면 재사용)
+    """
+    prices = np.asarray(prices, dtype=float)
+    if len(prices) < period:
+        return np.full(prices.shape, np.nan)
+
+    # 누적 합 오차를 줄이기 위해 첫 값을 기준으로 이동
+    shift = prices[0]
+    shifted = prices - shift
+    if mean is None:
+        mean = sma_series(prices, period)
+    mean_shifted = mean - shift
+    var = sma_series(shifted * shifted, period) - mean_shifted * mean_shifted
+    return np.sqrt(np.maximum(var, 0))
+
+
+def ema_series(prices, period=20):
+    """
+    지수 이동평균 시계열 (pandas ewm(span=period, adjust=False)와 동일)
+
+    EMA_t = a * P_t + (1 - a) * EMA_(t-1), EMA_0 = P_0 (indicator_kernels.ema)
+    """
+    return kernels.ema(prices, 2.0 / (period + 1))
+
+
+def rsi_series(prices, period=14):
+    """RSI 시계열 (calculate_rsi와 같은 단순 평균 방식)"""
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(prices.shape, np.nan)
+    if len(prices) < period + 1:
+        return out
+
+    deltas = np.diff(prices, axis=0)
+    avg_gain = sma_series(np.maximum(deltas, 0), period)
+    avg_loss = sma_series(np.maximum(-deltas, 0), period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    out[1:] = np.where(avg_loss == 0, 100.0, rsi)
+    out[:period] = np.nan
+    return out
+
+
+def rsi_wilder_series(prices, period=14):
+    """RSI 시계열 (와일더 평활, streaming_indicators.RSIState(method='wilder')와 동일)"""
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(prices.shape, np.nan)
+    if len(prices) < period + 1:
+        return out
+
+    deltas = np.diff(prices, axis=0)
+    avg_gain = kernels.wilder_smooth(np.maximum(deltas, 0), period)
+    avg_loss = kernels.wilder_smooth(np.maximum(-deltas, 0), period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    out[1:] = np.where(avg_loss == 0, 100.0, rsi)
+    out[:period] = np.nan
+    return out
+
+
+def macd_series(prices, fast=12, slow=26, signal=9):
+    """
+    MACD 시계열
+
+    Returns:
+        (macd_line, signal_line, histogram)
+    """
+    macd_line = ema_series(prices, fast) - ema_series(prices, slow)
+    signal_line = ema_series(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_series(prices, period=20, std_dev=2, middle=None):
+    """
+    볼린저 밴드 시계열
+
+    Args:
+        middle: 이미 계산한 같은 기간의 SMA (있으면 재사용)
+
+    Returns:
+        (upper_band, middle_band, lower_band)
+    """
+    if middle is None:
+        middle = sma_series(prices, period)
+    std = rolling_std_series(prices, period, middle)
+    return middle + std_dev * std, middle, middle - std_dev * std
+
+
+def momentum_series(prices, period=10):
+    """모멘텀 시계열 (현재 가격 / N일 전 가격)"""
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(prices.shape, np.nan)
+    out[period:] = prices[period:] / prices[:-period]
+    return out
+
+
+def roc_series(prices, period=10):
+    """가격 변화율 시계열 (%)"""
+    return (momentum_series(prices, period) - 1) * 100
+
+
+def volatility_series(prices, period=20):
+    """연율화 변동성 시계열 (최근 N개 일간 수익률의 모표준편차)"""
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(prices.shape, np.nan)
+    if len(prices) < 2:
+        return out
+    returns = np.diff(prices, axis=0) / prices[:-1]
+    out[1:] = rolling_std_series(returns, period) * np.sqrt(252)
+    return out
+
+
+# get_all_indicator_series 키별 첫 유효 값까지의 행 수 (상장일 기준)
+INDICATOR_WARMUP = {
+    'sma_20': 19,
+    'sma_60': 59,
+    'ema_20': 19,
+    'rsi_14': 14,
+    'momentum_10': 10,
+    'volatility_20': 20,
+    'price_roc_10': 10,
+    'bollinger_upper': 19,
+    'bollinger_middle': 19,
+    'bollinger_lower': 19,
+    'macd': 26 + 9 - 1,
+    'macd_signal': 26 + 9 - 1,
+    'macd_histogram': 26 + 9 - 1,
+    'bb_position': 0
+}
+
+
+def fill_price_matrix(prices):
+    """
+    (날짜, 종목) 가격 행렬의 결측 처리
+
+    거래정지 구간은 직전 가격으로, 상장 전 구간은 첫 가격으로 채워서
+    재귀/누적 합 계산이 NaN으로 오염되지 않게 합니다.
+
+    Returns:
+        (filled, first_valid) - first_valid는 종목별 첫 가격 행 (가격이 없으면 날짜 수)
+    """
+    prices = np.asarray(prices, dtype=float)
+    num_days = len(prices)
+    valid = ~np.isnan(prices)
+    first_valid = np.where(valid.any(axis=0), valid.argmax(axis=0), num_days)
+
+    # 직전 유효 행 인덱스로 forward fill
+    rows = np.where(valid, np.arange(num_days)[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(prices, rows, axis=0)
+
+    # 상장 전 구간은 첫 가격으로 backfill
+    first_price = prices[np.minimum(first_valid, num_days - 1), np.arange(prices.shape[1])]
+    before_listing = np.arange(num_days)[:, None] < first_valid
+    filled = np.where(before_listing, first_price, filled)
+    return filled, first_valid
+
+
+def get_all_indicator_series(price_data):
+    """
+    모든 기술적 지표를 전체 기간 시계열로 계산
+
+    SMA(20)은 볼린저 밴드 중심선과 공유하고, 각 지표는 한 번의 O(n) 패스로 계산합니다.
+    (날짜, 종목) 행렬을 넣으면 모든 종목을 한 번에 계산합니다. NaN(거래정지, 신규 상장)은
+    fill_price_matrix로 채운 뒤 상장일 이후 기간이 부족한 구간을 다시 NaN으로 가려서,
+    상장 이후 가격만 1차원으로 계산한 결과와 같게 만듭니다.
+
+    Args:
+        price_data: 가격 배열 (oldest to newest) 또는 (날짜, 종목) 행렬
+
+    Returns:
+        dict of 입력과 같은 모양의 배열 (get_all_technical_indicators와 같은 키)
+    """
+    prices = np.asarray(price_data, dtype=float)
+    one_dimensional = prices.ndim == 1
+    if one_dimensional:
+        prices = prices[:, None]
+
+    if np.isnan(prices).any():
+        prices, first_valid = fill_price_matrix(prices)
+    else:
+        first_valid = np.zeros(prices.shape[1], dtype=int)
+
+    sma_20 = sma_series(prices, 20)
+    bb_upper, bb_middle, bb_lower = bollinger_series(prices, 20, middle=sma_20)
+    momentum_10 = momentum_series(prices, 10)
+    macd, signal, histogram = macd_series(prices)
+
+    indicators = {
+        'sma_20': sma_20,
+        'sma_60': sma_series(prices, 60),
+        'ema_20': ema_series(prices, 20),
+        'rsi_14': rsi_series(prices, 14),
+        'momentum_10': momentum_10,
+        'volatility_20': volatility_series(prices, 20),
+        'price_roc_10': (momentum_10 - 1) * 100,
+        'bollinger_upper': bb_upper,
+        'bollinger_middle': bb_middle,
+        'bollinger_lower': bb_lower,
+        'macd': macd,
+        'macd_signal': signal,
+        'macd_histogram': histogram
+    }
+
+    # 최신 값 함수와 같이 데이터가 부족한 구간은 NaN
+    rows = np.arange(len(prices))[:, None]
+    for key, values in indicators.items():
+        values[rows < first_valid + INDICATOR_WARMUP[key]] = np.nan
+
+    # 밴드 내 위치 (밴드가 없으면 0.5, 상장 전은 NaN)
+    band_width = bb_upper - bb_lower
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bb_position = np.where(band_width > 0, (prices - bb_lower) / band_width, 0.5)
+    bb_position[rows < first_valid + INDICATOR_WARMUP['bb_position']] = np.nan
+    indicators['bb_position'] = bb_position
+
+    if one_dimensional:
+        return {key: values[:, 0] for key, values in indicators.items()}
+    return indicators
+
+
+def latest_indicator_matrix(price_matrix):
+    """
+    (날짜, 종목) 가격 행렬에서 종목별 최신 지표 값
+
+    Returns:
+        dict of (종목,) 배열 - 마지막 날 값 (데이터 부족 시 NaN)
+    """
+    indicators = get_all_indicator_series(price_matrix)
+    return {key: values[-1] for key, values in indicators.items()}
+
+
+# ==================== 최신 값 지표 ====================
+
 def calculate_sma(prices, period=20):
     """단순 이동평균 (Simple Moving Average)"""
     if len(prices) < period:
@@ -21,9 +279,7 @@ def calculate_ema(prices, period=20):
     if len(prices) < period:
         return None
 
-    df = pd.DataFrame({'price': prices})
-    ema = df['price'].ewm(span=period, adjust=False).mean()
-    return float(ema.iloc[-1])
+    return float(ema_series(prices, period)[-1])
 
 
 def calculate_rsi(prices, period=14):
@@ -88,8 +344,10 @@ def calculate_bollinger_bands(prices, period=20, std_dev=2):
     if len(prices) < period:
         return None, None, None
 
-    middle_band = calculate_sma(prices, period)
-    std = np.std(prices[-period:])
+    # 같은 구간에서 평균/표준편차를 함께 계산
+    window = np.asarray(prices[-period:], dtype=float)
+    middle_band = window.mean()
+    std = np.sqrt(np.mean((window - middle_band) ** 2))
 
     upper_band = middle_band + (std_dev * std)
     lower_band = middle_band - (std_dev * std)
@@ -105,24 +363,12 @@ def calculate_macd(prices, fast=12, slow=26, signal=9):
     if len(prices) < slow + signal:
         return None, None, None
 
-    # EMA 계산
-    df = pd.DataFrame({'price': prices})
-    ema_fast = df['price'].ewm(span=fast, adjust=False).mean()
-    ema_slow = df['price'].ewm(span=slow, adjust=False).mean()
-
-    # MACD 라인
-    macd_line = ema_fast - ema_slow
-
-    # 시그널 라인
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-
-    # 히스토그램
-    histogram = macd_line - signal_line
+    macd_line, signal_line, histogram = macd_series(prices, fast, slow, signal)
 
     return (
-        float(macd_line.iloc[-1]),
-        float(signal_line.iloc[-1]),
-        float(histogram.iloc[-1])
+        float(macd_line[-1]),
+        float(signal_line[-1]),
+        float(histogram[-1])
     )
 
 
@@ -153,8 +399,11 @@ def get_all_technical_indicators(price_data):
     # 수익률 계산
     returns = np.diff(prices) / prices[:-1]
 
+    # 볼린저 밴드 (중심선은 SMA(20)과 같으므로 재사용)
+    bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(prices, 20)
+
     indicators = {
-        'sma_20': calculate_sma(prices, 20),
+        'sma_20': bb_middle,
         'sma_60': calculate_sma(prices, 60),
         'ema_20': calculate_ema(prices, 20),
         'rsi_14': calculate_rsi(prices, 14),
@@ -163,8 +412,6 @@ def get_all_technical_indicators(price_data):
         'price_roc_10': calculate_price_rate_of_change(prices, 10),
     }
 
-    # 볼린저 밴드
-    bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(prices, 20)
     indicators['bollinger_upper'] = bb_upper
     indicators['bollinger_middle'] = bb_middle
     indicators['bollinger_lower'] = bb_lower
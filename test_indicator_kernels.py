@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지표 커널 테스트 (pytest)
+numba 커널과 numpy 구현이 같은 값을 내는지 확인합니다 (numba가 없으면 numba 비교는 건너뜀).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import indicator_kernels as kernels
+
+
+def price_matrix_with_nan(seed=0, num_days=300, num_tickers=6):
+    """상장 전(앞쪽), 거래 정지(중간), 전부 NaN 열이 섞인 가격 행렬"""
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, (num_days, num_tickers)), axis=0)
+    prices[:40, 1] = np.nan
+    prices[100:120, 2] = np.nan
+    prices[rng.random(num_days) < 0.05, 3] = np.nan
+    prices[:, 4] = np.nan
+    return prices
+
+
+def pandas_max_drawdown(prices):
+    """기존 pandas 방식 (expanding max, NaN 건너뜀)"""
+    frame = pd.DataFrame(prices)
+    drawdown = frame / frame.expanding().max() - 1
+    return drawdown.min().fillna(0.0).clip(upper=0.0).values
+
+
+def test_max_drawdown_numpy_skips_nan():
+    prices = price_matrix_with_nan()
+    result = kernels.max_drawdown(prices, backend='numpy')
+
+    assert not np.isnan(result).any()
+    assert result[4] == 0.0
+    np.testing.assert_allclose(result, pandas_max_drawdown(prices), atol=1e-12)
+
+
+@pytest.mark.skipif(not kernels.HAS_NUMBA, reason='numba 미설치')
+def test_max_drawdown_backends_match_with_nan():
+    prices = price_matrix_with_nan(seed=1)
+    np.testing.assert_allclose(
+        kernels.max_drawdown(prices, backend='numba'),
+        kernels.max_drawdown(prices, backend='numpy'),
+        atol=1e-12
+    )
+
+    # 1차원 입력 (첫 값이 NaN)
+    series = prices[:, 1]
+    assert kernels.max_drawdown(series, 'numba') == pytest.approx(kernels.max_drawdown(series, 'numpy'), abs=1e-12)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+유사도 계산 테스트 (pytest)
+행렬 경로(weighted_similarity_matrix)와 종목 쌍 경로(weighted_similarity)가 같은 값을 내는지 확인합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from feature_extractor import FeatureExtractor
+import similarity_metrics as sim
+
+
+TICKERS = ['005930', '000660', '055550', '105560', '035420', '035720', '051910', '069500']
+
+
+def build_feature_table(seed=0, days=252):
+    """메타데이터 종목 + 합성 가격으로 만든 실제 특징 테이블 (extract_universe_features)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-01-02', periods=days)
+    market = rng.normal(0.0003, 0.01, days - 1)
+    returns = market[:, None] * rng.uniform(0.3, 1.8, len(TICKERS)) + rng.normal(0, 0.015, (days - 1, len(TICKERS)))
+    prices = pd.DataFrame(
+        10000 * np.vstack([np.ones(len(TICKERS)), np.cumprod(1 + returns, axis=0)]),
+        index=dates, columns=TICKERS
+    )
+
+    extractor = FeatureExtractor()
+    extractor.get_market_returns = lambda index: market
+    return extractor.extract_universe_features(
+        prices, sentiment_scores={ticker: 0.1 * i for i, ticker in enumerate(TICKERS)}
+    )
+
+
+def test_weighted_similarity_matches_matrix():
+    table = build_feature_table()
+    tickers, matrix, sector_codes, type_codes = sim.feature_arrays(table)
+    similarity = sim.weighted_similarity_matrix(matrix, sector_codes, type_codes)
+
+    pairwise = np.array([[sim.weighted_similarity(table[a], table[b]) for b in tickers] for a in tickers])
+    np.testing.assert_allclose(similarity, pairwise, atol=1e-6)
+    np.testing.assert_allclose(sim.calculate_similarity_matrix(table), pairwise, atol=1e-6)
+
+
+def test_block_similarity_matches_matrix():
+    table = build_feature_table(seed=1)
+    tickers, matrix, _, _ = sim.feature_arrays(table)
+    helpers = {
+        'risk': sim.risk_profile_similarity,
+        'fundamental': sim.fundamental_similarity,
+        'technical': sim.technical_similarity,
+    }
+
+    for block, helper in helpers.items():
+        columns = [sim.VECTOR_FEATURES.index(key) for key in sim.SIMILARITY_BLOCKS[block]]
+        expected = sim.euclidean_similarity_matrix(np.ascontiguousarray(matrix[:, columns]))
+        pairwise = np.array([[helper(table[a], table[b]) for b in tickers] for a in tickers])
+        np.testing.assert_allclose(expected, pairwise, atol=1e-6)
+
+
+def test_category_codes_from_names():
+    # sector_code/type_code 없이 이름만 있는 특징 (test_similarity 샘플과 같은 형태)
+    samsung = {'sector': 'tech', 'type': 'dividend', 'volatility': 0.25, 'per': 12.5, 'rsi': 55}
+    sk_hynix = {'sector': 'tech', 'type': 'dividend', 'volatility': 0.30, 'per': 15.3, 'rsi': 58}
+    kb_finance = {'sector': 'finance', 'type': 'dividend', 'volatility': 0.20, 'per': 6.2, 'rsi': 48}
+
+    _, _, sector_codes, type_codes = sim.feature_arrays({'a': samsung, 'b': sk_hynix, 'c': kb_finance})
+    assert sector_codes.tolist() == [0, 0, 1]
+    assert type_codes.tolist() == [0, 0, 0]
+
+    # 다른 섹터 종목은 섹터 가중치만큼 덜 유사
+    same_sector = sim.weighted_similarity(samsung, sk_hynix)
+    other_sector = sim.weighted_similarity(samsung, kb_finance)
+    assert other_sector < same_sector - sim.DEFAULT_WEIGHTS['sector'] + 0.1
+
+
+def test_portfolio_diversity_score_uses_sectors():
+    table = build_feature_table(seed=2)
+    named = [
+        {key: value for key, value in table[ticker].items() if key not in ('sector_code', 'type_code')}
+        for ticker in ('005930', '055550', '035420')
+    ]
+
+    # 이름만 있는 특징과 코드가 있는 특징의 다양성 점수가 같아야 함
+    diversity = sim.portfolio_diversity_score(named)
+    expected = sim.portfolio_diversity_score([table[t] for t in ('005930', '055550', '035420')])
+    assert abs(diversity - expected) < 1e-6
+
+    # 쌍별 비유사도 평균과 같은 값
+    pairs = [(0, 1), (0, 2), (1, 2)]
+    mean_dissimilarity = np.mean([1 - sim.weighted_similarity(named[i], named[j]) for i, j in pairs])
+    assert abs(diversity - mean_dissimilarity) < 1e-6
+
+    # 모든 종목을 같은 섹터/타입으로 보던 버그: 섹터가 다르면 다양성이 더 커야 함
+    same_category = [{**features, 'sector': 'tech', 'type': 'largecap'} for features in named]
+    assert diversity > sim.portfolio_diversity_score(same_category) + 0.1
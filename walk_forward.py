@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+워크포워드(Walk-Forward) 최적화 백테스트
+학습 구간에서 MPT 최적 비중을 구하고 바로 다음 테스트 구간에 적용하는 과정을
+굴려가며 반복하여, 최적화와 평가 기간이 겹치는 look-ahead bias를 제거합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from price_store import default_store
+from mpt_calculator import max_sharpe_weights
+from backtesting import calculate_value_metrics
+
+
+# 누적 합으로 갱신한 공분산의 수치 오차를 막기 위해 정확히 재계산하는 주기 (윈도우 수)
+_COV_RESYNC_INTERVAL = 20
+
+# 프로세스 하나에 맡길 최소 윈도우 수 (이보다 적으면 프로세스 생성 비용이 더 큼)
+MIN_WINDOWS_PER_JOB = 4
+
+
+def _run_window_group(returns, prices, windows, train_days):
+    """
+    연속된 윈도우 묶음 실행 (병렬 작업 단위)
+
+    묶음 안에서는 직전 윈도우 비중으로 warm-start하고, 학습 구간 공분산은
+    빠지는 행/들어오는 행만 반영하여 누적 합(S1, S2)으로 갱신합니다.
+
+    Returns:
+        list of (weights, growth) - growth는 테스트 구간 시작일 대비 가치 배율
+    """
+    results = []
+    prev_weights = None
+    s1 = s2 = None
+    prev_start = None
+
+    for i, (train_start, test_start, test_end) in enumerate(windows):
+        train_end = train_start + train_days
+
+        if s1 is None or i % _COV_RESYNC_INTERVAL == 0 or train_start - prev_start >= train_days:
+            block = returns[train_start:train_end]
+            s1 = block.sum(axis=0)
+            s2 = block.T @ block
+        else:
+            # 슬라이딩: 빠지는 행 제거, 들어오는 행 추가
+            leaving = returns[prev_start:train_start]
+            entering = returns[prev_start + train_days:train_end]
+            s1 = s1 - leaving.sum(axis=0) + entering.sum(axis=0)
+            s2 = s2 - leaving.T @ leaving + entering.T @ entering
+        prev_start = train_start
+
+        mean = s1 / train_days
+        cov = (s2 - np.outer(s1, s1) / train_days) / (train_days - 1)
+
+        weights = max_sharpe_weights(mean, cov, prev_weights)
+        prev_weights = weights
+
+        test_prices = prices[test_start:test_end + 1]
+        growth = (test_prices / test_prices[0]) @ weights
+        results.append((weights, growth))
+
+    return results
+
+
+class WalkForwardBacktester:
+    def __init__(self, tickers, initial_investment=10000000, start_date=None, end_date=None,
+                 train_days=252, test_days=63, n_jobs=1):
+        """
+        워크포워드 백테스트
+
+        Args:
+            tickers: 종목 코드 리스트
+            initial_investment: 초기 투자금액 (원)
+            start_date: 시작일 (기본: 3년 전, 첫 학습 구간 포함)
+            end_date: 종료일 (기본: 오늘)
+            train_days: 학습 구간 길이 (거래일)
+            test_days: 테스트(보유) 구간 길이 (거래일), 윈도우 이동 간격과 같음
+            n_jobs: 병렬 프로세스 수 (1이면 순차 실행)
+        """
+        self.tickers = tickers
+        self.initial_investment = initial_investment
+        self.end_date = end_date or datetime.now().strftime('%Y%m%d')
+        self.start_date = start_date or (datetime.now() - timedelta(days=365 * 3)).strftime('%Y%m%d')
+        self.train_days = train_days
+        self.test_days = test_days
+        self.n_jobs = n_jobs
+
+    def _build_windows(self, num_days):
+        """(학습 시작, 테스트 시작, 테스트 종료) 가격 인덱스 목록"""
+        windows = []
+        train_start = 0
+        while train_start + self.train_days < num_days - 1:
+            test_start = train_start + self.train_days
+            test_end = min(test_start + self.test_days, num_days - 1)
+            windows.append((train_start, test_start, test_end))
+            train_start += self.test_days
+        return windows
+
+    def run(self):
+        """워크포워드 백테스트 실행"""
+        prices_df = default_store.get_close_prices(self.tickers, self.start_date, self.end_date)
+        prices_df = prices_df.ffill().dropna()
+        if prices_df.empty:
+            raise ValueError("No price data available")
+
+        prices = prices_df.values
+        # returns[i]는 prices[i] -> prices[i + 1] 수익률, 학습 구간 [s, s+L)은 가격 s..s+L 사용
+        returns = prices[1:] / prices[:-1] - 1
+
+        windows = self._build_windows(len(prices))
+        if not windows:
+            raise ValueError("Not enough data for the training window")
+
+        # 윈도우를 연속된 묶음으로 나눠 묶음 단위로 병렬 실행 (묶음 내부는 warm-start 유지)
+        n_groups = max(1, min(self.n_jobs, len(windows) // MIN_WINDOWS_PER_JOB))
+        groups = [list(g) for g in np.array_split(np.arange(len(windows)), n_groups)]
+        group_windows = [[windows[i] for i in g] for g in groups]
+
+        if n_groups > 1:
+            with ProcessPoolExecutor(max_workers=n_groups) as executor:
+                futures = [
+                    executor.submit(_run_window_group, returns, prices, gw, self.train_days)
+                    for gw in group_windows
+                ]
+                group_results = [f.result() for f in futures]
+        else:
+            group_results = [_run_window_group(returns, prices, group_windows[0], self.train_days)]
+
+        results = [r for group in group_results for r in group]
+
+        # 테스트 구간 가치를 이어 붙여 하나의 자산 곡선 생성
+        dates = prices_df.index
+        value = float(self.initial_investment)
+        curve_values = [value]
+        curve_dates = [dates[windows[0][1]]]
+        window_summaries = []
+
+        for (train_start, test_start, test_end), (weights, growth) in zip(windows, results):
+            segment = value * growth
+            curve_values.extend(segment[1:].tolist())
+            curve_dates.extend(dates[test_start + 1:test_end + 1])
+
+            window_summaries.append({
+                'train_start': dates[train_start].strftime('%Y-%m-%d'),
+                'train_end': dates[test_start].strftime('%Y-%m-%d'),
+                'test_start': dates[test_start].strftime('%Y-%m-%d'),
+                'test_end': dates[test_end].strftime('%Y-%m-%d'),
+                'weights': {t: float(w) for t, w in zip(prices_df.columns, weights)},
+                'oos_return': float((growth[-1] - 1) * 100)
+            })
+            value = float(segment[-1])
+
+        equity_curve = pd.Series(curve_values, index=pd.DatetimeIndex(curve_dates))
+        metrics = calculate_value_metrics(equity_curve, self.initial_investment)
+
+        history = [
+            {
+                'date': date.strftime('%Y-%m-%d'),
+                'value': float(v),
+                'return': float((v / self.initial_investment - 1) * 100)
+            }
+            for date, v in equity_curve.items()
+        ]
+
+        return {
+            'metrics': metrics,
+            'history': history,
+            'windows': window_summaries,
+            'tickers': list(prices_df.columns),
+            'period': {
+                'start': self.start_date,
+                'end': self.end_date,
+                'out_of_sample_start': curve_dates[0].strftime('%Y-%m-%d')
+            }
+        }